@@ -9,15 +9,82 @@ artifactor:
         filedump:
             enabled: True
             plugin: filedump
+            content_addressed: False
+
+With ``content_addressed`` enabled, dumped files are stored once per distinct content under
+``<artifact_dir>/.objects`` and hard linked into the test artifact directories, so identical
+screenshots, page sources and logs only take disk space once.
+
+Large payloads don't need to travel through the hook channel at all. A client on the same host can
+write them to a spool file and pass its path as ``spool_filename``; the file is then moved into
+place (or into the object store) instead of being written again. Words passed in ``words`` are
+scrubbed from sanitizable file types while the file is ingested, so those need no later
+``sanitize`` pass.
 """
 import base64
+import hashlib
 import os
 import re
+import shutil
+import tempfile
 
 from artifactor import ArtifactorBasePlugin
 from cfme.utils import normalize_text
 from cfme.utils import safe_string
 
+#: File types whose contents get sanitized
+SANITIZE_TYPES = {
+    "traceback",
+    "short_tb",
+    "rbac",
+    "soft_traceback",
+    "soft_short_tb",
+}
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _scrub(data, words):
+    for word in words:
+        if not isinstance(word, str):
+            word = str(word)
+        data = data.replace(word.encode("utf-8"), b"*" * len(word))
+    return data
+
+
+def ingest(source, os_filename, objects_dir=None, words=None):
+    """Move ``source`` to ``os_filename``, scrubbing ``words`` out of it on the way
+
+    If ``objects_dir`` is given, the contents are stored there under their sha256 digest and
+    ``os_filename`` becomes a hard link to the stored object, reusing an existing object with the
+    same contents.
+    """
+    if words:
+        # Words never span lines, so the file can be scrubbed line by line
+        fd, scrubbed = tempfile.mkstemp(dir=objects_dir or os.path.dirname(os_filename))
+        with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+            for line in src:
+                dst.write(_scrub(line, words))
+        os.remove(source)
+        source = scrubbed
+    if os.path.lexists(os_filename):
+        os.remove(os_filename)
+    if objects_dir is None:
+        shutil.move(source, os_filename)
+        return
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    digest = digest.hexdigest()
+    object_path = os.path.join(objects_dir, digest[:2], digest[2:])
+    if os.path.exists(object_path):
+        os.remove(source)
+    else:
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        shutil.move(source, object_path)
+    os.link(object_path, os_filename)
+
 
 class Filedump(ArtifactorBasePlugin):
     def plugin_initialize(self):
@@ -28,6 +95,7 @@ class Filedump(ArtifactorBasePlugin):
 
     def configure(self):
         self.configured = True
+        self.content_addressed = self.data.get("content_addressed", False)
 
     def start_test(self, artifact_path, test_name, test_location, slaveid):
         if not slaveid:
@@ -58,6 +126,9 @@ class Filedump(ArtifactorBasePlugin):
         group_id=None,
         test_name=None,
         test_location=None,
+        spool_filename=None,
+        words=None,
+        artifact_dir=None,
     ):
         if not slaveid:
             slaveid = "Master"
@@ -97,14 +168,34 @@ class Filedump(ArtifactorBasePlugin):
             }
         )
         if not dont_write:
-            if os.path.isfile(os_filename):
-                os.remove(os_filename)
-            if contents_base64:
-                contents = base64.b64decode(contents)
-            if isinstance(contents, bytes):
-                mode = "wb"
-            with open(os_filename, mode) as f:
-                f.write(contents)
+            if file_type not in SANITIZE_TYPES:
+                words = None
+            objects_dir = None
+            if self.content_addressed and artifact_dir:
+                objects_dir = os.path.join(artifact_dir, ".objects")
+                os.makedirs(objects_dir, exist_ok=True)
+            if spool_filename is None and objects_dir is None and not words:
+                if os.path.isfile(os_filename):
+                    os.remove(os_filename)
+                if contents_base64:
+                    contents = base64.b64decode(contents)
+                if isinstance(contents, bytes):
+                    mode = "wb"
+                with open(os_filename, mode) as f:
+                    f.write(contents)
+            else:
+                if spool_filename is None:
+                    if contents_base64:
+                        contents = base64.b64decode(contents)
+                    if isinstance(contents, str):
+                        contents = contents.encode("utf-8")
+                    fd, spool_filename = tempfile.mkstemp(
+                        dir=objects_dir or os.path.dirname(os_filename))
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(contents)
+                ingest(spool_filename, os_filename, objects_dir=objects_dir, words=words)
+                if words:
+                    artifacts[-1]["sanitized"] = True
 
         return None, {"artifacts": {test_ident: {"files": artifacts}}}
 
@@ -114,13 +205,7 @@ class Filedump(ArtifactorBasePlugin):
         filename = None
         try:
             for f in artifacts[test_ident]["files"]:
-                if f["file_type"] not in {
-                    "traceback",
-                    "short_tb",
-                    "rbac",
-                    "soft_traceback",
-                    "soft_short_tb",
-                }:
+                if f["file_type"] not in SANITIZE_TYPES or f.get("sanitized"):
                     continue
                 filename = f["os_filename"]
                 with open(filename) as f:
@@ -129,7 +214,10 @@ class Filedump(ArtifactorBasePlugin):
                     if not isinstance(word, str):
                         word = str(word)
                     data = data.replace(word, "*" * len(word))
-                with open(filename, "w") as f:
+                # Replace rather than rewrite the file, it may be a link shared with other tests
+                fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(filename))
+                with os.fdopen(fd, "w") as f:
                     f.write(data)
+                os.replace(tmp_filename, filename)
         except KeyError:
             pass
@@ -10,13 +10,24 @@ artifactor:
             enabled: True
             plugin: reporter
             only_failed: False #Only show faled tests in the report
+            incremental: False #Only re-render tests that changed since the last report
+            page_size: 200 #Tests shown per page of an incremental report
+
+With ``incremental`` enabled, the processed data and rendered HTML of every finished test are kept
+in a summary store, persisted in ``report.summaries`` next to the report, and only tests whose
+artifacts changed since the last report are processed and rendered again. The test panels passing
+the status and other filters of the report are split into pages, so the browser only has to lay out
+one page at a time.
 """
 import csv
 import datetime
 import difflib
+import hashlib
+import json
 import math
 import os
 import re
+import shelve
 import shutil
 import time
 from copy import deepcopy
@@ -35,6 +46,15 @@ _tests_tpl = {
     "_duration": 0,
 }
 
+COLORS = {
+    "passed": "success",
+    "failed": "warning",
+    "error": "danger",
+    "xpassed": "danger",
+    "xfailed": "success",
+    "skipped": "info",
+}
+
 # Regexp, that finds all URLs in a string
 # Does not cover all the cases, but rather only those we can
 URL = re.compile(r"https?://[^/\s]+(?:/[^/\s?]+)*/?(?:\?(?:[^&\s=]+(?:=[^&\s]+)?&?)*)?")
@@ -56,8 +76,51 @@ def overall_test_status(statuses):
     return "passed"
 
 
+class SummaryStore:
+    """Persistent store of per-test report data and rendered HTML fragments
+
+    Entries are keyed by test name and are only valid for the fingerprint of the test artifacts
+    they were made from.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self._shelf = shelve.open(filename)
+        self._entries = dict(self._shelf)
+
+    @staticmethod
+    def fingerprint(test):
+        return hashlib.sha1(json.dumps(test, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, name, fingerprint):
+        entry = self._entries.get(name)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            return entry
+        return None
+
+    def put(self, name, fingerprint, test_data):
+        entry = self._entries[name] = {
+            "fingerprint": fingerprint,
+            "test_data": test_data,
+            "fragment": None,
+        }
+        return entry
+
+    def fragment(self, test, render):
+        """Return the HTML fragment of a test, rendering and storing it if there is none yet"""
+        entry = self._entries[test["name"]]
+        if entry["fragment"] is None:
+            entry["fragment"] = render(test=test)
+            self._shelf[test["name"]] = entry
+        return entry["fragment"]
+
+    def sync(self):
+        self._shelf.sync()
+
+
 class ReporterBase:
     def _run_report(self, old_artifacts, artifact_dir, version=None, fw_version=None):
+        if getattr(self, "incremental", False):
+            return self._run_incremental_report(old_artifacts, artifact_dir, version, fw_version)
         template_data = self.process_data(old_artifacts, artifact_dir, version, fw_version)
 
         if hasattr(self, "only_failed") and self.only_failed:
@@ -67,9 +130,43 @@ class ReporterBase:
 
         self.render_report(template_data, "report", artifact_dir, "test_report.html")
 
+    def _run_incremental_report(self, old_artifacts, artifact_dir, version=None,
+                                fw_version=None):
+        summaries_file = os.path.join(artifact_dir, "report.summaries")
+        summaries = getattr(self, "_summaries", None)
+        if summaries is None or summaries.filename != summaries_file:
+            summaries = self._summaries = SummaryStore(summaries_file)
+        template_data = self.process_data(
+            old_artifacts, artifact_dir, version, fw_version, summaries=summaries)
+
+        if hasattr(self, "only_failed") and self.only_failed:
+            template_data["tests"] = [
+                x for x in template_data["tests"] if x["outcomes"]["overall"] not in ["passed"]
+            ]
+
+        fragment_template = self.template_env.get_template("test_report_test.html")
+        fragments = []
+        for test in template_data["tests"]:
+            if test.get("in_progress"):
+                # The duration of running tests changes all the time, never worth storing
+                fragments.append(fragment_template.render(test=test))
+            else:
+                fragments.append(summaries.fragment(test, fragment_template.render))
+        summaries.sync()
+        # The browser filters the tests and splits the ones shown into pages
+        template_data["fragments"] = fragments
+        template_data["page_size"] = getattr(self, "page_size", 200)
+
+        self.render_report(template_data, "report", artifact_dir, "test_report.html")
+
+    @property
+    def template_env(self):
+        if not hasattr(self, "_template_env"):
+            self._template_env = Environment(loader=FileSystemLoader(template_path.strpath))
+        return self._template_env
+
     def render_report(self, report, filename, log_dir, template):
-        template_env = Environment(loader=FileSystemLoader(template_path.strpath))
-        data = template_env.get_template(template).render(**report)
+        data = self.template_env.get_template(template).render(**report)
 
         with open(os.path.join(log_dir, f"{filename}.html"), "w") as f:
             f.write(data)
@@ -78,7 +175,8 @@ class ReporterBase:
         except OSError:
             pass
 
-    def process_data(self, artifacts, log_dir, version, fw_version, name_filter=None):
+    def process_data(self, artifacts, log_dir, version, fw_version, name_filter=None,
+                     summaries=None):
         tb_errors = []
         blocker_skip_count = 0
         provider_skip_count = 0
@@ -95,14 +193,6 @@ class ReporterBase:
             "xfailed": 0,
             "xpassed": 0,
         }
-        colors = {
-            "passed": "success",
-            "failed": "warning",
-            "error": "danger",
-            "xpassed": "danger",
-            "xfailed": "success",
-            "skipped": "info",
-        }
         # Iterate through the tests and process the counts and durations
         for test_name, test in artifacts.items():
             if not test.get("statuses"):
@@ -111,87 +201,26 @@ class ReporterBase:
             counts[overall_status] += 1
             if not test.get("old", False):
                 current_counts[overall_status] += 1
-            color = colors[overall_status]
             # This was removed previously but is needed as the overall is not generated
             # until the test finishes. So this is here as a shim.
             test["statuses"]["overall"] = overall_status
-            test_data = {
-                "name": test_name,
-                "outcomes": test["statuses"],
-                "slaveid": test.get("slaveid", "Unknown"),
-                "color": color,
-            }
-            if "composite" in test:
-                test_data["composite"] = test["composite"]
-
-            if "skipped" in test:
-                if test["skipped"].get("type") == "provider":
-                    provider_skip_count += 1
-                    test_data["skip_provider"] = test["skipped"].get("reason")
-                if test["skipped"].get("type") == "blocker":
-                    blocker_skip_count += 1
-                    test_data["skip_blocker"] = test["skipped"].get("reason")
-
+            if summaries is not None and test.get("finish_time"):
+                entry = summaries.get(test_name, summaries.fingerprint(test))
+                if entry is None:
+                    test_data = self.process_test(test_name, test, log_dir)
+                    # processing adds to the artifacts, so fingerprint them afterwards
+                    entry = summaries.put(test_name, summaries.fingerprint(test), test_data)
+                # Shallow copy, the duration gets formatted in place below
+                test_data = dict(entry["test_data"])
+            else:
+                test_data = self.process_test(test_name, test, log_dir)
+            if "skip_provider" in test_data:
+                provider_skip_count += 1
             if "skip_blocker" in test_data:
-                # Fix the inconveniently long list of repeated blockers until we sort out sets
-                # in riggerlib somehow.
-                test_data["skip_blocker"] = sorted(set(test_data["skip_blocker"]))
-
-            if test.get("old", False):
-                test_data["old"] = True
-
-            if test.get("start_time"):
-                if test.get("finish_time"):
-                    test_data["in_progress"] = False
-                    test_data["duration"] = test["finish_time"] - test["start_time"]
-                else:
-                    test_data["duration"] = time.time() - test["start_time"]
-                    test_data["in_progress"] = True
-
-            # Set up destinations for the files
-            test_data["file_groups"] = []
-            test_data["qa_contact"] = []
-            processed_groups = {}
-            order = 0
-            for file_dict in test.get("files", []):
-                group = file_dict["group_id"]
-                if group not in processed_groups:
-                    processed_groups[group] = (order, [])
-                    order += 1
-                processed_groups[group][-1].append(file_dict)
-            # Current structure:
-            # {groupid: (group_order, [{filedict1}, {filedict2}])}
-            # Sorting by group_order
-            processed_groups = sorted(list(processed_groups.items()), key=lambda kv: kv[1][0])
-            # And now make it [(groupid, [{filedict1}, {filedict2}, ...])]
-            processed_groups = [(group_name, files) for group_name, (_, files) in processed_groups]
-            for group_name, file_dicts in processed_groups:
-                group_file_list = []
-                for file_dict in file_dicts:
-                    if file_dict["file_type"] == "qa_contact":
-                        with open(file_dict["os_filename"]) as qafile:
-                            qareader = csv.reader(qafile, delimiter=",", quotechar='"')
-                            for qacontact in qareader:
-                                test_data["qa_contact"].append(qacontact)
-                                if qacontact[0] not in template_data["qa"]:
-                                    template_data["qa"].append(qacontact[0])
-                        continue  # Do not store, handled a different way :)
-                    elif file_dict["file_type"] == "short_tb":
-                        with open(file_dict["os_filename"]) as short_tb:
-                            test_data["short_tb"] = short_tb.read()
-                        continue
-                    file_dict["filename"] = file_dict["os_filename"].replace(log_dir, "")
-                    group_file_list.append(file_dict)
-
-                test_data["file_groups"].append((group_name, group_file_list))
-            # Snd remove groups that are left empty because of eg. traceback or qa contact
-            test_data["file_groups"] = [
-                f_group for f_group in test_data["file_groups"] if len(f_group[1]) > 0
-            ]
-            if "short_tb" in test_data and test_data["short_tb"]:
-                urls = [url for url in URL.findall(test_data["short_tb"])]
-                if urls:
-                    test_data["urls"] = urls
+                blocker_skip_count += 1
+            for qacontact in test_data["qa_contact"]:
+                if qacontact[0] not in template_data["qa"]:
+                    template_data["qa"].append(qacontact[0])
             template_data["tests"].append(test_data)
         template_data["top10"] = self.top10(tb_errors)
         template_data["counts"] = counts
@@ -220,6 +249,83 @@ class ReporterBase:
 
         return template_data
 
+    def process_test(self, test_name, test, log_dir):
+        """Turn the artifacts of a single test into the data the report template needs"""
+        test_data = {
+            "name": test_name,
+            "outcomes": test["statuses"],
+            "slaveid": test.get("slaveid", "Unknown"),
+            "color": COLORS[test["statuses"]["overall"]],
+        }
+        if "composite" in test:
+            test_data["composite"] = test["composite"]
+
+        if "skipped" in test:
+            if test["skipped"].get("type") == "provider":
+                test_data["skip_provider"] = test["skipped"].get("reason")
+            if test["skipped"].get("type") == "blocker":
+                test_data["skip_blocker"] = test["skipped"].get("reason")
+
+        if "skip_blocker" in test_data:
+            # Fix the inconveniently long list of repeated blockers until we sort out sets
+            # in riggerlib somehow.
+            test_data["skip_blocker"] = sorted(set(test_data["skip_blocker"]))
+
+        if test.get("old", False):
+            test_data["old"] = True
+
+        if test.get("start_time"):
+            if test.get("finish_time"):
+                test_data["in_progress"] = False
+                test_data["duration"] = test["finish_time"] - test["start_time"]
+            else:
+                test_data["duration"] = time.time() - test["start_time"]
+                test_data["in_progress"] = True
+
+        # Set up destinations for the files
+        test_data["file_groups"] = []
+        test_data["qa_contact"] = []
+        processed_groups = {}
+        order = 0
+        for file_dict in test.get("files", []):
+            group = file_dict["group_id"]
+            if group not in processed_groups:
+                processed_groups[group] = (order, [])
+                order += 1
+            processed_groups[group][-1].append(file_dict)
+        # Current structure:
+        # {groupid: (group_order, [{filedict1}, {filedict2}])}
+        # Sorting by group_order
+        processed_groups = sorted(list(processed_groups.items()), key=lambda kv: kv[1][0])
+        # And now make it [(groupid, [{filedict1}, {filedict2}, ...])]
+        processed_groups = [(group_name, files) for group_name, (_, files) in processed_groups]
+        for group_name, file_dicts in processed_groups:
+            group_file_list = []
+            for file_dict in file_dicts:
+                if file_dict["file_type"] == "qa_contact":
+                    with open(file_dict["os_filename"]) as qafile:
+                        qareader = csv.reader(qafile, delimiter=",", quotechar='"')
+                        for qacontact in qareader:
+                            test_data["qa_contact"].append(qacontact)
+                    continue  # Do not store, handled a different way :)
+                elif file_dict["file_type"] == "short_tb":
+                    with open(file_dict["os_filename"]) as short_tb:
+                        test_data["short_tb"] = short_tb.read()
+                    continue
+                file_dict["filename"] = file_dict["os_filename"].replace(log_dir, "")
+                group_file_list.append(file_dict)
+
+            test_data["file_groups"].append((group_name, group_file_list))
+        # Snd remove groups that are left empty because of eg. traceback or qa contact
+        test_data["file_groups"] = [
+            f_group for f_group in test_data["file_groups"] if len(f_group[1]) > 0
+        ]
+        if "short_tb" in test_data and test_data["short_tb"]:
+            urls = [url for url in URL.findall(test_data["short_tb"])]
+            if urls:
+                test_data["urls"] = urls
+        return test_data
+
     def top10(self, tb_errors):
         sets = []
         for entry in tb_errors:
@@ -341,6 +447,8 @@ class Reporter(ArtifactorBasePlugin, ReporterBase):
 
     def configure(self):
         self.only_failed = self.data.get("only_failed", False)
+        self.incremental = self.data.get("incremental", False)
+        self.page_size = self.data.get("page_size", 200)
         self.configured = True
 
     @ArtifactorBasePlugin.check_configured
@@ -658,6 +658,72 @@ class BaseVM(
 class BaseVMCollection(BaseCollection):
     ENTITY = BaseVM
 
+    #: Number of entities requested by a single REST query in :py:meth:`query_rest`
+    REST_PAGE_SIZE = 1000
+
+    @property
+    def context(self):
+        """The appliance's implementation context, for the contextual methods of collections"""
+        # filtered collections may have an entity for their parent
+        return self.appliance.context
+
+    def query_rest(self, collection_name, provider=None, names=None):
+        """Instantiate the entities found in a REST collection.
+
+        The filters are pushed down into the REST query, providers are resolved once per provider
+        name.
+
+        Args:
+            collection_name: Name of the REST collection, ``vms`` or ``templates``
+            provider: Provider object, only entities of this provider are returned if set
+            names: Only entities with any of these names are returned if set
+
+        Returns:
+            :py:class:`list` of entities, entities without a provider are left out, same as in UI
+        """
+        from cfme.utils.providers import get_crud_by_name
+        rest_api = self.appliance.rest_api
+        href = getattr(rest_api.collections, collection_name)._href
+        params = {'expand': 'resources', 'attributes': 'name,ems_id', 'limit': self.REST_PAGE_SIZE}
+        ems_id = None if provider is None else str(provider.rest_api_entity.id)
+        q = None
+        if names:
+            # names are more selective, the provider is then filtered below
+            for name in names:
+                q = Q('name', '=', name) if q is None else q | Q('name', '=', name)
+        elif ems_id is not None:
+            q = Q('ems_id', '=', int(ems_id))
+        if q is not None:
+            params['filter[]'] = q.as_filters
+
+        resources = []
+        while True:
+            page = rest_api.get(href, offset=len(resources), **params)['resources']
+            resources.extend(page)
+            if len(page) < self.REST_PAGE_SIZE:
+                break
+
+        provider_names = {}
+        if provider is None and resources:
+            provider_names = {
+                str(p['id']): p['name']
+                for p in rest_api.get(
+                    rest_api.collections.providers._href,
+                    expand='resources', attributes='name')['resources']}
+        providers = {ems_id: provider}
+        entities = []
+        for resource in resources:
+            resource_ems_id = resource.get('ems_id')
+            if resource_ems_id is None:
+                continue
+            resource_ems_id = str(resource_ems_id)
+            if provider is not None and resource_ems_id != ems_id:
+                continue
+            if resource_ems_id not in providers:
+                providers[resource_ems_id] = get_crud_by_name(provider_names[resource_ems_id])
+            entities.append(self.instantiate(resource['name'], providers[resource_ems_id]))
+        return entities
+
     def instantiate(self, name, provider, template_name=None):
         """Factory class method that determines the correct subclass for given provider.
 
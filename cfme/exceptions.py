@@ -270,6 +270,14 @@ class SSHExpectTimeoutError(CFMEException):
     pass
 
 
+class RailsSessionError(CFMEException):
+    """Raised when the rails session on the appliance dies or misbehaves"""
+
+
+class RailsSessionStartError(RailsSessionError):
+    """Raised when the rails session on the appliance can not be started"""
+
+
 @property
 def displayed_not_implemented(cls):
     raise NotImplementedError("This view has no unique markers for is_displayed check")
@@ -17,6 +17,7 @@ import pytest
 from cfme.test_framework.sprout.client import SproutClient
 from cfme.utils import conf
 from cfme.utils import periodic_call
+from cfme.utils.appliance.fleet import ApplianceFleet
 from cfme.utils.log import logger
 
 
@@ -61,15 +62,15 @@ def sprout_appliances(
     )
 
     if config.getoption("update_appliance"):
-        for app in apps:
-            logger.info("Initiating appliance update on temp appliance ...")
-            urls = config.getoption("update_urls")
-            app.update_rhel(*urls, reboot=True)
-            # Web UI not available on unconfigured appliances
-            if preconfigured:
-                logger.info("Appliance update finished on temp appliance, waiting for UI ...")
-                app.wait_for_miq_ready()
-            logger.info("Appliance update finished on temp appliance...")
+        fleet = ApplianceFleet(apps)
+        logger.info("Initiating appliance update on temp appliances ...")
+        urls = config.getoption("update_urls")
+        fleet.update_rhel(*urls, reboot=True)
+        # Web UI not available on unconfigured appliances
+        if preconfigured:
+            logger.info("Appliance update finished on temp appliances, waiting for UI ...")
+            fleet.wait_for_miq_ready()
+        logger.info("Appliance update finished on temp appliances...")
 
     try:
         # Renew in half the lease time interval which is number of minutes.
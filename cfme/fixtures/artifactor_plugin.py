@@ -18,11 +18,18 @@
 ``reuse_dir`` if this is False and Artifactor comes across a dir that has
 already been used, it will die
 
+``spool_threshold`` if set, file dumps with contents of at least this many bytes are written to
+``spool_dir`` (``<log_dir>/artifacts/.spool`` by default) and only the path of the spool file is
+sent to artifactor. Artifactor must run on the same host, with ``spool_dir`` on the same
+filesystem as the artifacts.
+
 
 """
 import atexit
+import base64
 import os
 import subprocess
+import tempfile
 from threading import RLock
 
 import diaper
@@ -40,6 +47,7 @@ from cfme.utils.conf import env
 from cfme.utils.log import logger
 from cfme.utils.net import net_check
 from cfme.utils.net import random_port
+from cfme.utils.path import log_path
 from cfme.utils.wait import wait_for
 
 UNDER_TEST = False  # set to true for artifactor using tests
@@ -149,11 +157,36 @@ def pytest_configure(config):
     config._art_client = art_client
 
 
+def spool_filedump(hook_args, art_config):
+    """Move large filedump contents out of the hook arguments into a spool file
+
+    Returns the hook arguments to send instead, see ``spool_threshold`` above.
+    """
+    threshold = art_config.get('spool_threshold')
+    contents = hook_args.get('contents')
+    if (not threshold or hook_args.get('dont_write') or contents is None or
+            len(contents) < threshold):
+        return hook_args
+    if hook_args.get('contents_base64'):
+        contents = base64.b64decode(contents)
+    elif isinstance(contents, str):
+        contents = contents.encode('utf-8')
+    spool_dir = art_config.get('spool_dir', log_path.join('artifacts', '.spool').strpath)
+    os.makedirs(spool_dir, exist_ok=True)
+    fd, spool_filename = tempfile.mkstemp(dir=spool_dir)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(contents)
+    return dict(
+        hook_args, contents='', contents_base64=False, spool_filename=spool_filename, words=words)
+
+
 def fire_art_hook(config, hook, **hook_args):
     client = getattr(config, '_art_client', None)
     if client is None:
         assert UNDER_TEST, 'missing artifactor is only valid for inprocess tests'
     else:
+        if hook == 'filedump' and client:
+            hook_args = spool_filedump(hook_args, env.get('artifactor', {}))
         return client.fire_hook(hook, **hook_args)
 
 
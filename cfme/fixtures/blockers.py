@@ -8,6 +8,11 @@ it accepts number argument and spits out the BUGZILLA BUG!
 The :py:func:`blockers` retrieves list of all blockers
 as specified in the meta marker.
 All of them are converted to the :py:class:`utils.blockers.Blocker` instances
+
+After collection, the blockers of all collected tests are fetched in batches
+(see :py:func:`utils.blockers.prefetch_blockers`) and kept in the persistent blocker cache,
+so the tests and the slaves resolve them without further remote calls.
+``--no-prefetch-blockers`` disables that.
 """
 import pytest
 
@@ -15,6 +20,8 @@ from cfme.fixtures.pytest_store import store
 from cfme.utils.blockers import Blocker
 from cfme.utils.blockers import BZ
 from cfme.utils.blockers import GH
+from cfme.utils.blockers import prefetch_blockers
+from cfme.utils.log import logger
 
 
 @pytest.fixture(scope="function")
@@ -62,25 +69,40 @@ def pytest_addoption(parser):
                     default=False,
                     dest='list_blockers',
                     help='Specify to list the blockers (takes some time though).')
+    group.addoption('--no-prefetch-blockers',
+                    action='store_false',
+                    default=True,
+                    dest='prefetch_blockers',
+                    help='Do not fetch the blockers of the collected tests right after collection.')
+
+
+def _collected_blockers(items):
+    blockers = []
+    for item in items:
+        blockers.extend(item._metadata.get("blockers", []))
+    return blockers
 
 
 @pytest.hookimpl(trylast=True)
 def pytest_collection_modifyitems(session, config, items):
-    if not config.getvalue("list_blockers"):
-        return
+    if config.getvalue("list_blockers"):
+        list_blockers(items)
+    elif config.getvalue("prefetch_blockers") and not config.getvalue("collectonly"):
+        try:
+            blockers = prefetch_blockers(_collected_blockers(items))
+        except ValueError as e:
+            # Unparsable blockers are reported by the tests that use them
+            logger.warning("Could not prefetch blockers: %s", e)
+        else:
+            logger.info("Prefetched %d blockers of the collected tests", len(blockers))
+
+
+def list_blockers(items):
     store.terminalreporter.write("Loading blockers ...\n", bold=True)
     blocking = set()
-    for item in items:
-        if "blockers" not in item._metadata:
-            continue
-        for blocker in item._metadata["blockers"]:
-            if isinstance(blocker, int):
-                # TODO: DRY
-                blocker_object = Blocker.parse(f"BZ#{blocker}")
-            else:
-                blocker_object = Blocker.parse(blocker)
-            if blocker_object.blocks:
-                blocking.add(blocker_object)
+    for blocker_object in prefetch_blockers(_collected_blockers(items)):
+        if blocker_object.blocks:
+            blocking.add(blocker_object)
     if blocking:
         store.terminalreporter.write("Known blockers:\n", bold=True)
         for blocker in blocking:
@@ -21,6 +21,7 @@ from cfme.test_framework.sprout.client import SproutClient
 from cfme.utils import conf
 from cfme.utils.appliance import IPAppliance
 from cfme.utils.appliance.console import configure_appliances_ha
+from cfme.utils.appliance.fleet import ApplianceFleet
 from cfme.utils.conf import auth_data
 from cfme.utils.conf import cfme_data
 from cfme.utils.conf import credentials
@@ -460,8 +461,10 @@ def update_appliance(appliance):
 
 
 def upgrade_appliances(appliances):
-    for appliance in appliances:
-        result = appliance.ssh_client.run_command("yum update -y", timeout=3600)
+    def upgrade(appliance):
+        return appliance.ssh_client.run_command("yum update -y", timeout=3600)
+
+    for result in ApplianceFleet(appliances).run(upgrade):
         assert result.success, f"update failed {result.output}"
 
 
@@ -0,0 +1,37 @@
+"""Fixtures rolling the appliance database back after destructive tests.
+
+Instead of reprovisioning or cleaning the appliance up, a module, class or test using one of these
+fixtures gets the database checkpointed before it runs and rolled back to the checkpoint after it,
+see :py:meth:`cfme.utils.appliance.db.ApplianceDB.checkpoint`. That takes seconds plus the time
+evmserverd needs to start again.
+
+.. code-block:: python
+
+    pytestmark = [pytest.mark.usefixtures('db_rollback_modscope')]
+
+Only the database is rolled back, changes to the appliance files or to the providers stay.
+"""
+import pytest
+
+
+@pytest.fixture(scope='module')
+def db_rollback(db_rollback_modscope):
+    yield db_rollback_modscope
+
+
+@pytest.fixture(scope='module')
+def db_rollback_modscope(appliance):
+    with appliance.db.checkpointed() as name:
+        yield name
+
+
+@pytest.fixture(scope='class')
+def db_rollback_clsscope(appliance):
+    with appliance.db.checkpointed() as name:
+        yield name
+
+
+@pytest.fixture(scope='function')
+def db_rollback_funcscope(appliance):
+    with appliance.db.checkpointed() as name:
+        yield name
@@ -1,6 +1,8 @@
 import attr
 import pytest
 
+from cfme.utils.appliance.fleet import ApplianceFleet
+
 
 @attr.s
 class ApplianceCluster:
@@ -40,8 +42,9 @@ def setup_global_appliance(multi_region_cluster, app_creds_modscope):
 def setup_remote_appliances(multi_region_cluster, setup_global_appliance, app_creds_modscope):
     remote_apps = multi_region_cluster.remote_appliances
     gip = multi_region_cluster.global_appliance.hostname
-    for num, app in enumerate(remote_apps):
-        region_n = str((num + 1) * 10)
+
+    def setup_remote_appliance(app):
+        region_n = str((remote_apps.index(app) + 1) * 10)
         app_params = dict(region=region_n, dbhostname='localhost',
                           username=app_creds_modscope['username'],
                           password=app_creds_modscope['password'],
@@ -55,6 +58,8 @@ def setup_remote_appliances(multi_region_cluster, setup_global_appliance, app_cr
         app.wait_for_miq_ready()
         app.set_pglogical_replication(replication_type=':remote')
 
+    ApplianceFleet(remote_apps).run(setup_remote_appliance)
+
 
 @pytest.fixture(scope='module')
 def setup_multi_region_cluster(multi_region_cluster, setup_remote_appliances,
@@ -0,0 +1,79 @@
+"""Sampling profiler for tests
+
+Profiles the setup and call phases of tests with the
+:py:class:`cfme.utils.tracer.SamplingProfiler` and attaches the result to the test's artifacts as
+collapsed stacks, ready to be fed to ``flamegraph.pl`` or speedscope. Also written to
+``log/profiles/``.
+
+Profile single tests with a marker:
+
+.. code-block:: python
+
+    @pytest.mark.sampling_profile
+    def test_something():
+        pass
+
+or every collected test with ``--sampling-profile``. ``--sampling-profile-interval`` sets the time
+between samples, in milliseconds.
+"""
+import re
+
+import pytest
+
+from cfme.fixtures.artifactor_plugin import fire_art_test_hook
+from cfme.fixtures.pytest_store import store
+from cfme.utils.log import logger
+from cfme.utils.path import log_path
+from cfme.utils.tracer import SamplingProfiler
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cfme')
+    group.addoption('--sampling-profile', action='store_true', default=False,
+                    dest='sampling_profile',
+                    help='Profile every test with the sampling profiler')
+    group.addoption('--sampling-profile-interval', action='store', type=float, default=10,
+                    dest='sampling_profile_interval',
+                    help='Milliseconds between two samples of the sampling profiler')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'sampling_profile: profile the test with the sampling profiler')
+
+
+def _profiling_enabled(item):
+    return (item.config.getoption('sampling_profile') or
+            item.get_closest_marker('sampling_profile') is not None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    if _profiling_enabled(item):
+        interval = item.config.getoption('sampling_profile_interval') / 1000.
+        item._sampling_profiler = SamplingProfiler(interval=interval)
+        item._sampling_profiler.start()
+    yield
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item, nextitem):
+    # tryfirst, so the artifacts are dumped before artifactor finishes the test
+    profiler = getattr(item, '_sampling_profiler', None)
+    if profiler is None:
+        return
+    profiler.stop()
+    del item._sampling_profiler
+    collapsed = profiler.collapsed()
+    profile_dir = log_path.join('profiles')
+    profile_dir.ensure(dir=True)
+    profile_file = profile_dir.join(
+        '{}.collapsed'.format(re.sub(r'[^a-zA-Z0-9_.\-\[\]]', '_', item.nodeid)))
+    profile_file.write(collapsed)
+    logger.info('Sampled %d stacks, profile written to %s',
+                sum(profiler.samples.values()), profile_file.strpath)
+    fire_art_test_hook(
+        item, 'filedump',
+        description='Sampling profile (collapsed stacks)', contents=collapsed,
+        file_type='profile', display_glyph='fire', group_id='sampling-profile',
+        slaveid=store.slaveid)
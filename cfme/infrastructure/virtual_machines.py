@@ -7,6 +7,7 @@ from copy import copy
 
 import attr
 import fauxfactory
+import sentaku
 from navmazing import NavigateToAttribute
 from navmazing import NavigateToSibling
 from navmazing import NavigationDestinationNotFound
@@ -52,9 +53,12 @@ from cfme.exceptions import displayed_not_implemented
 from cfme.exceptions import ItemNotFound
 from cfme.exceptions import ToolbarOptionGreyedOrUnavailable
 from cfme.services.requests import RequestsView
+from cfme.utils.appliance import MiqImplementationContext
+from cfme.utils.appliance.implementations.rest import ViaREST
 from cfme.utils.appliance.implementations.ui import CFMENavigateStep
 from cfme.utils.appliance.implementations.ui import navigate_to
 from cfme.utils.appliance.implementations.ui import navigator
+from cfme.utils.appliance.implementations.ui import ViaUI
 from cfme.utils.conf import cfme_data
 from cfme.utils.log import logger
 from cfme.utils.pretty import Pretty
@@ -1315,35 +1319,56 @@ class InfraVm(VM):
 
 @attr.s
 class InfraVmCollection(VMCollection):
-    ENTITY = InfraVm
+    """Collection of infra VMs
 
-    def all(self):
-        """Return entities for all items in collection"""
-        # provider filter means we're viewing vms through provider details relationships
-        # provider filtered 'All' view includes vms and templates, can't be used
-        # TODO: prichard add support for slicing as in host collections
-        provider = self.filters.get('provider')  # None if no filter, need for entity instantiation
-        view = navigate_to(provider or self,
-                           'ProviderVms' if provider else 'VMsOnly')
-        # iterate pages here instead of use surf_pages=True because data is needed
-        entities = []
-        for _ in view.entities.paginator.pages():  # auto-resets to first page
-            page_entities = [entity for entity in view.entities.get_all(surf_pages=False)]
-            entities.extend(
-                # when provider filtered view, there's no provider data value
-                [self.instantiate(e.data['name'], provider or get_crud_by_name(e.data['provider']))
-                 for e in page_entities
-                 if e.data.get('provider') != '']  # safe provider check, orphaned shows no provider
-            )
-        # filtering
-        if self.filters.get("names"):
-            names = self.filters["names"]
-            entities = [e for e in entities if e.name in names]
-        if self.filters.get("name"):
-            name = self.filters["name"]
-            entities = [e for e in entities if e.name == name]
+    ``all`` lists the VMs through the UI by default. Through REST, with
+    ``appliance.context.use(ViaREST)``, the ``provider``/``name``/``names`` filters are pushed
+    down into the query and no page has to be rendered.
+    """
+    ENTITY = InfraVm
 
-        return entities
+    all = sentaku.ContextualMethod()
+
+
+@MiqImplementationContext.external_for(InfraVmCollection.all, ViaUI)
+def all_vms_ui(self):
+    """Return entities for all items in collection"""
+    # provider filter means we're viewing vms through provider details relationships
+    # provider filtered 'All' view includes vms and templates, can't be used
+    # TODO: prichard add support for slicing as in host collections
+    provider = self.filters.get('provider')  # None if no filter, need for entity instantiation
+    view = navigate_to(provider or self,
+                       'ProviderVms' if provider else 'VMsOnly')
+    # iterate pages here instead of use surf_pages=True because data is needed
+    entities = []
+    providers = {}
+    for _ in view.entities.paginator.pages():  # auto-resets to first page
+        page_entities = [entity for entity in view.entities.get_all(surf_pages=False)]
+        for e in page_entities:
+            # when provider filtered view, there's no provider data value
+            provider_name = e.data.get('provider')
+            if provider_name == '':
+                continue  # safe provider check, orphaned shows no provider
+            if not provider and provider_name not in providers:
+                providers[provider_name] = get_crud_by_name(provider_name)
+            entities.append(self.instantiate(e.data['name'], provider or providers[provider_name]))
+    # filtering
+    if self.filters.get("names"):
+        names = self.filters["names"]
+        entities = [e for e in entities if e.name in names]
+    if self.filters.get("name"):
+        name = self.filters["name"]
+        entities = [e for e in entities if e.name == name]
+
+    return entities
+
+
+@MiqImplementationContext.external_for(InfraVmCollection.all, ViaREST)
+def all_vms_rest(self):
+    names = self.filters.get("names")
+    if self.filters.get("name"):
+        names = [self.filters["name"]]
+    return self.query_rest('vms', provider=self.filters.get('provider'), names=names)
 
 
 @attr.s
@@ -1371,26 +1396,38 @@ class InfraTemplateCollection(ComparableMixin, TemplateCollection):
         parent = self.filters.get('parent')  # None if no filter
         return 'ProviderTemplates' if parent else 'TemplatesOnly'
 
-    def all(self):
-        """Return entities for all items in collection"""
-        # provider filter means we're viewing templates through provider details relationships
-        # provider filtered 'All' view includes vms and templates, can't be used
-        # TODO: prichard add support for slicing as in host collections
-        provider = self.filters.get('parent')
-        # instantiation
-        view = navigate_to(provider or self,
-                           'ProviderTemplates' if provider else 'TemplatesOnly')
-        # iterate pages here instead of use surf_pages=True because data is needed
-        entities = []
-        for _ in view.entities.paginator.pages():  # auto-resets to first page
-            page_entities = [entity for entity in view.entities.get_all(surf_pages=False)]
-            entities.extend(
-                # when provider filtered view, there's no provider data value
-                [self.instantiate(e.data['name'], provider or get_crud_by_name(e.data['provider']))
-                 for e in page_entities
-                 if e.data.get('provider') != '']  # safe provider check, orphaned shows no provider
-            )
-        return entities
+    all = sentaku.ContextualMethod()
+
+
+@MiqImplementationContext.external_for(InfraTemplateCollection.all, ViaUI)
+def all_templates_ui(self):
+    """Return entities for all items in collection"""
+    # provider filter means we're viewing templates through provider details relationships
+    # provider filtered 'All' view includes vms and templates, can't be used
+    # TODO: prichard add support for slicing as in host collections
+    provider = self.filters.get('parent')
+    # instantiation
+    view = navigate_to(provider or self,
+                       'ProviderTemplates' if provider else 'TemplatesOnly')
+    # iterate pages here instead of use surf_pages=True because data is needed
+    entities = []
+    providers = {}
+    for _ in view.entities.paginator.pages():  # auto-resets to first page
+        page_entities = [entity for entity in view.entities.get_all(surf_pages=False)]
+        for e in page_entities:
+            # when provider filtered view, there's no provider data value
+            provider_name = e.data.get('provider')
+            if provider_name == '':
+                continue  # safe provider check, orphaned shows no provider
+            if not provider and provider_name not in providers:
+                providers[provider_name] = get_crud_by_name(provider_name)
+            entities.append(self.instantiate(e.data['name'], provider or providers[provider_name]))
+    return entities
+
+
+@MiqImplementationContext.external_for(InfraTemplateCollection.all, ViaREST)
+def all_templates_rest(self):
+    return self.query_rest('templates', provider=self.filters.get('parent'))
 
 
 @attr.s
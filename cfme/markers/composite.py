@@ -18,7 +18,7 @@ def pytest_collection_modifyitems(session, config, items):
     from cfme.fixtures.pytest_store import store
 
     from cfme.utils.log import logger
-    from cfme.utils.trackerbot import composite_uncollect
+    from cfme.utils.result_history import ResultHistory
 
     len_collected = len(items)
 
@@ -35,40 +35,35 @@ def pytest_collection_modifyitems(session, config, items):
     store.terminalreporter.write(
         f'Attempting Uncollect for build: {build} and source: {source}\n', bold=True)
 
+    # The results are kept in the pytest cache between the runs, shared by the master and slaves
+    history = ResultHistory(config.cache.makedir('miq-composite-uncollect').join('results.db'))
     # The following code assumes slaves collect AFTER master is done, this prevents a parallel
     # speed up, but in the future we may move uncollection to a later stage and only do it on
     # master anyway.
     if store.parallelizer_role == 'master':
-        # Master always stores the composite uncollection
-        store.terminalreporter.write('Storing composite uncollect in cache...\n')
-        pl = composite_uncollect(build, source)
-        config.cache.set('miq-composite-uncollect', pl)
+        # Master always syncs the results
+        store.terminalreporter.write('Syncing composite uncollect results...\n')
+        synced = history.sync(build, source)
+        if synced is None:
+            store.terminalreporter.write(
+                'Could not sync, using the results synced before\n', yellow=True)
     else:
-        # Slaves always retrieve from cache
-        logger.info('Slave retrieving composite uncollect from cache')
-        pl = config.cache.get('miq-composite-uncollect', None)
+        logger.info('Slave retrieving composite uncollect from the result history')
 
-    if pl:
-        for test in pl['tests']:
-            pl['tests'][test]['old'] = True
+    idents = {}
+    for item in items:
+        name, location = get_test_idents(item)
+        idents[item] = f"{location}/{name}"
+    statuses = history.statuses(build, source, set(idents.values()))
+    history.close()
 
-        # Here we pump into artifactor
-        # art_client.fire_hook('composite_pump', old_artifacts=pl['tests'])
-        for item in items:
-            try:
-                name, location = get_test_idents(item)
-                test_ident = f"{location}/{name}"
-                status = pl['tests'][test_ident]['statuses']['overall']
+    for item in items:
+        if statuses.get(idents[item]) == 'passed':
+            logger.info(f'Uncollecting {item.name} as it passed last time')
+        else:
+            new_items.append(item)
 
-                if status == 'passed':
-                    logger.info(f'Uncollecting {item.name} as it passed last time')
-                    continue
-                else:
-                    new_items.append(item)
-            except Exception:
-                new_items.append(item)
-
-        items[:] = new_items
+    items[:] = new_items
 
     len_filtered = len(items)
     filtered_count = len_collected - len_filtered
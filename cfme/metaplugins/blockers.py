@@ -41,7 +41,7 @@ from kwargify import kwargify as _kwargify
 from cfme.fixtures.artifactor_plugin import fire_art_test_hook
 from cfme.markers.meta import plugin
 from cfme.utils.appliance import find_appliance
-from cfme.utils.blockers import Blocker
+from cfme.utils.blockers import prefetch_blockers
 from cfme.utils.pytest_shortcuts import extract_fixtures_values
 
 
@@ -84,9 +84,8 @@ def resolve_blockers(item, blockers):
 
     # Check blockers
     use_blockers = []
-    # Bugzilla shortcut
-    blockers = [f"BZ#{b}" if isinstance(b, int) else b for b in blockers]
-    for blocker in map(Blocker.parse, blockers):
+    # Usually prefetched after collection already, otherwise fetches the item's blockers in batch
+    for blocker in prefetch_blockers(blockers):
         if blocker.blocks:
             use_blockers.append(blocker)
     # Unblocking
@@ -1,8 +1,12 @@
+import sys
+import time
 from collections.abc import Callable
+from functools import lru_cache
 
 import attr
 from cached_property import cached_property
 from navmazing import NavigationDestinationNotFound
+from pkg_resources import EntryPoint
 from widgetastic.exceptions import NoSuchElementException
 from widgetastic.exceptions import RowNotFound
 from widgetastic.utils import VersionPick
@@ -17,11 +21,57 @@ from cfme.utils.log import logger
 from cfme.utils.wait import TimedOutError
 
 
-def load_appliance_collections():
+#: Collection name -> (seconds, names of the modules) imported when resolving its entry point
+COLLECTION_IMPORTS = {}
+
+
+@lru_cache(maxsize=None)
+def _appliance_collection_entry_points():
     from pkg_resources import iter_entry_points
-    return {
-        ep.name: ep.resolve() for ep in iter_entry_points('manageiq.appliance_collections')
-    }
+    return {ep.name: ep for ep in iter_entry_points('manageiq.appliance_collections')}
+
+
+def load_appliance_collections():
+    """Returns mapping of appliance collection names to their entry points.
+
+    The entry points are resolved by :py:class:`EntityCollections` on first access, so creating
+    an appliance does not import the modules of all the collections.
+    """
+    return dict(_appliance_collection_entry_points())
+
+
+def resolve_collection(name, entry_point):
+    """Import the collection class of the entry point, recording the cost in COLLECTION_IMPORTS"""
+    if name in COLLECTION_IMPORTS:
+        # already imported for another appliance
+        return entry_point.resolve()
+    modules_before = set(sys.modules)
+    start = time.perf_counter()
+    cls = entry_point.resolve()
+    seconds = time.perf_counter() - start
+    modules = sorted(set(sys.modules) - modules_before)
+    COLLECTION_IMPORTS[name] = (seconds, modules)
+    logger.debug('[COLLECTIONS] Resolved collection %s in %.1fms, importing %d modules',
+                 name, seconds * 1000, len(modules))
+    return cls
+
+
+def collection_import_report():
+    """Returns a report of the collections resolved so far, slowest first.
+
+    Every collection is listed with the time it took to resolve it and the modules it imported,
+    modules already imported by previously resolved collections are not listed again.
+    """
+    lines = []
+    total = 0
+    for name, (seconds, modules) in sorted(
+            COLLECTION_IMPORTS.items(), key=lambda item: item[1][0], reverse=True):
+        total += seconds
+        lines.append(f'{name}: {seconds * 1000:.1f}ms, {len(modules)} modules')
+        lines.extend(f'    {module}' for module in modules)
+    lines.append(
+        f'{len(COLLECTION_IMPORTS)} collections resolved in {total * 1000:.1f}ms')
+    return '\n'.join(lines)
 
 
 @attr.s
@@ -67,6 +117,9 @@ class EntityCollections:
         if name not in self._collection_cache:
             item_filters = self._filters.copy()
             cls_and_or_filter = self._available_collections[name]
+            if isinstance(cls_and_or_filter, EntryPoint):
+                cls_and_or_filter = resolve_collection(name, cls_and_or_filter)
+                self._available_collections[name] = cls_and_or_filter
             if isinstance(cls_and_or_filter, tuple):
                 item_filters.update(cls_and_or_filter[1])
                 cls_or_verpick = cls_and_or_filter[0]
@@ -3,6 +3,7 @@ import pytest
 
 from cfme.modeling.base import BaseCollection
 from cfme.modeling.base import BaseEntity
+from cfme.modeling.base import COLLECTION_IMPORTS
 from cfme.modeling.base import EntityCollections
 from cfme.modeling.base import load_appliance_collections
 from cfme.modeling.base import parent_of_type
@@ -49,6 +50,14 @@ def test_appliance_collections_dir(dummy_appliance):
     assert base_level_collections.issubset(dir(dummy_appliance.collections))
 
 
+def test_appliance_collections_lazy(dummy_appliance):
+    collections = dummy_appliance.collections
+    assert not any(isinstance(c, type) for c in collections._available_collections.values())
+    assert collections.datastores
+    assert isinstance(collections._available_collections['datastores'], type)
+    assert 'datastores' in COLLECTION_IMPORTS
+
+
 def test_appliance_collection(dummy_appliance):
     obj = dummy_appliance.collections.datastores
     assert obj.parent == dummy_appliance
@@ -1,4 +1,6 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
+from threading import local
 
 import fauxfactory
 from widgetastic.utils import partial_match
@@ -8,7 +10,12 @@ from cfme.infrastructure.provider.rhevm import RHEVMProvider
 from cfme.infrastructure.provider.virtualcenter import VMwareProvider
 from cfme.utils.log import logger
 from cfme.utils.rest import create_resource
+from cfme.utils.rest import filter_resources
+from cfme.utils.rest import response_task_ids
+from cfme.utils.rest import TaskWaiter
+from cfme.utils.rest import wait_for_resources
 from cfme.utils.virtual_machines import deploy_template
+from cfme.utils.wait import TimedOutError
 from cfme.utils.wait import wait_for
 
 TEMPLATE_TORSO = """{
@@ -25,6 +32,104 @@ TEMPLATE_TORSO = """{
 }
 """
 
+#: Collections whose resources may reference resources of the given collection, they are deleted
+#: first when both are cleaned up together
+CLEANUP_DEPENDENTS = {
+    'categories': ('tags',),
+    'conditions': ('policies',),
+    'groups': ('users',),
+    'policies': ('policy_profiles',),
+    'roles': ('groups',),
+    'service_catalogs': ('service_templates',),
+    'service_dialogs': ('service_templates',),
+    'service_templates': ('services',),
+    'tenants': ('groups',),
+}
+
+#: Collections cleaned up at the same time
+CLEANUP_WORKERS = 4
+
+#: Collections whose failed cleanup is only warned about, the tests may delete their resources too
+CLEANUP_TOLERATED = {'services'}
+
+
+class _Cleanup:
+    """Deletes all the resources created for one fixture request (or test) together.
+
+    The resources of each collection are deleted by a single bulk action. Collections are
+    deleted in waves following :py:data:`CLEANUP_DEPENDENTS`, the collections of one wave
+    concurrently. The first failure is raised once all the collections were tried, except for
+    the :py:data:`CLEANUP_TOLERATED` ones.
+    """
+    def __init__(self, appliance):
+        self.appliance = appliance
+        self.ids = {}
+        self._local = local()
+
+    @classmethod
+    def for_request(cls, request, appliance):
+        cleanup = getattr(request, '_rest_cleanup', None)
+        if cleanup is None:
+            cleanup = request._rest_cleanup = cls(appliance)
+            request.addfinalizer(cleanup)
+        return cleanup
+
+    def add(self, col_name, entities):
+        ids = self.ids.setdefault(col_name, [])
+        ids.extend(e.id for e in entities if e.id not in ids)
+
+    def waves(self):
+        remaining = set(self.ids)
+        while remaining:
+            wave = sorted(
+                col_name for col_name in remaining
+                if not remaining.intersection(CLEANUP_DEPENDENTS.get(col_name, ())))
+            remaining.difference_update(wave)
+            yield wave
+
+    def _rest_api(self):
+        # the api object keeps only the last response, which holds the ids of the started tasks,
+        # so each worker thread uses its own
+        rest_api = getattr(self._local, 'rest_api', None)
+        if rest_api is None:
+            rest_api = self._local.rest_api = self.appliance.new_rest_api_instance()
+        return rest_api
+
+    def delete(self, col_name):
+        rest_api = self._rest_api()
+        collection = getattr(rest_api.collections, col_name)
+        ids = [int(i) if str(i).isdigit() else i for i in self.ids[col_name]]
+        # some of the resources may have been deleted by the test already
+        existing = filter_resources(collection, 'id', ids)
+        if not existing:
+            return
+        collection.action.delete(*existing)
+        _wait_for_cleanup_tasks(rest_api, col_name, response_task_ids(rest_api.response))
+
+    def __call__(self):
+        errors = []
+        with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as executor:
+            for wave in self.waves():
+                futures = {col_name: executor.submit(self.delete, col_name) for col_name in wave}
+                for col_name, future in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        if col_name in CLEANUP_TOLERATED:
+                            logger.warning('Failed to delete %s: %s', col_name, e)
+                        else:
+                            logger.exception('Failed to delete %s', col_name)
+                            errors.append(e)
+        self.ids.clear()
+        if errors:
+            raise errors[0]
+
+
+def cleanup_resources(request, appliance, col_name, entities):
+    """Deletes the entities when the request finishes, together with the other resources
+    created for the request, see :py:class:`_Cleanup`."""
+    _Cleanup.for_request(request, appliance).add(col_name, entities)
+
 
 def service_catalogs(request, appliance, num=5):
     """Create service catalogs using REST API."""
@@ -170,13 +275,7 @@ def services(
     provisioned_service = appliance.rest_api.collections.services.get(
         service_template_id=service_template.id)
 
-    @request.addfinalizer
-    def _finished():
-        try:
-            provisioned_service.action.delete()
-        except Exception:
-            # service can be deleted by test
-            logger.warning(f'Failed to delete service `{service_name}`.')
+    cleanup_resources(request, appliance, 'services', [provisioned_service])
 
     # tests expect iterable
     return [provisioned_service]
@@ -266,19 +365,10 @@ def service_templates_ui(request, appliance, service_dialog=None, service_catalo
         )
 
     collection = appliance.rest_api.collections.service_templates
-
-    for new_name in new_names:
-        wait_for(lambda: collection.find_by(name=new_name) or False, num_sec=180, delay=10)
-
-    s_tpls = [ent for ent in collection if ent.name in new_names]
-
-    @request.addfinalizer
-    def _finished():
-        collection.reload()
-        to_delete = [ent for ent in collection if ent.name in new_names]
-        if to_delete:
-            collection.action.delete(*to_delete)
-
+    wait_for_resources(collection, 'name', new_names)
+    s_tpls = filter_resources(
+        collection, 'name', new_names, expand='resources', attributes='name')
+    cleanup_resources(request, appliance, 'service_templates', s_tpls)
     return s_tpls
 
 
@@ -476,24 +566,25 @@ def users(request, appliance, num=1, **kwargs):
     return users, data
 
 
+def _wait_for_cleanup_tasks(rest_api, col_name, task_ids, num_sec=300):
+    # bulk deletes of some collections only queue tasks, wait for all of them together
+    try:
+        tasks = TaskWaiter(rest_api, task_ids, num_sec=num_sec).wait()
+    except TimedOutError as e:
+        logger.warning('Deleting %s did not finish: %s', col_name, e)
+        return
+    for task_id, task in tasks.items():
+        if task['status'].lower() != 'ok':
+            logger.warning('Deleting %s failed in task %s: %s',
+                           col_name, task_id, task.get('message'))
+
+
 def _creating_skeleton(request, appliance, col_name, col_data, col_action='create',
         substr_search=False):
 
     entities = create_resource(
         appliance.rest_api, col_name, col_data, col_action=col_action, substr_search=substr_search)
-
-    # make sure the original list of `entities` is preserved for cleanup
-    original_entities = list(entities)
-
-    @request.addfinalizer
-    def _finished():
-        collection = getattr(appliance.rest_api.collections, col_name)
-        collection.reload()
-        ids = [e.id for e in original_entities]
-        delete_entities = [e for e in collection if e.id in ids]
-        if delete_entities:
-            collection.action.delete(*delete_entities)
-
+    cleanup_resources(request, appliance, col_name, entities)
     return entities
 
 
@@ -10,12 +10,21 @@ Options in env.yaml will define what files to collect, will default to the set b
             - /var/www/miq/vmdb/log/production.log
             - /var/www/miq/vmdb/log/automation.log
             - /var/www/miq/vmdb/log/appliance_console.log
+        workers: 4  # appliances to collect the logs from at once
+        since_session_start: False  # only collect what was logged since the session started
 
-Log files will be tarred and written to log_path
+The appliance tars and compresses the log files itself and the archive is streamed straight into
+``log-collector-<hostname>.tar.gz``, written to ``local_dir``. That needs a root login, with any
+other login the log files are copied one by one, whole, and archived locally.
+
+With ``since_session_start``, the sizes of the log files of the session's appliances are noted when
+the session starts and only the rest of each file is collected. A file that got smaller since, e.g.
+because it was rotated, is collected whole.
 """
 import os.path
-import shutil
-import subprocess
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
 
 import pytest
 import scp
@@ -23,6 +32,7 @@ import scp
 from cfme.utils.conf import env
 from cfme.utils.log import logger
 from cfme.utils.path import log_path
+from cfme.utils.quote import quote
 
 
 DEFAULT_FILES = ['/var/www/miq/vmdb/log/evm.log',
@@ -32,6 +42,11 @@ DEFAULT_FILES = ['/var/www/miq/vmdb/log/evm.log',
 
 DEFAULT_LOCAL = log_path
 
+DEFAULT_WORKERS = 4
+
+# Sizes of the log files when the session started, by appliance hostname
+session_offsets = {}
+
 
 def pytest_addoption(parser):
     parser.addoption('--collect-logs', action='store_true',
@@ -44,6 +59,33 @@ def pytest_addhooks(pluginmanager):
     pluginmanager.add_hookspecs(CollectLogsHookSpecs)
 
 
+def collector_conf(key, default):
+    try:
+        return env.log_collector[key]
+    except (AttributeError, KeyError, TypeError):
+        logger.info('No log_collector.%s in env, using the default: %s', key, default)
+        return default
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    if not config.getoption('--collect-logs') or not collector_conf('since_session_start', False):
+        return
+    from cfme.test_framework.appliance import PLUGIN_KEY
+    from cfme.utils.appliance import DummyAppliance
+    holder = config.pluginmanager.get_plugin(PLUGIN_KEY)
+    if holder is None:
+        return
+    log_files = collector_conf('log_files', DEFAULT_FILES)
+    for app in holder.appliances:
+        if isinstance(app, DummyAppliance) or app.is_dev:
+            continue
+        try:
+            session_offsets[app.hostname] = log_sizes(app, log_files)
+        except Exception as exc:
+            logger.exception(f"Failed to note the log sizes, collecting whole logs: {exc}")
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_unconfigure(config):
     yield  # since hookwrapper, let hookimpl run
@@ -60,50 +102,112 @@ def pytest_unconfigure(config):
 
 @pytest.hookimpl
 def pytest_collect_logs(config, appliances):
-    if not config.getoption('--collect-logs'):
+    if not config.getoption('--collect-logs') or not appliances:
         return
 
-    for app in appliances:
+    def collect(app):
         try:
             collect_logs(app)
         except Exception as exc:
             logger.exception(f"Failed to collect logs: {exc}")
 
+    workers = min(collector_conf('workers', DEFAULT_WORKERS), len(appliances))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(collect, appliances))
+
+
+def log_sizes(app, log_files):
+    """Sizes of the log files on the appliance, in bytes, by path. Missing files are left out."""
+    result = app.ssh_client.run_command(
+        'stat -c "%s %n" {} 2> /dev/null'.format(' '.join(quote(f) for f in log_files)))
+    sizes = {}
+    for line in result.output.splitlines():
+        size, _, path = line.partition(' ')
+        if size.isdigit() and path in log_files:
+            sizes[path] = int(size)
+    return sizes
+
+
+def archive_command(name, log_files, offsets=None):
+    """Shell command writing a tar.gz of the log files to stdout, with the files in ``name/``.
+
+    With ``offsets``, only the part of each file past its offset is archived.
+    """
+    if not offsets:
+        # Missing files are skipped, logs being written while tar reads them only give warnings
+        return (
+            'tar czf - --ignore-failed-read --warning=no-file-changed --transform {} -C / {}'
+            .format(quote(f's,^.*/,{name}/,'), ' '.join(quote(f.lstrip('/')) for f in log_files)))
+    parts = ['stage=$(mktemp -d)', f'mkdir "$stage"/{quote(name)}']
+    for f in log_files:
+        offset = offsets.get(f, 0)
+        target = '"$stage"/{}/{}'.format(quote(name), quote(os.path.basename(f)))
+        parts.append(
+            'if [ -f {f} ]; then if [ $(stat -c %s {f}) -ge {offset} ]; '
+            'then tail -c +{start} {f} > {target}; else cat {f} > {target}; fi; fi'.format(
+                f=quote(f), offset=offset, start=offset + 1, target=target))
+    parts.append(f'tar czf - -C "$stage" {quote(name)}; rc=$?; rm -rf "$stage"; exit $rc')
+    return '; '.join(parts)
+
+
+def stream_logs(ssh_client, name, log_files, local_path, offsets=None):
+    """Write a tar.gz of the log files, see :py:func:`archive_command`, made on the appliance."""
+    result = ssh_client.run_command_to_file(
+        archive_command(name, log_files, offsets), local_path)
+    # tar exits with 1 when a file changed while it was read, which is expected of live logs
+    if result.rc > 1:
+        raise RuntimeError(
+            f'Archiving the logs on {ssh_client.hostname} failed with {result.rc}: '
+            f'{result.output}')
+    if result.output:
+        logger.warning('Archiving the logs on %s: %s', ssh_client.hostname, result.output)
+
+
+def copy_logs(ssh_client, name, log_files, local_path):
+    """Copy the log files from the appliance and write a tar.gz of them, with them in ``name/``."""
+    with TemporaryDirectory() as tmp_dir:
+        copy_dir = os.path.join(tmp_dir, name)
+        os.mkdir(copy_dir)
+        for f in log_files:
+            try:
+                ssh_client.get_file(f, copy_dir)
+            except scp.SCPException as ex:
+                logger.error("Failed to transfer file %s: %s", f, ex)
+        with tarfile.open(local_path, 'w:gz') as tar:
+            tar.add(copy_dir, arcname=name)
+
 
 def collect_logs(app):
-    log_files = DEFAULT_FILES
+    log_files = collector_conf('log_files', DEFAULT_FILES)
     local_dir = DEFAULT_LOCAL
-    try:
-        log_files = env.log_collector.log_files
-    except (AttributeError, KeyError):
-        logger.info('No log_collector.log_files in env, using the default: %s', log_files)
-        pass
-    try:
-        local_dir = log_path.join(env.log_collector.local_dir)
-    except (AttributeError, KeyError):
-        logger.info('No log_collector.local_dir in env, using the default: %s', local_dir)
-        pass
+    local_dir_name = collector_conf('local_dir', None)
+    if local_dir_name is not None:
+        local_dir = log_path.join(local_dir_name)
 
     # Handle local dir existing
     local_dir.ensure(dir=True)
 
-    with app.ssh_client as ssh_client:
-        logger.info(f'Starting log collection on appliance {app.hostname}')
-        tarred_dir_name = f'log-collector-{app.hostname}'
-        # wrap the files in ls, redirecting stderr, to ignore files that don't exist
-        tar_dir_path = os.path.join(local_dir.strpath, tarred_dir_name)
-        tarball_path = f'{tar_dir_path}.tar.gz'
-        os.mkdir(tar_dir_path)
-        for f in log_files:
-            try:
-                ssh_client.get_file(f, tar_dir_path)
-            except scp.SCPException as ex:
-                logger.error("Failed to transfer file %s: %s", f, ex)
-        logger.debug('Creating tar file for appliance %s', app)
-        subprocess.run(['tar', '-C', local_dir, '-czvf', tarball_path, tarred_dir_name],
-                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        shutil.rmtree(tar_dir_path)
-        logger.info('Wrote the following file %s', tarball_path)
+    logger.info(f'Starting log collection on appliance {app.hostname}')
+    tarred_dir_name = f'log-collector-{app.hostname}'
+    tarball_path = os.path.join(local_dir.strpath, f'{tarred_dir_name}.tar.gz')
+    partial_path = f'{tarball_path}.part'
+    try:
+        with app.ssh_client as ssh_client:
+            if ssh_client.username == 'root':
+                stream_logs(ssh_client, tarred_dir_name, log_files, partial_path,
+                            session_offsets.get(app.hostname))
+            else:
+                # sudo needs a pseudo-tty, which would mangle the streamed archive
+                logger.info('Not logged in to %s as root, copying whole log files one by one',
+                            app.hostname)
+                copy_logs(ssh_client, tarred_dir_name, log_files, partial_path)
+    except Exception:
+        # Do not leave a truncated archive behind
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    os.replace(partial_path, tarball_path)
+    logger.info('Wrote the following file %s', tarball_path)
 
 
 class CollectLogsHookSpecs:
@@ -1,5 +1,6 @@
 import json
 import os
+import time
 
 import attr
 import requests
@@ -10,10 +11,15 @@ from cfme.utils.conf import credentials
 from cfme.utils.conf import env
 from cfme.utils.log import logger
 from cfme.utils.version import get_stream
+from cfme.utils.wait import TimedOutError
 from cfme.utils.wait import wait_for
 # TODO: use custom wait_for logger fitting sprout
 
 
+#: How long a single ``wait_pool_change`` call may block on the sprout side
+POOL_WAIT_TIMEOUT = 50
+
+
 class SproutException(Exception):
     pass
 
@@ -38,18 +44,20 @@ class SproutClient:
     _port = attr.ib(default=8000)
     _entry = attr.ib(default="appliances/api")
     _auth = attr.ib(default=None)
+    # keep-alive connections, reused by all the calls
+    _session = attr.ib(default=attr.Factory(requests.Session), repr=False)
 
     @property
     def api_entry(self):
         return f"{self._proto}://{self._host}:{self._port}/{self._entry}"
 
-    def _post(self, **data):
-        return requests.post(self.api_entry, data=json.dumps(data))
+    def _post(self, timeout=None, **data):
+        return self._session.post(self.api_entry, data=json.dumps(data), timeout=timeout)
 
-    def _call_post(self, **data):
+    def _call_post(self, timeout=None, **data):
         """Protect from the Sprout being updated (error 502,503)"""
         result = wait_for(
-            lambda: self._post(**data),
+            lambda: self._post(timeout=timeout, **data),
             num_sec=60,
             fail_condition=lambda r: r.status_code in {502, 503},
             delay=2,
@@ -57,6 +65,9 @@ class SproutClient:
         return result.out.json()
 
     def call_method(self, name, *args, **kwargs):
+        return self._call_method(name, args, kwargs)
+
+    def _call_method(self, name, args, kwargs, timeout=None):
         req_data = {
             "method": name,
             "args": args,
@@ -65,7 +76,7 @@ class SproutClient:
         logger.info(f"SPROUT: Called {name} with {args} {kwargs}")
         if self._auth is not None:
             req_data["auth"] = self._auth
-        result = self._call_post(**req_data)
+        result = self._call_post(timeout=timeout, **req_data)
         try:
             if result["status"] == "exception":
                 raise SproutException(
@@ -124,11 +135,7 @@ class SproutClient:
             count=count,
             **kwargs
         )
-        wait_for(
-            lambda: self.call_method('request_check', str(request_id))['finished'],
-            num_sec=wait_time,
-            message=f'provision {count} appliance(s) from sprout')
-        data = self.call_method('request_check', str(request_id))
+        data = self.wait_pool_finished(request_id, num_sec=wait_time)
         logger.debug(data)
         appliances = []
         for appliance in data['appliances']:
@@ -139,6 +146,53 @@ class SproutClient:
             appliances.append(IPAppliance(**app_args))
         return appliances, request_id
 
+    def wait_pool_change(self, pool_id, state=None, timeout=POOL_WAIT_TIMEOUT):
+        """Blocks until the status of the pool differs from the one identified by ``state``.
+
+        Sprout returns the status as soon as it changes (or the pool is finished), or after
+        ``timeout`` seconds with the same status. ``state`` of the result identifies the status.
+        """
+        return self._call_method(
+            'wait_pool_change', (str(pool_id),), {'state': state, 'timeout': timeout},
+            timeout=timeout + 30)
+
+    def wait_pool_finished(self, pool_id, num_sec=900, on_change=None):
+        """Waits until the pool is finished and returns its status.
+
+        Long-polls sprout with :py:meth:`wait_pool_change`, so the fulfilment is noticed right
+        away. Sprouts without the long-poll method are polled with ``request_check`` instead.
+
+        Args:
+            pool_id: Id of the appliance pool
+            num_sec: How long to wait for the pool
+            on_change: Called with the new status on every change of the pool
+        """
+        deadline = time.time() + num_sec
+        status = {}
+        while True:
+            state = status.get('state')
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimedOutError(
+                    f'Sprout pool {pool_id} not finished in {num_sec} seconds')
+            try:
+                status = self.wait_pool_change(
+                    pool_id, state=state,
+                    timeout=min(POOL_WAIT_TIMEOUT, max(int(remaining), 1)))
+            except SproutException as e:
+                if 'NameError' not in str(e):
+                    raise
+                logger.info('SPROUT: long polling not available, polling request_check')
+                wait_for(
+                    lambda: self.call_method('request_check', str(pool_id))['finished'],
+                    num_sec=remaining, delay=5,
+                    message=f'sprout pool {pool_id} to be finished')
+                return self.call_method('request_check', str(pool_id))
+            if on_change is not None and status['state'] != state:
+                on_change(status)
+            if status['finished']:
+                return status
+
     def destroy_pool(self, pool_id):
         self.call_method('destroy_pool', id=pool_id)
 
@@ -1,5 +1,6 @@
 import random
 import re
+import time
 from threading import Timer
 from urllib.parse import urlparse
 
@@ -14,7 +15,6 @@ from cfme.utils import at_exit
 from cfme.utils import conf
 from cfme.utils.log import logger as log
 from cfme.utils.path import project_path
-from cfme.utils.wait import wait_for
 # todo: use own logger after logfix merge
 
 
@@ -250,13 +250,9 @@ class SproutManager:
     def request_appliances(self, provision_request):
         self.request_pool(provision_request)
 
+        start = time.time()
         try:
-            result = wait_for(
-                self.check_fullfilled,
-                num_sec=provision_request.provision_timeout * 60,
-                delay=5,
-                message="requesting appliances was fulfilled"
-            )
+            pool = self.wait_fulfilled(provision_request.provision_timeout * 60)
         except Exception:
             pool = self.request_check()
             dump_pool_info(log, pool)
@@ -265,10 +261,9 @@ class SproutManager:
             raise
         else:
             at_exit(self.destroy_pool)
-            pool = self.request_check()
             dump_pool_info(log, pool)
 
-        log.info("Provisioning took %.1f seconds", result.duration)
+        log.info("Provisioning took %.1f seconds", time.time() - start)
         return pool["appliances"]
 
     def request_pool(self, provision_request):
@@ -324,6 +319,18 @@ class SproutManager:
         log.debug("fulfilled at %f %%", result['progress'])
         return result["finished"]
 
+    def wait_fulfilled(self, num_sec):
+        """Waits for the pool to be finished, sprout notifies about the changes of the pool."""
+        try:
+            return self.client.wait_pool_finished(
+                self.pool, num_sec=num_sec,
+                on_change=lambda pool: log.debug("fulfilled at %f %%", pool['progress']))
+        except SproutException as e:
+            # TODO: ensure we only exit this way on sprout usage
+            self.destroy_pool()
+            log.error("sprout pool could not be fulfilled\n%s", str(e))
+            pytest.exit(1)
+
     def clean_jenkins_job(self, jenkins_job):
         try:
             log.info(
@@ -7,6 +7,7 @@ import traceback
 import warnings
 from copy import copy
 from datetime import datetime
+from datetime import timedelta
 from time import sleep
 from time import time
 from urllib.parse import urlparse
@@ -39,11 +40,14 @@ from cfme.utils.appliance.db import ApplianceDB
 from cfme.utils.appliance.implementations.rest import ViaREST
 from cfme.utils.appliance.implementations.ssui import ViaSSUI
 from cfme.utils.appliance.implementations.ui import ViaUI
+from cfme.utils.appliance.readiness import ReadinessDetector
 from cfme.utils.appliance.services import SystemdException
 from cfme.utils.appliance.services import SystemdService
 from cfme.utils.log import create_sublogger
 from cfme.utils.log import logger
 from cfme.utils.log import logger_wrap
+from cfme.utils.log import perflog
+from cfme.utils.log_index import LogIndex
 from cfme.utils.net import is_pingable
 from cfme.utils.net import net_check
 from cfme.utils.net import resolve_hostname
@@ -86,6 +90,11 @@ current_miqqe_version = _current_miqqe_version()
 
 
 class MiqApi(VanillaMiqApi):
+    def _sending_request(self, func, *args, **kwargs):
+        # func is a partial of the session method, e.g. partial(self._session.get, url, ...)
+        with perflog.span('rest', method=func.func.__name__.upper(), url=func.args[0]):
+            return super()._sending_request(func, *args, **kwargs)
+
     def get_entity_by_href(self, href):
         """Parses the collections"""
         parsed = urlparse(href)
@@ -238,6 +247,8 @@ class IPAppliance:
             self.is_pod = False
         # only set when given so we can defer to the rest api via the cached property
         self._version = version
+        # started by the restarts, so wait_for_miq_ready can watch evm.log from before them
+        self._readiness_detector = None
 
     def unregister(self):
         """ unregisters appliance from RHSM/SAT6 """
@@ -989,8 +1000,7 @@ class IPAppliance:
 
         if not self.chronyd.enabled:
             logger.debug("chrony will start on system startup")
-            self.chronyd.enable()
-            self.chronyd.daemon_reload()
+            self.chronyd.enable(daemon_reload=True)
 
         # Retrieve time servers from yamls
         try:
@@ -1165,8 +1175,9 @@ class IPAppliance:
         repo_id_url_mapping = {}
         name_regexp = re.compile(r"^\[update-([^\]]+)\]")
         baseurl_regexp = re.compile(r"baseurl\s*=\s*([^\s]+)")
-        for repofile in self.get_repofile_list():
-            ssh_result = self.ssh_client.run_command(f"cat /etc/yum.repos.d/{repofile}")
+        ssh_results = self.ssh_client.run_commands(
+            [f"cat /etc/yum.repos.d/{repofile}" for repofile in self.get_repofile_list()])
+        for ssh_result in ssh_results:
             if ssh_result.failed:
                 # Something happened meanwhile?
                 continue
@@ -1207,11 +1218,13 @@ class IPAppliance:
             kwargs["enabled"] = 1
         filename = f"/etc/yum.repos.d/{repo_id}.repo"
         logger.info("Writing a new repofile %s %s", repo_id, repo_url)
-        self.ssh_client.run_command(f'echo "[update-{repo_id}]" > {filename}')
-        self.ssh_client.run_command(f'echo "name=update-url-{repo_id}" >> {filename}')
-        self.ssh_client.run_command(f'echo "baseurl={repo_url}" >> {filename}')
+        commands = [
+            f'echo "[update-{repo_id}]" > {filename}',
+            f'echo "name=update-url-{repo_id}" >> {filename}',
+            f'echo "baseurl={repo_url}" >> {filename}']
         for k, v in kwargs.items():
-            self.ssh_client.run_command(f'echo "{k}={v}" >> {filename}')
+            commands.append(f'echo "{k}={v}" >> {filename}')
+        self.ssh_client.run_commands(commands, stop_on_failure=True)
         return repo_id
 
     def add_product_repo(self, repo_url, **kwargs):
@@ -1427,9 +1440,10 @@ class IPAppliance:
         num_of_tries = 3
         was_running_count = 0
         for try_num in range(num_of_tries):
+            if try_num:
+                sleep(3)
             if self._check_appliance_ui_wait_fn():
                 was_running_count += 1
-            sleep(3)
 
         if was_running_count == 0:
             return False
@@ -1447,7 +1461,7 @@ class IPAppliance:
             log_callback('Waiting for evm service to stop')
             try:
                 wait_for(
-                    lambda: self.evmserverd.running, num_sec=120, fail_condition=True, delay=5,
+                    lambda: self.evmserverd.running, num_sec=120, fail_condition=True, delay=1,
                     message='evm service to stop')
             except TimedOutError:
                 # Don't care if it's still running
@@ -1457,8 +1471,9 @@ class IPAppliance:
             self.db_service.restart()
             log_callback('Waiting for database to be available')
             wait_for(
-                lambda: self.db.is_online, num_sec=90, delay=5,
+                lambda: self.db.is_online, num_sec=90, delay=1,
                 message="database to be available")
+            self._readiness_detector = ReadinessDetector(self).start()
             self.evmserverd.start()
 
     @logger_wrap("Rebooting Appliance: {}")
@@ -1467,27 +1482,40 @@ class IPAppliance:
         client = self.ssh_client
 
         old_uptime = client.uptime()
+        detector = ReadinessDetector(self).start()
         client.run_command('reboot')
 
         wait_for(lambda: client.uptime() < old_uptime, handle_exception=True,
-            num_sec=600, message='appliance to reboot', delay=10)
+            num_sec=600, message='appliance to reboot', delay=3)
 
+        self._readiness_detector = detector
         if wait_for_miq_ready:
             self.wait_for_miq_ready()
 
     @logger_wrap("Waiting for web_ui: {}")
     def wait_for_miq_ready(self, num_sec: int = 900, log_callback=None):
-        """Waits for the web UI and API server to be ready / to not ready
+        """Waits for the web UI and API server to be ready
+
+        The UI and the API are probed at once, see
+        :py:class:`cfme.utils.appliance.readiness.ReadinessDetector`. After
+        :py:meth:`restart_evm_rude` or :py:meth:`reboot`, evm.log is watched for the workers
+        being started too, unless the restart was longer than ``num_sec`` ago.
 
         Args:
             num_secs: Number of seconds to wait until timeout (default ``900``)
             log_callback: Function to use for writing log messages.
+
+        Returns:
+            :py:class:`cfme.utils.appliance.readiness.ReadinessTimeline` of the wait
         """
-        (log_callback or self.log.info)('Waiting for web UI to appear')
-        result, secs_taken = wait_for(self._check_appliance_ui_wait_fn,
-                                      num_sec=num_sec, fail_condition=False, delay=10)
-        self.wait_for_api_available(num_sec - secs_taken)
-        return result
+        (log_callback or self.log.info)('Waiting for web UI and API to appear')
+        detector, self._readiness_detector = self._readiness_detector, None
+        if detector is not None and detector.age > num_sec:
+            # Left over from a restart nobody waited for, its evm.log offset and start are stale
+            self.log.info('Not using the readiness detector started %.0fs ago', detector.age)
+            detector = None
+        detector = detector or ReadinessDetector(self)
+        return detector.wait(num_sec, log_callback=log_callback)
 
     def wait_for_api_available(self, num_sec=600):
         """ Waits for the MIQ API to be available. Invalidates the cached client.
@@ -1495,33 +1523,9 @@ class IPAppliance:
         Args:
             num_sec: Number of seconds to wait until num_sec(default ``600``)
         """
-
-        def _check_appliance_api_ready():
-            try:
-                # There are 2 hard problems in computer science: cache
-                # invalidation, naming things, and off-by-1 errors.
-                # -- Leon Bambrick
-                #
-                # Try invalidating stale cached api object if exists
-                try:
-                    del self.__dict__['rest_api']
-                except KeyError:
-                    pass
-                api = self.rest_api
-
-                # Make sure we really make a new request. Perhaps accessing the
-                # rest_api property just creates a client object but no network
-                # communicatin is done until we access some property of the
-                # client.
-                assert api.server_info['server_href']
-                self.log.info("Appliance REST API ready")
-                return api
-            except APIException as exc:
-                self.log.warning('Appliance RESTAPI not ready: %s', exc)
-                return False
-
-        api, _ = wait_for(func=_check_appliance_api_ready, num_sec=num_sec, delay=10)
-        return api
+        ReadinessDetector(self, signals=('api',), required=('api',)).wait(num_sec)
+        self.log.info("Appliance REST API ready")
+        return self.rest_api
 
     @logger_wrap("Install VDDK: {}")
     def install_vddk(self, force=False, vddk_url=None, log_callback=None):
@@ -1770,11 +1774,10 @@ class IPAppliance:
     @property
     def is_idle(self):
         """Return appliance idle state measured by last production.log activity.
-        It runs one liner script, which first gathers current date on appliance and then gathers
-        date of last entry in production.log(which has to be parsed) with /api calls filtered
+        It gathers current date on appliance and then searches the last hour of production.log,
+        using :py:class:`cfme.utils.log_index.LogIndex`, for an entry with /api calls filtered
         (These calls occur every minute.)
-        Then it deducts that last time in log from current date and if it is lower than idle_time it
-        returns False else True.
+        If there is none, the appliance has been idling for longer than idle_time.
 
         Args:
 
@@ -1783,14 +1786,15 @@ class IPAppliance:
             False if appliance is not idling for longer or equal to idle_time seconds.
         """
         idle_time = 3600
-        ssh_output = self.ssh_client.run_command('if [ $((`date "+%s"` - `date -d "$(egrep -v '
-            r'"(Processing by Api::ApiController\#index as JSON|Started GET "/api" for '
-            '127.0.0.1|Completed 200 OK in)" /var/www/miq/vmdb/log/production.log | tail -1 |cut '
-            '-d"[" -f3 | cut -d"]" -f1 | cut -d" " -f1)\" \"+%s\"`)) -lt {} ];'
-            'then echo "False";'
-            'else echo "True";'
-            'fi;'.format(idle_time))
-        return True if 'True' in ssh_output else False
+        now = datetime.strptime(
+            self.ssh_client.run_command('date "+%Y-%m-%dT%H:%M:%S"').output.strip(),
+            '%Y-%m-%dT%H:%M:%S')
+        production_log = LogIndex(self.ssh_client, '/var/www/miq/vmdb/log/production.log')
+        last_activity = production_log.last_timestamp(
+            r'(Processing by Api::ApiController#index as JSON|Started GET "/api" for '
+            r'127.0.0.1|Completed 200 OK in)',
+            since=now - timedelta(seconds=idle_time), invert=True)
+        return last_activity is None
 
     @cached_property
     def build_datetime(self):
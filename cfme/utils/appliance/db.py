@@ -1,4 +1,5 @@
 import re
+from contextlib import contextmanager
 
 import attr
 import fauxfactory
@@ -18,6 +19,9 @@ from cfme.utils.version import LOWEST
 from cfme.utils.version import VersionPicker
 from cfme.utils.wait import wait_for
 
+VMDB_NAME = 'vmdb_production'
+CHECKPOINT_PREFIX = 'vmdb_checkpoint_'
+
 
 class ApplianceDBException(AppliancePluginException):
     """Basic Exception for Appliance DB object"""
@@ -681,3 +685,101 @@ class ApplianceDB(AppliancePlugin):
         self.reset_user_pass()
         # need to refresh the appliance
         delattr(self.appliance, "rest_api")
+
+    def _run_sql(self, sql, database='postgres', timeout=60):
+        result = self.ssh_client.run_command(
+            f'psql -d {database} -t -A -c "{sql}"', timeout=timeout)
+        if result.failed:
+            raise ApplianceDBException(f'Failed to run {sql!r}: {result.output}')
+        return result.output
+
+    def _terminate_connections(self, database):
+        self._run_sql(
+            'SELECT pg_terminate_backend(pid) FROM pg_stat_activity '
+            f"WHERE datname = '{database}' AND pid <> pg_backend_pid()")
+
+    @property
+    def checkpoints(self):
+        """Names of the checkpoints taken by :py:meth:`checkpoint`"""
+        output = self._run_sql(
+            "SELECT datname FROM pg_database WHERE datname LIKE '{}%'".format(
+                CHECKPOINT_PREFIX.replace('_', r'\_')))
+        return [line[len(CHECKPOINT_PREFIX):] for line in output.split() if line]
+
+    @contextmanager
+    def _evm_stopped(self, wait_ready=True):
+        """Keep evmserverd stopped and vmdb_production free of connections for the block
+
+        evmserverd is started again, and waited for with ``wait_ready``, also when the block
+        fails, so the appliance is not left starting up while the error is handled.
+        """
+        self.appliance.evmserverd.stop()
+        try:
+            self._terminate_connections(VMDB_NAME)
+            yield
+        finally:
+            self.appliance.evmserverd.start()
+            if wait_ready:
+                self.appliance.wait_for_miq_ready()
+
+    def checkpoint(self, name=None, wait_ready=True):
+        """Take a checkpoint of vmdb_production, to go back to with :py:meth:`rollback`
+
+        The checkpoint is a copy of the database, made by postgres with it as the template. That
+        copies the database files, which takes seconds, but needs the database to be unused, so
+        evmserverd is stopped while it is made.
+
+        Args:
+            name: Name of the checkpoint, a random one by default.
+            wait_ready: Wait for the appliance to be ready again afterwards.
+        Returns:
+            The name of the checkpoint.
+        """
+        name = name or fauxfactory.gen_alpha(8).lower()
+        self.logger.info('Taking database checkpoint %s', name)
+        with self._evm_stopped(wait_ready=wait_ready):
+            self._run_sql(
+                f'CREATE DATABASE {CHECKPOINT_PREFIX}{name} '
+                f'TEMPLATE {VMDB_NAME}', timeout=600)
+        return name
+
+    def rollback(self, name, wait_ready=True):
+        """Replace vmdb_production with a copy of a checkpoint taken by :py:meth:`checkpoint`
+
+        The checkpoint is kept, so it can be rolled back to again.
+        """
+        if name not in self.checkpoints:
+            raise ApplianceDBException(f'No database checkpoint {name}')
+        self.logger.info('Rolling the database back to checkpoint %s', name)
+        with self._evm_stopped(wait_ready=wait_ready):
+            self._run_sql(f'DROP DATABASE {VMDB_NAME}', timeout=600)
+            self._run_sql(
+                f'CREATE DATABASE {VMDB_NAME} '
+                f'TEMPLATE {CHECKPOINT_PREFIX}{name}', timeout=600)
+        # Connections to the dropped database are gone
+        clear_property_cache(self, 'client')
+        # self.appliance is a weak proxy, which clear_property_cache can not check the type of
+        self.appliance.__dict__.pop('rest_api', None)
+
+    def drop_checkpoint(self, name):
+        """Drop a checkpoint taken by :py:meth:`checkpoint`"""
+        self.logger.info('Dropping database checkpoint %s', name)
+        self._run_sql(f'DROP DATABASE IF EXISTS {CHECKPOINT_PREFIX}{name}', timeout=600)
+
+    @contextmanager
+    def checkpointed(self, name=None):
+        """Roll the database back to how it is now when the block ends
+
+        Usage:
+
+            with appliance.db.checkpointed():
+                appliance.collections.infra_providers.create(...)
+        """
+        name = self.checkpoint(name)
+        try:
+            yield name
+        finally:
+            try:
+                self.rollback(name)
+            finally:
+                self.drop_checkpoint(name)
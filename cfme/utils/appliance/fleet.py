@@ -0,0 +1,198 @@
+"""Operations run on several appliances at once.
+
+:py:class:`ApplianceFleet` runs an appliance method, or any function taking the appliance, on all
+its appliances concurrently, in a bounded thread pool, instead of one appliance after another:
+
+.. code-block:: python
+
+    fleet = ApplianceFleet(appliances)
+    fleet.wait_for_miq_ready()
+    results = fleet.map('update_rhel', reboot=True, raise_on_error=False)
+    for result in results.failed:
+        logger.error('Updating %s failed: %s', result.appliance, result.exception)
+
+Where the order matters, e.g. the global region has to be configured before the remote regions,
+``stages`` puts the appliances in stages run one after another:
+
+.. code-block:: python
+
+    fleet.map(configure_region, stages=lambda app: app is not global_app)
+"""
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import attr
+
+from cfme.utils.log import logger_wrap
+
+DEFAULT_WORKERS = 8
+""" How many appliances are operated on at once by default """
+
+
+class FleetException(Exception):
+    """Operation failed on some of the appliances, the results of all of them are in ``results``"""
+    def __init__(self, message, results):
+        super().__init__(message)
+        self.results = results
+
+
+class FleetStageFailed(Exception):
+    """Operation was not run on an appliance because an earlier stage failed"""
+
+
+@attr.s
+class FleetResult:
+    """Result of an operation on one appliance of the fleet
+
+    Attributes:
+        appliance: The appliance.
+        value: What the operation returned, ``None`` if it raised.
+        exception: What the operation raised, ``None`` if it did not.
+        duration: How long the operation took, in seconds.
+    """
+    appliance = attr.ib()
+    value = attr.ib(default=None)
+    exception = attr.ib(default=None)
+    duration = attr.ib(default=0.0)
+
+    @property
+    def success(self):
+        return self.exception is None
+
+
+class FleetResults(list):
+    """:py:class:`FleetResult` of every appliance of the fleet, in the order of the appliances"""
+    @property
+    def values(self):
+        return [result.value for result in self]
+
+    @property
+    def failed(self):
+        return [result for result in self if not result.success]
+
+    @property
+    def success(self):
+        return not self.failed
+
+    def raise_for_failures(self, name='operation'):
+        """Raise :py:class:`FleetException` if the operation failed on any of the appliances"""
+        failed = self.failed
+        if failed:
+            raise FleetException(
+                '{} failed on {} of {} appliances: {}'.format(
+                    name, len(failed), len(self),
+                    '; '.join(f'{r.appliance}: {r.exception!r}' for r in failed)),
+                self)
+
+
+def _operation_name(func):
+    return func if isinstance(func, str) else getattr(func, '__name__', repr(func))
+
+
+@attr.s
+class ApplianceFleet:
+    """Appliances to run operations on concurrently, see the module docs.
+
+    Args:
+        appliances: The appliances.
+        workers: How many appliances to operate on at once.
+    """
+    appliances = attr.ib(converter=list)
+    workers = attr.ib(default=DEFAULT_WORKERS)
+
+    def __len__(self):
+        return len(self.appliances)
+
+    def __iter__(self):
+        return iter(self.appliances)
+
+    def _run_one(self, func, appliance, args, kwargs):
+        call = getattr(appliance, func) if isinstance(func, str) else (
+            lambda *a, **kw: func(appliance, *a, **kw))
+        result = FleetResult(appliance=appliance)
+        started = time.time()
+        try:
+            result.value = call(*args, **kwargs)
+        except Exception as e:
+            result.exception = e
+        result.duration = time.time() - started
+        return result
+
+    @logger_wrap('Appliance fleet: {}')
+    def map(self, func, *args, stages=None, raise_on_error=True, log_callback=None, **kwargs):
+        """Run the operation on all the appliances.
+
+        Args:
+            func: Name of the appliance method to call, or a function taking the appliance.
+            args, kwargs: Passed to the method or the function, after the appliance.
+            stages: Function of the appliance to the stage it belongs to. The stages run in the
+                order of their keys, each after the previous one finished on all its appliances.
+                The appliances of the stages after a failed one are not operated on.
+            raise_on_error: Raise :py:class:`FleetException` if the operation failed on any of the
+                appliances, after all of them finished.
+            log_callback: Logger to report the progress to, it is not passed to the operation.
+
+        Returns:
+            :py:class:`FleetResults`
+        """
+        name = _operation_name(func)
+        results = {}
+        done = itertools.count(1)
+        if stages is None:
+            groups = [self.appliances]
+        else:
+            ordered = sorted(self.appliances, key=stages)
+            groups = [list(group) for _, group in itertools.groupby(ordered, key=stages)]
+
+        def run(appliance):
+            result = self._run_one(func, appliance, args, kwargs)
+            log_callback('{} {} on {} in {:.1f}s ({}/{})'.format(
+                name, 'finished' if result.success else f'failed ({result.exception!r})',
+                appliance, result.duration, next(done), len(self.appliances)))
+            return result
+
+        log_callback(f'Running {name} on {len(self.appliances)} appliances')
+        failed_stage = None
+        for stage, group in enumerate(groups):
+            if failed_stage is not None:
+                for appliance in group:
+                    results[id(appliance)] = FleetResult(
+                        appliance=appliance,
+                        exception=FleetStageFailed(f'{name} failed in stage {failed_stage}'))
+                continue
+            with ThreadPoolExecutor(max_workers=max(min(self.workers, len(group)), 1)) as pool:
+                for result in pool.map(run, group):
+                    results[id(result.appliance)] = result
+                    if not result.success:
+                        failed_stage = stage
+
+        fleet_results = FleetResults(results[id(appliance)] for appliance in self.appliances)
+        if raise_on_error:
+            fleet_results.raise_for_failures(name)
+        return fleet_results
+
+    def run(self, func, *args, **kwargs):
+        """Like :py:meth:`map`, raising if the operation failed anywhere, returns the values."""
+        return self.map(func, *args, raise_on_error=True, **kwargs).values
+
+    def configure(self, **kwargs):
+        return self.run('configure', **kwargs)
+
+    def restart_evm_rude(self, **kwargs):
+        return self.run('restart_evm_rude', **kwargs)
+
+    def reboot(self, **kwargs):
+        return self.run('reboot', **kwargs)
+
+    def wait_for_miq_ready(self, **kwargs):
+        return self.run('wait_for_miq_ready', **kwargs)
+
+    def wait_for_api_available(self, **kwargs):
+        return self.run('wait_for_api_available', **kwargs)
+
+    def update_rhel(self, *urls, **kwargs):
+        return self.run('update_rhel', *urls, **kwargs)
+
+    def set_ntp_sources(self, **kwargs):
+        return self.run('set_ntp_sources', **kwargs)
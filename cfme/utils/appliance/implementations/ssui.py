@@ -17,6 +17,7 @@ from cfme.utils.appliance.implementations.common import HandleModalsMixin
 from cfme.utils.browser import manager
 from cfme.utils.log import create_sublogger
 from cfme.utils.log import logger
+from cfme.utils.log import perflog
 from cfme.utils.wait import wait_for
 
 
@@ -159,6 +160,10 @@ class SSUINavigateStep(NavigateStep):
         )
 
     def go(self, _tries=0, *args, **kwargs):
+        with perflog.span('navigate', step=self._name, obj=type(self.obj).__name__):
+            return self._go(_tries, *args, **kwargs)
+
+    def _go(self, _tries=0, *args, **kwargs):
         nav_args = {'use_resetter': True, 'wait_for_view': 10, 'force': False}
 
         self.log_message("Beginning SUI Navigation...", level="info")
@@ -0,0 +1,231 @@
+"""Detection of the appliance being ready after evmserverd starts.
+
+Instead of polling the web UI and then the API at fixed intervals, :py:class:`ReadinessDetector`
+watches several signals at once, each in its own thread:
+
+* ``services``: evmserverd is active
+* ``workers``: evm.log says all the MIQ server workers have been started, read from a ``tail``
+  of the log as the lines are written
+* ``ui``: the web UI answers with HTTP 200
+* ``api``: the REST API answers with the server info
+
+The probes back off exponentially from :py:attr:`ReadinessDetector.min_delay`, and whenever a
+signal comes up the probes still waiting are woken to try again right away. The appliance is ready
+once the web UI and the API are.
+
+The ``workers`` signal is only watched when the detector was started before evmserverd was, because
+only the part of evm.log written since is read:
+
+.. code-block:: python
+
+    detector = ReadinessDetector(appliance).start()
+    appliance.evmserverd.restart()
+    timeline = detector.wait(num_sec=900)
+    logger.info('Appliance ready: %s', timeline)
+"""
+import threading
+import time
+
+import attr
+from manageiq_client.api import APIException
+
+from cfme.utils.log import logger
+from cfme.utils.wait import TimedOutError
+
+EVM_LOG = '/var/www/miq/vmdb/log/evm.log'
+WORKERS_STARTED = 'MiqServer#wait_for_started_workers'
+WORKERS_STARTED_MESSAGE = 'All workers have been started'
+
+SIGNALS = ('services', 'workers', 'ui', 'api')
+""" The signals watched by default, in the order they usually come up in """
+
+REQUIRED_SIGNALS = ('ui', 'api')
+""" The signals that have to come up for the appliance to be ready """
+
+
+@attr.s
+class ReadinessTimeline:
+    """When the readiness signals came up, see :py:meth:`ReadinessDetector.wait`
+
+    Attributes:
+        started: Epoch time the detector was started at.
+        signals: Seconds since ``started`` each signal came up after, by the signal name.
+        ready: Seconds since ``started`` the appliance was ready after, ``None`` if it was not.
+    """
+    started = attr.ib()
+    signals = attr.ib(default=attr.Factory(dict))
+    ready = attr.ib(default=None)
+
+    def __bool__(self):
+        return self.ready is not None
+
+    def __str__(self):
+        return ', '.join(
+            [f'{signal} {elapsed:.1f}s'
+             for signal, elapsed in sorted(self.signals.items(), key=lambda item: item[1])] +
+            [f'ready {self.ready:.1f}s' if self else 'not ready'])
+
+
+@attr.s
+class ReadinessDetector:
+    """Waits for the appliance to be ready, see the module docs.
+
+    Args:
+        appliance: The appliance.
+        signals: The signals to watch, see :py:data:`SIGNALS`.
+        required: The signals that have to come up, see :py:data:`REQUIRED_SIGNALS`.
+        min_delay: Seconds between the first tries of a probe.
+        max_delay: Longest time between the tries of a probe.
+        backoff: How many times longer each wait between the tries is than the previous one.
+    """
+    appliance = attr.ib()
+    signals = attr.ib(default=SIGNALS)
+    required = attr.ib(default=REQUIRED_SIGNALS)
+    min_delay = attr.ib(default=0.5)
+    max_delay = attr.ib(default=8.0)
+    backoff = attr.ib(default=2.0)
+
+    log_offset = attr.ib(default=None, init=False)
+    started = attr.ib(default=None, init=False)
+
+    @property
+    def age(self):
+        """Seconds since :py:meth:`start` was called, ``None`` if it was not."""
+        return None if self.started is None else time.time() - self.started
+
+    def start(self):
+        """Note the time and the size of evm.log, before the action the appliance is restarted by.
+
+        Returns:
+            The detector itself.
+        """
+        self.started = time.time()
+        if 'workers' in self.signals:
+            try:
+                result = self.appliance.ssh_client.run_command(
+                    f'stat -c %s {EVM_LOG}', container=self.appliance.ansible_pod_name)
+                if result.success:
+                    self.log_offset = int(result.output.strip())
+            except Exception as e:
+                logger.warning('Could not note the size of %s, not watching it: %s', EVM_LOG, e)
+        return self
+
+    def _check_services(self):
+        return self.appliance.evmserverd.is_active
+
+    def _check_ui(self):
+        return self.appliance._check_appliance_ui_wait_fn()
+
+    def _check_api(self):
+        try:
+            # Invalidate the stale cached api object, accessing the server info of a new one makes
+            # sure a request is really made
+            self.appliance.__dict__.pop('rest_api', None)
+            assert self.appliance.rest_api.server_info['server_href']
+            return True
+        except APIException as e:
+            logger.debug('Appliance REST API not ready: %s', e)
+            return False
+
+    def _mark(self, signal):
+        with self._changed:
+            if signal not in self._timeline.signals:
+                self._timeline.signals[signal] = time.time() - self._timeline.started
+                self._log_callback(
+                    f'{signal} up after {self._timeline.signals[signal]:.1f}s')
+            if all(required in self._timeline.signals for required in self.required):
+                self._done.set()
+            self._changed.notify_all()
+
+    def _probe(self, signal, check, deadline):
+        delay = self.min_delay
+        while not self._done.is_set() and time.time() < deadline:
+            try:
+                if check():
+                    self._mark(signal)
+                    return
+            except Exception as e:
+                logger.debug('Readiness probe %s failed: %s', signal, e)
+            with self._changed:
+                if self._done.is_set():
+                    return
+                woken = self._changed.wait(timeout=max(min(delay, deadline - time.time()), 0))
+            # Another signal came up, so this one is likely to come up soon too
+            delay = self.min_delay if woken else min(delay * self.backoff, self.max_delay)
+
+    def _watch_log(self, deadline):
+        command = (
+            f'timeout {int(deadline - time.time()) + 1} '
+            f'tail -c +{self.log_offset + 1} -F {EVM_LOG} 2> /dev/null')
+        delay = self.min_delay
+        while not self._done.is_set() and time.time() < deadline:
+            try:
+                self._stream = self.appliance.ssh_client.stream_command(
+                    command, timeout=max(deadline - time.time(), 1), stderr=False,
+                    container=self.appliance.ansible_pod_name)
+                with self._stream as stream:
+                    for line in stream:
+                        if WORKERS_STARTED in line and WORKERS_STARTED_MESSAGE in line:
+                            self._mark('workers')
+                            return
+                        if self._done.is_set():
+                            return
+            except Exception as e:
+                logger.debug('Watching %s failed: %s', EVM_LOG, e)
+            # The connection drops when the appliance reboots
+            self._done.wait(timeout=delay)
+            delay = min(delay * self.backoff, self.max_delay)
+
+    def wait(self, num_sec=900, log_callback=None):
+        """Wait for the appliance to be ready.
+
+        :py:meth:`start` is called first if it was not before.
+
+        Args:
+            num_sec: Seconds to wait for.
+            log_callback: Function to use for writing log messages.
+
+        Returns:
+            :py:class:`ReadinessTimeline` of the signals.
+
+        Raises:
+            :py:class:`cfme.utils.wait.TimedOutError` if the appliance is not ready in time.
+        """
+        if self.started is None:
+            self.start()
+        deadline = time.time() + num_sec
+        self._log_callback = log_callback = log_callback or logger.info
+        self._timeline = ReadinessTimeline(started=self.started)
+        self._changed = threading.Condition()
+        self._done = threading.Event()
+        self._stream = None
+        probes = {
+            'services': self._check_services, 'ui': self._check_ui, 'api': self._check_api}
+        threads = [
+            threading.Thread(
+                target=self._probe, args=(signal, probes[signal], deadline),
+                name=f'readiness-{signal}', daemon=True)
+            for signal in self.signals if signal in probes]
+        if 'workers' in self.signals and self.log_offset is not None:
+            threads.append(threading.Thread(
+                target=self._watch_log, args=(deadline,), name='readiness-workers', daemon=True))
+
+        for thread in threads:
+            thread.start()
+        self._done.wait(timeout=max(deadline - time.time(), 0))
+        with self._changed:
+            self._done.set()
+            self._changed.notify_all()
+        if self._stream is not None:
+            # Stops the tail of the log
+            self._stream.close()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        timeline = self._timeline
+        if all(required in timeline.signals for required in self.required):
+            timeline.ready = max(timeline.signals[required] for required in self.required)
+            log_callback(f'Appliance ready: {timeline}')
+            return timeline
+        raise TimedOutError(
+            f'Appliance {self.appliance} not ready in {num_sec} seconds: {timeline}')
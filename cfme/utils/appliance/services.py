@@ -52,6 +52,45 @@ class SystemdService(AppliancePlugin):
             raise SystemdException(msg)
         return result
 
+    @logger_wrap('SystemdService commands runner: {}')
+    def _run_service_commands(self, commands, expected_exit_code=None, log_callback=None):
+        """Like :py:meth:`_run_service_command`, for several commands run in one round trip
+
+        Args:
+            commands: list of ``(command, unit_name)``, unit name ``None`` for self.unit_name
+            expected_exit_code: the exit code to expect of every command, the commands after the
+                first one not matching it are not run
+            log_callback: logger to log against
+
+        Returns:
+            list of :py:class:`cfme.utils.ssh.SSHResult` of the commands run
+
+        Raises:
+            SystemdException: When expected_exit_code is not matched
+        """
+        cmds = [
+            'systemctl {} {}'.format(
+                quote(command), quote(self.unit_name if unit_name is None else unit_name))
+            for command, unit_name in commands]
+        with self.appliance.ssh_client as ssh:
+            log_callback(f'Running {"; ".join(cmds)}')
+            results = ssh.run_commands(
+                cmds, container=self.appliance.ansible_pod_name,
+                stop_on_failure=expected_exit_code is not None)
+
+        if expected_exit_code is not None:
+            for (command, _), result in zip(commands, results):
+                if result.rc != expected_exit_code:
+                    msg = 'Failed to {} {}\nError: {}'.format(
+                        command, self.unit_name, result.output)
+                    log_callback(msg)
+                    raise SystemdException(msg)
+            if len(results) < len(commands):
+                msg = 'Failed to {} {}'.format(commands[len(results)][0], self.unit_name)
+                log_callback(msg)
+                raise SystemdException(msg)
+        return results
+
     def stop(self, log_callback=None):
         return self._run_service_command(
             'stop',
@@ -80,7 +119,13 @@ class SystemdService(AppliancePlugin):
             log_callback=log_callback
         )
 
-    def enable(self, log_callback=None):
+    def enable(self, log_callback=None, daemon_reload=False):
+        if daemon_reload:
+            return self._run_service_commands(
+                [('enable', None), ('daemon-reload', '')],
+                expected_exit_code=0,
+                log_callback=log_callback
+            )[0]
         return self._run_service_command(
             'enable',
             expected_exit_code=0,
@@ -1,8 +1,15 @@
+import os
+import pickle
 import re
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from xmlrpc.client import Fault as RPCFault
 
 from github import Github
+from github.Issue import Issue
 
 from cfme.fixtures.pytest_store import store
 from cfme.utils import classproperty
@@ -10,6 +17,71 @@ from cfme.utils import conf
 from cfme.utils import version
 from cfme.utils.bz import Bugzilla
 from cfme.utils.log import logger
+from cfme.utils.path import log_path
+
+#: Default number of seconds the blocker data is kept in the :py:class:`BlockerCache`
+DEFAULT_CACHE_TTL = 3600
+
+
+class BlockerCache:
+    """Persistent cache of the data the blockers are resolved from.
+
+    Every entry is a pickle file under ``<cache_dir>/<namespace>/``, written atomically, so the
+    master and all the slaves can share the cache without any locking. Entries older than the TTL
+    are ignored. Configured in env.yaml:
+
+    .. code-block:: yaml
+
+        blockers:
+            cache_dir: /path/to/dir  # log/blocker_cache by default
+            cache_ttl: 3600  # seconds, 0 disables the cache
+
+    Args:
+        namespace: Subdirectory of the cache directory, one per blocker engine
+    """
+    def __init__(self, namespace, ttl=None, cache_dir=None):
+        blockers_conf = conf.env.get("blockers", {})
+        self.ttl = ttl if ttl is not None else blockers_conf.get("cache_ttl", DEFAULT_CACHE_TTL)
+        cache_dir = cache_dir or blockers_conf.get("cache_dir") or log_path.join(
+            "blocker_cache").strpath
+        self.directory = os.path.join(cache_dir, namespace)
+
+    def _filename(self, key):
+        return os.path.join(self.directory, re.sub(r"[^a-zA-Z0-9_.\-]", "_", str(key)))
+
+    def get(self, key):
+        """Returns the cached value or ``None`` if it is not cached or has expired."""
+        if not self.ttl:
+            return None
+        filename = self._filename(key)
+        try:
+            if time.time() - os.path.getmtime(filename) > self.ttl:
+                return None
+            with open(filename, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def get_many(self, keys):
+        """Returns :py:class:`dict` of the keys that are cached to their values."""
+        result = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    def put(self, key, value):
+        if not self.ttl:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_filename = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f)
+            os.replace(tmp_filename, self._filename(key))
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning("Could not cache blocker data for %s: %s", key, e)
 
 
 class Blocker:
@@ -30,6 +102,13 @@ class Blocker:
     def url(self):
         raise NotImplementedError('You need to implement .url')
 
+    @classmethod
+    def prefetch(cls, blockers):
+        """Fetch the data of all the passed blockers of this engine at once.
+
+        Optional, engines that can't do better than one by one don't need to implement it.
+        """
+
     @classmethod
     def all_blocker_engines(cls):
         """Return mapping of name:class of all the blocker engines in this module.
@@ -114,13 +193,36 @@ class GH(Blocker):
         else:
             raise ValueError("GH issue specified wrong")
 
+    @classproperty
+    def cache(cls):
+        if not hasattr(cls, "_cache"):
+            cls._cache = BlockerCache("github")
+        return cls._cache
+
+    @property
+    def identifier(self):
+        return f"{self.repo}:{self.issue}"
+
     @property
     def data(self):
-        identifier = f"{self.repo}:{self.issue}"
+        identifier = self.identifier
         if identifier not in self._issue_cache:
-            self._issue_cache[identifier] = self.github.get_repo(self.repo).get_issue(self.issue)
+            raw_data = self.cache.get(identifier)
+            if raw_data is not None:
+                issue = self.github.create_from_raw_data(Issue, raw_data)
+            else:
+                issue = self.github.get_repo(self.repo).get_issue(self.issue)
+                self.cache.put(identifier, issue.raw_data)
+            self._issue_cache[identifier] = issue
         return self._issue_cache[identifier]
 
+    @classmethod
+    def prefetch(cls, blockers):
+        # The API has no way to get a set of issues by their numbers, fetch them concurrently
+        missing = {b.identifier: b for b in blockers if b.identifier not in cls._issue_cache}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda blocker: blocker.data, missing.values()))
+
     @property
     def blocks(self):
         if self.upstream_only and version.appliance_is_downstream():
@@ -159,11 +261,18 @@ class BZ(Blocker):
     def bugzilla(cls):
         if not hasattr(cls, "_bugzilla"):
             try:
-                cls._bugzilla = Bugzilla.from_config()
+                cls._bugzilla = Bugzilla.from_config(cache=BlockerCache("bugzilla"))
             except KeyError:
                 return None
         return cls._bugzilla
 
+    @classmethod
+    def prefetch(cls, blockers):
+        if cls.bugzilla is None:
+            return
+        bug_count = cls.bugzilla.prefetch_bugs({blocker.bug_id for blocker in blockers})
+        logger.info("Prefetched %d bugs for %d BZ blockers", bug_count, len(blockers))
+
     def __init__(self, bug_id, **kwargs):
         self.ignore_bugs = kwargs.pop("ignore_bugs", [])
         super().__init__(**kwargs)
@@ -259,6 +368,8 @@ class BZ(Blocker):
 
 
 class JIRA(Blocker):
+    _status_cache = {}
+
     @classproperty
     def jira(cls):  # noqa
         if not hasattr(cls, "_jira"):
@@ -281,14 +392,65 @@ class JIRA(Blocker):
             return None
         return '{}/browse/{}'.format(jira_url.rstrip('/'), self.jira_id)
 
+    @classproperty
+    def cache(cls):
+        if not hasattr(cls, "_cache"):
+            cls._cache = BlockerCache("jira")
+        return cls._cache
+
+    @property
+    def status(self):
+        if self.jira_id not in self._status_cache:
+            status = self.cache.get(self.jira_id)
+            if status is None:
+                status = self.jira.issue(self.jira_id, fields='status').fields.status.name
+                self.cache.put(self.jira_id, status)
+            self._status_cache[self.jira_id] = status
+        return self._status_cache[self.jira_id]
+
+    @classmethod
+    def prefetch(cls, blockers):
+        if cls.jira is None:
+            return
+        missing = {b.jira_id for b in blockers if b.jira_id not in cls._status_cache}
+        for jira_id, status in cls.cache.get_many(missing).items():
+            cls._status_cache[jira_id] = status
+        missing.difference_update(cls._status_cache)
+        if not missing:
+            return
+        issues = cls.jira.search_issues(
+            'key in ({})'.format(', '.join(sorted(missing))), fields='status', maxResults=False)
+        for issue in issues:
+            cls._status_cache[issue.key] = issue.fields.status.name
+            cls.cache.put(issue.key, issue.fields.status.name)
+
     @property
     def blocks(self):
-        jira = self.jira
-        if jira is None:
+        if self.jira is None:
             # JIRA unspecified, shut up and don't block
             return False
-        issue = jira.issue(self.jira_id, fields='status')
-        return issue.fields.status.name.lower() != 'done'
+        return self.status.lower() != 'done'
 
     def __str__(self):
         return f'Jira card {self.url}'
+
+
+def prefetch_blockers(blockers):
+    """Parse the blockers and fetch their data in batches, engine by engine.
+
+    Integers are taken as Bugzilla bugs, as in the ``blockers`` meta marker.
+
+    Returns:
+        :py:class:`list` of the parsed :py:class:`Blocker` instances
+    """
+    parsed = [Blocker.parse(f"BZ#{b}" if isinstance(b, int) else b) for b in blockers]
+    by_engine = defaultdict(list)
+    for blocker in parsed:
+        by_engine[type(blocker)].append(blocker)
+    for engine, engine_blockers in by_engine.items():
+        try:
+            engine.prefetch(engine_blockers)
+        except Exception as e:
+            # The blockers get resolved one by one later anyway
+            logger.warning("Prefetching %s blockers failed: %s", engine.__name__, e)
+    return parsed
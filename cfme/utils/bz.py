@@ -2,6 +2,7 @@ import re
 from collections.abc import Sequence
 
 from bugzilla import Bugzilla as _Bugzilla
+from bugzilla.bug import Bug as _Bug
 from cached_property import cached_property
 from miq_version import LATEST
 from miq_version import Version
@@ -14,6 +15,9 @@ from cfme.utils.version import current_version
 
 NONE_FIELDS = {"---", "undefined", "unspecified"}
 
+#: Number of bugs requested by a single ``getbugs`` call
+GETBUGS_CHUNK = 200
+
 
 class Product:
     def __init__(self, data):
@@ -53,6 +57,8 @@ class Bugzilla:
         # __kwargs passed to _Bugzilla instantiation, pop our args out
         self.__product = kwargs.pop("product", None)
         self.__config_options = kwargs.pop('config_options', {})
+        # persistent cache of the raw bug data, see cfme.utils.blockers.BlockerCache
+        self.__cache = kwargs.pop('cache', None)
         self.__kwargs = kwargs
         self.__bug_cache = {}
         self.__product_cache = {}
@@ -81,7 +87,7 @@ class Bugzilla:
         return None if self.__product is None else self.product(self.__product)
 
     @classmethod
-    def from_config(cls):
+    def from_config(cls, cache=None):
         bz_conf = env.get('bugzilla', {})  # default empty so we can call .get() later
         url = bz_conf.get('url')
         if url is None:
@@ -93,7 +99,8 @@ class Bugzilla:
             cookiefile=None,
             tokenfile=None,
             product=bz_conf.get("bugzilla", {}).get("product"),
-            config_options=bz_conf)
+            config_options=bz_conf,
+            cache=cache)
         if cred_key:
             bz_creds = credentials.get(cred_key, {})
             if bz_creds.get('username'):
@@ -131,12 +138,75 @@ class Bugzilla:
         else:
             return Version(self.__config_options.get("upstream_version", Version.latest().vstring))
 
+    def _wrap(self, bug):
+        if self.__cache is not None:
+            self.__cache.put(bug.id, bug.get_raw_data())
+        self.__bug_cache[bug.id] = BugWrapper(self, bug)
+        return self.__bug_cache[bug.id]
+
+    def _load_cached(self, ids):
+        """Move the bugs found in the persistent cache into the in-process one."""
+        if self.__cache is None:
+            return
+        for bug_id, data in self.__cache.get_many(ids).items():
+            self.__bug_cache[int(bug_id)] = BugWrapper(self, _Bug(self.bugzilla, dict=data))
+
     def get_bug(self, id):
         id = int(id)
         if id not in self.__bug_cache:
-            self.__bug_cache[id] = BugWrapper(self, self.bugzilla.getbug(id))
+            self._load_cached([id])
+        if id not in self.__bug_cache:
+            self._wrap(self.bugzilla.getbug(id))
         return self.__bug_cache[id]
 
+    def get_bugs(self, ids):
+        """Fetch the bugs with ``getbugs`` in as few calls as possible.
+
+        Returns:
+            :py:class:`dict` of bug id to :py:class:`BugWrapper`, inaccessible bugs are left out.
+        """
+        ids = {int(bug_id) for bug_id in ids}
+        self._load_cached(ids - set(self.__bug_cache))
+        missing = sorted(ids - set(self.__bug_cache))
+        for start in range(0, len(missing), GETBUGS_CHUNK):
+            chunk = missing[start:start + GETBUGS_CHUNK]
+            logger.info('Fetching %d bugs from Bugzilla', len(chunk))
+            for bug_id, bug in zip(chunk, self.bugzilla.getbugs(chunk)):
+                if not bug:
+                    logger.warning('BZ %s could not be fetched, likely requires authentication',
+                                   bug_id)
+                    continue
+                self._wrap(bug)
+        return {bug_id: self.__bug_cache[bug_id] for bug_id in ids if bug_id in self.__bug_cache}
+
+    def prefetch_bugs(self, ids):
+        """Fetch the bugs and all their duplicates and copies, one ``getbugs`` round per level.
+
+        Follows the same links as :py:meth:`get_bug_variants`, so that the variants of the
+        prefetched bugs are resolved without any further remote call.
+        """
+        # bug id -> id of the bug it has to be a copy of to be a variant, None if it is one anyway
+        level = {int(bug_id): None for bug_id in ids}
+        seen = set(level)
+        while level:
+            bugs = self.get_bugs(level)
+            next_level = {}
+            for bug_id, copy_of in level.items():
+                bug = bugs.get(bug_id)
+                if bug is None or (copy_of is not None and bug.copy_of != copy_of):
+                    continue
+                linked = [(bug.copy_of, None)]
+                if bug.status == "CLOSED" and bug.resolution == "DUPLICATE":
+                    linked.append((bug.dupe_of, None))
+                # any bug this one blocks may be its copy
+                linked.extend((blocked, bug_id) for blocked in bug._bug.blocks)
+                for linked_id, linked_copy_of in linked:
+                    if linked_id and int(linked_id) not in seen:
+                        seen.add(int(linked_id))
+                        next_level[int(linked_id)] = linked_copy_of
+            level = next_level
+        return len(seen)
+
     def get_bug_variants(self, id):
         if isinstance(id, BugWrapper):
             bug = id
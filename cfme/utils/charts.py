@@ -0,0 +1,180 @@
+"""Rendering of the charts of the performance and memory reports.
+
+The reports compute the series of their charts first, as :py:class:`Chart` objects, and render all
+of them at once with :py:func:`render_charts`, in a pool of processes:
+
+.. code-block:: python
+
+    charts = [Chart(line_chart_render, charts_dir.join('cpu.svg'), title='CPU', lines=lines)]
+    render_charts(charts, cache_file=charts_dir.join(CACHE_FILE))
+
+A chart is skipped if it was rendered from the same series before, as recorded in the cache file,
+and its file is still there. Series longer than ``max_points`` are downsampled with
+:py:func:`lttb` before they are drawn, which keeps the shape of the series, peaks included.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from cfme.utils.log import logger
+
+CACHE_FILE = '.chart-digests.json'
+
+MAX_POINTS = 500
+""" Points of a series drawn at most, by default """
+
+
+def lttb(x, y, threshold):
+    """Indices of the points of a series to keep, by the largest-triangle-three-buckets algorithm.
+
+    The first and the last point are kept, the others are split into ``threshold - 2`` buckets and
+    the point of each bucket making the largest triangle with the point kept in the previous bucket
+    and the average of the next bucket is kept.
+
+    Args:
+        x: Numeric x values of the series.
+        y: Numeric y values of the series.
+        threshold: Number of the points to keep.
+
+    Returns:
+        :py:class:`numpy.ndarray` of the indices, sorted.
+    """
+    # Import here to allow perf to install numpy separately
+    import numpy
+
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    size = len(y)
+    if threshold >= size or threshold < 3:
+        return numpy.arange(size)
+
+    edges = numpy.linspace(1, size - 1, threshold - 1).astype(int)
+    indices = numpy.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, size - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = (edges[bucket + 1], edges[bucket + 2]) \
+            if bucket + 2 < len(edges) else (size - 1, size)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Twice the areas of the triangles, the factor does not matter for comparing them
+        areas = numpy.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected]) -
+            (x[selected] - x[start:end]) * (avg_y - y[selected]))
+        selected = start + int(numpy.argmax(areas))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def downsample(x, lines, max_points):
+    """Downsample lines of the same length, drawn at the same x values, with :py:func:`lttb`.
+
+    The points are treated as evenly spaced. A point kept for any of the lines is kept for all of
+    them, so they still share the x values.
+
+    Args:
+        x: The x values, or labels, of the lines. Left as they are if their length differs.
+        lines: :py:class:`dict` of the y values of the lines, by the line name.
+        max_points: Points kept of each line at most, ``None`` to keep all.
+
+    Returns:
+        The x values and the lines, with only the points kept.
+    """
+    size = max((len(values) for values in lines.values()), default=0)
+    if not max_points or size <= max_points:
+        return x, lines
+
+    # Import here to allow perf to install numpy separately
+    import numpy
+
+    positions = numpy.arange(size)
+    keep = numpy.unique(numpy.concatenate(
+        [lttb(positions, values, max_points) for values in lines.values()]))
+    if len(x) == size:
+        x = [x[i] for i in keep]
+    return x, {name: [values[i] for i in keep] for name, values in lines.items()}
+
+
+class Chart:
+    """A chart to render, with its series already computed.
+
+    Args:
+        render: Module level function drawing the chart, called with the path of the file, the
+            ``max_points`` of :py:func:`render_charts` and the ``kwargs``.
+        path: Path of the file of the chart.
+        kwargs: The series and the other arguments of ``render``.
+    """
+    def __init__(self, render, path, **kwargs):
+        self.render = render
+        self.path = str(path)
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return f'<Chart {self.path!r} by {self.render.__name__}>'
+
+    def digest(self, max_points):
+        """Hash of what the chart is drawn from."""
+        return hashlib.sha1(pickle.dumps(
+            (self.render.__module__, self.render.__qualname__, max_points, self.kwargs))
+        ).hexdigest()
+
+
+def _render(chart, max_points):
+    chart.render(chart.path, max_points=max_points, **chart.kwargs)
+
+
+def render_charts(charts, cache_file=None, workers=None, max_points=MAX_POINTS):
+    """Render the charts in parallel processes, skipping the ones rendered from the same series.
+
+    Args:
+        charts: :py:class:`Chart` objects to render.
+        cache_file: Path of the file the digests of the rendered charts are kept in, the charts
+            are all rendered if ``None``.
+        workers: Number of the processes, the number of the CPUs by default, ``1`` renders the
+            charts in this process.
+        max_points: Points of each series drawn at most, ``None`` to draw all of them.
+
+    Returns:
+        :py:class:`list` of the paths of the charts rendered, not of the ones skipped.
+    """
+    cache = {}
+    if cache_file is not None and os.path.exists(str(cache_file)):
+        try:
+            with open(str(cache_file)) as f:
+                cache = json.load(f)
+        except ValueError:
+            logger.warning('Chart digests in %s are corrupted, rendering all charts', cache_file)
+
+    pending = []
+    for chart in charts:
+        digest = chart.digest(max_points)
+        if cache.get(chart.path) != digest or not os.path.exists(chart.path):
+            pending.append((chart, digest))
+    logger.info('Rendering %d charts, %d unchanged', len(pending), len(charts) - len(pending))
+
+    rendered = []
+    executor = None
+    try:
+        if workers == 1 or len(pending) < 2:
+            results = map(_render, [chart for chart, _ in pending], repeat(max_points))
+        else:
+            # Spawned, not forked, the workers would inherit the logging and monitoring threads
+            # of the test run with their locks in any state
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            results = executor.map(_render, [chart for chart, _ in pending], repeat(max_points))
+        for (chart, digest), _ in zip(pending, results):
+            cache[chart.path] = digest
+            rendered.append(chart.path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if cache_file is not None:
+            with open(str(cache_file), 'w') as f:
+                json.dump(cache, f)
+    return rendered
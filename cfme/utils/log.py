@@ -65,8 +65,19 @@ Configuration
         # Maximimum backup copies to make of rotated log files (e.g. cfme.log.1, cfme.log.2, ...)
         # Set to 0 to keep no backups
         max_logfile_backups: 0
+        # If True, rotated log files (cfme.log.1, ...) are gzip-compressed (cfme.log.1.gz, ...)
+        compress_rotated_logs: False
+        # If True, log records are handed to a background thread through a queue, and
+        # formatting and file I/O happen there instead of on the test thread
+        async: False
+        # Maximum number of records per second let through for a given source, keyed by
+        # a fragment of the emitting file path, e.g. {"wait_for/": 5}. Records of level
+        # WARNING and above are never dropped.
+        rate_limits: {}
         # If True, messages of level ERROR and CRITICAL are also written to stderr
         errors_to_console: False
+        # Format of the timing spans file written by perflog, "jsonl" or "chrome"
+        span_format: jsonl
         # Default file format
         file_format: "%(asctime)-15s [%(levelname).1s] %(message)s (%(source)s)"
         # Default format to console if errors_to_console is True
@@ -130,12 +141,28 @@ Members
 ^^^^^^^
 
 """
+import atexit
+import contextvars
+import copy
+import gzip
 import inspect
+import itertools
+import json
 import logging
 import os
+import queue
+import shutil
 import sys
+import threading
 import warnings
+from functools import wraps
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from logging.handlers import RotatingFileHandler
+from time import monotonic
+from time import perf_counter_ns
 from time import time
+from time import time_ns
 from traceback import extract_tb
 from traceback import format_tb
 
@@ -152,6 +179,12 @@ _default_conf = {
     'level': logging.INFO,
     'errors_to_console': False,
     'to_console': False,
+    'max_logfile_size': 0,
+    'max_logfile_backups': 0,
+    'compress_rotated_logs': False,
+    'async': False,
+    'rate_limits': {},
+    'span_format': 'jsonl',
 }
 
 # let logging know we made a TRACE level
@@ -283,6 +316,103 @@ class WarningsDeduplicationFilter:
             return True
 
 
+class RateLimitFilter(logging.Filter):
+    """Drops records from chatty sources that exceed a records-per-second budget
+
+    Args:
+        limits: dict mapping a fragment of the emitting file path (e.g. ``wait_for/``) to the
+            number of records per second allowed from files matching it
+
+    Each source gets a token bucket holding up to one second worth of records. Records of level
+    WARNING and above always pass. When a record passes after others from the same source have
+    been dropped, the number of dropped records is appended to its message.
+    """
+    def __init__(self, limits=None):
+        self.limits = dict(limits or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _source(self, record):
+        for fragment in self.limits:
+            if fragment in record.pathname:
+                return fragment
+        return None
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.limits:
+            return True
+        source = self._source(record)
+        if source is None:
+            return True
+        rate = float(self.limits[source])
+        now = monotonic()
+        with self._lock:
+            tokens, last, dropped = self._buckets.get(source, (rate, now, 0))
+            tokens = min(rate, tokens + (now - last) * rate)
+            if tokens < 1:
+                self._buckets[source] = (tokens, now, dropped + 1)
+                return False
+            self._buckets[source] = (tokens - 1, now, 0)
+        if dropped:
+            record.msg = "{} [{} similar messages suppressed]".format(
+                safe_string(record.msg), dropped)
+        return True
+
+
+class Span:
+    """A single timed operation, see :py:meth:`Perflog.span`
+
+    Spans opened while another span is active on the same thread (or greenlet context) become
+    its children. ``attrs`` can be extended while the span is open and ends up in the emitted
+    record.
+    """
+    __slots__ = ('perflog', 'name', 'attrs', 'id', 'parent_id', 'start', 'duration', '_token')
+
+    _ids = itertools.count(1)
+
+    def __init__(self, perflog, name, attrs):
+        self.perflog = perflog
+        self.name = name
+        self.attrs = attrs
+        self.id = next(self._ids)
+        self.parent_id = None
+        self.start = None
+        self.duration = None
+        self._token = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent_id = parent.id if parent is not None else None
+        self._token = _current_span.set(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = perf_counter_ns() - self.start
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.perflog.emit_span(self)
+        return False
+
+    def __repr__(self):
+        return f'<Span {self.name!r} #{self.id}>'
+
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+# Anchors the monotonic span clock to wall time once, so start times can be correlated with logs
+_clock_base_ns = time_ns() - perf_counter_ns()
+
+
+def current_test_nodeid():
+    """Return the nodeid of the test pytest is currently running, or None"""
+    current = os.environ.get('PYTEST_CURRENT_TEST')
+    if current:
+        # "<nodeid> (<phase>)"
+        return current.rsplit(' ', 1)[0]
+    return None
+
+
 class Perflog:
     """Performance logger, useful for timing arbitrary events by name
 
@@ -297,11 +427,49 @@ class Perflog:
         seconds_taken = perflog.stop('event_name')
         # seconds_taken is also written to perf.log for later analysis
 
+    For nested or concurrent timings, use spans. They are written, one record per span, to
+    ``log/perf.spans.jsonl``, or to ``log/perf.trace.json`` in the Chrome trace event format
+    (loadable in ``chrome://tracing`` or Perfetto) when ``span_format`` is set to ``chrome`` in
+    the ``perf`` logging conf::
+
+        with perflog.span('create_vm', provider=provider.key) as span:
+            # do stuff, spans opened here become children of 'create_vm'
+            span.attrs['vm_name'] = vm.name
+
+        @perflog.timed('refresh')
+        def refresh_provider():
+            ...
+
+    Every span record carries its parent's id and the nodeid of the test it ran in.
+
     """
     tracking_events = {}
 
     def __init__(self, perflog_name='perf'):
         self.logger, _ = setup_logger(logging.getLogger(perflog_name))
+        conf = _load_conf(perflog_name)
+        self.span_format = conf['span_format']
+        self.span_logger = self._setup_span_logger(perflog_name, conf)
+
+    def _setup_span_logger(self, perflog_name, conf):
+        span_logger = logging.getLogger(f'{perflog_name}.spans')
+        span_logger.setLevel(logging.INFO)
+        span_logger.propagate = False
+        if self.span_format == 'chrome':
+            handler = make_file_handler(f'{perflog_name}.trace.json')
+            # The trace event format tolerates a missing closing bracket and trailing comma,
+            # which keeps the file appendable and readable if the run dies halfway
+            if handler.stream.tell() == 0:
+                handler.stream.write('[\n')
+            handler.setFormatter(logging.Formatter('%(message)s,'))
+        else:
+            handler = make_file_handler(f'{perflog_name}.spans.jsonl')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+        if conf['async']:
+            span_logger.addHandler(async_handler(handler))
+        else:
+            span_logger.addHandler(handler)
+        return span_logger
 
     def start(self, event_name):
         """Start tracking the named event
@@ -331,10 +499,82 @@ class Perflog:
             self.logger.error('"%s" not being tracked, call .start first', event_name)
             return None
 
+    def span(self, name, **attrs):
+        """Return a context manager timing the enclosed block as a :py:class:`Span`
+
+        Args:
+            name: Name of the span, e.g. ``ssh`` or ``navigate``
+            **attrs: Additional JSON-serializable attributes recorded with the span
+        """
+        return Span(self, name, attrs)
 
-def make_file_handler(filename, root=log_path.strpath, level=None, **kw):
+    def timed(self, name=None, **attrs):
+        """Decorator running each call of the decorated function in a span
+
+        Args:
+            name: Name of the span, defaults to the qualified name of the function
+            **attrs: Additional JSON-serializable attributes recorded with the span
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with Span(self, span_name, dict(attrs)):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def emit_span(self, span):
+        """Write out a finished span"""
+        test = current_test_nodeid()
+        if self.span_format == 'chrome':
+            data = {
+                'name': span.name,
+                'ph': 'X',
+                'ts': (_clock_base_ns + span.start) // 1000,
+                'dur': span.duration // 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': dict(span.attrs, id=span.id, parent=span.parent_id, test=test),
+            }
+        else:
+            data = {
+                'name': span.name,
+                'id': span.id,
+                'parent': span.parent_id,
+                'start': (_clock_base_ns + span.start) / 1e9,
+                'duration': span.duration / 1e9,
+                'test': test,
+                'pid': os.getpid(),
+                'thread': threading.get_ident(),
+                'attrs': span.attrs,
+            }
+        self.span_logger.info(json.dumps(data, default=str))
+
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def make_file_handler(filename, root=log_path.strpath, level=None, max_bytes=0, backup_count=0,
+                      compress=False, **kw):
+    """Create a file handler writing to ``filename`` in ``root``
+
+    If ``max_bytes`` is set, the file is rotated once it grows past that size, keeping
+    ``backup_count`` rotated segments, which are gzip-compressed if ``compress`` is True.
+    """
     filename = os.path.join(root, filename)
-    handler = logging.FileHandler(filename, **kw)
+    if max_bytes:
+        handler = RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count, **kw)
+        if compress:
+            handler.namer = lambda name: name + '.gz'
+            handler.rotator = _gzip_rotator
+    else:
+        handler = logging.FileHandler(filename, **kw)
     formatter = logging.Formatter(
         '%(asctime)-15s [%(levelname).1s] [%(name)s] %(message)s (%(pathname)s:%(lineno)s)')
     handler.setFormatter(formatter)
@@ -343,6 +583,66 @@ def make_file_handler(filename, root=log_path.strpath, level=None, **kw):
     return handler
 
 
+class AsyncQueueHandler(QueueHandler):
+    """Queue handler whose records are written out by a :py:class:`QueueListener` thread
+
+    Unlike the stdlib handler, it only merges the message arguments before enqueueing, leaving
+    formatting (timestamps, tracebacks) and I/O to the listener thread.
+    """
+    def __init__(self, *handlers):
+        super().__init__(queue.SimpleQueue())
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def close(self):
+        self.stop()
+        super().close()
+
+    def stop(self):
+        # QueueListener.stop is not idempotent
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+_async_handlers = {}
+
+
+def async_handler(handler):
+    """Return a queue handler feeding ``handler`` from a background thread
+
+    The queue handler is shared by everything wrapping the same handler, so records for one
+    file are still written by a single thread.
+    """
+    if handler not in _async_handlers:
+        _async_handlers[handler] = AsyncQueueHandler(handler)
+    return _async_handlers[handler]
+
+
+@atexit.register
+def stop_async_handlers():
+    """Flush and stop all background logging threads"""
+    for handler in _async_handlers.values():
+        handler.stop()
+
+
+def _file_handlers(logger):
+    """Yield the file handlers of ``logger``, including those behind an async handler"""
+    for handler in logger.handlers:
+        if isinstance(handler, AsyncQueueHandler):
+            handlers = handler.listener.handlers
+        else:
+            handlers = [handler]
+        for h in handlers:
+            if isinstance(h, logging.FileHandler):
+                yield h
+
+
 def console_handler(level):
     formatter = logging.Formatter(
         '[%(levelname)s] [%(name)s] %(message)s (%(pathname)s:%(lineno)s)')
@@ -375,8 +675,16 @@ def setup_logger(logger, file_handler=None):
     # entire logging config into env.yaml
 
     if not file_handler:
-        file_handler = make_file_handler(logger.name + '.log', level=conf['level'])
-    logger.addHandler(file_handler)
+        file_handler = make_file_handler(
+            logger.name + '.log',
+            level=conf['level'],
+            max_bytes=conf['max_logfile_size'],
+            backup_count=conf['max_logfile_backups'],
+            compress=conf['compress_rotated_logs'])
+    if conf['async']:
+        logger.addHandler(async_handler(file_handler))
+    else:
+        logger.addHandler(file_handler)
 
     if conf['errors_to_console']:
         logger.addHandler(console_handler(logging.ERROR))
@@ -384,6 +692,8 @@ def setup_logger(logger, file_handler=None):
         logger.addHandler(console_handler(conf['to_console']))
 
     logger.addFilter(_RelpathFilter())
+    if conf['rate_limits']:
+        logger.addFilter(RateLimitFilter(conf['rate_limits']))
     return logger, file_handler
 
 
@@ -468,9 +778,14 @@ logger, cfme_file_handler = setup_logger(logging.getLogger('cfme'))
 # Have wrapanapi log to the same FileHandler as cfme
 wrapanapi_logger, _ = setup_logger(logging.getLogger('wrapanapi'), cfme_file_handler)
 artifactor_handler = ArtifactorHandler()
-logger.addHandler(artifactor_handler)
-# Also have wrapanapi use the ArtifactorHandler to combine cfme+wrapanapi logging there
-wrapanapi_logger.addHandler(artifactor_handler)
+if _load_conf(logger.name)['async']:
+    # hook calling is threadsafe, so the artifactor can be fed from the listener thread too
+    logger.addHandler(async_handler(artifactor_handler))
+    wrapanapi_logger.addHandler(async_handler(artifactor_handler))
+else:
+    logger.addHandler(artifactor_handler)
+    # Also have wrapanapi use the ArtifactorHandler to combine cfme+wrapanapi logging there
+    wrapanapi_logger.addHandler(artifactor_handler)
 
 add_prefix = PrefixAddingLoggerFilter()
 logger.addFilter(add_prefix)
@@ -506,7 +821,13 @@ def _configure_warnings():
     wlog = logging.getLogger('py.warnings')
     wlog.addFilter(WarningsRelpathFilter())
     wlog.addFilter(WarningsDeduplicationFilter())
-    wlog.addHandler(make_file_handler('py.warnings.log'))
+    wconf = _load_conf(wlog.name)
+    whandler = make_file_handler(
+        'py.warnings.log',
+        max_bytes=wconf['max_logfile_size'],
+        backup_count=wconf['max_logfile_backups'],
+        compress=wconf['compress_rotated_logs'])
+    wlog.addHandler(async_handler(whandler) if wconf['async'] else whandler)
     wlog.addHandler(console_handler(logging.INFO))
     wlog.propagate = False
 
@@ -515,8 +836,7 @@ def setup_for_worker(workername, loggers=('cfme', 'py.warnings', 'wrapanapi')):
     # this function is a bad hack, at some point we want a more ballanced setup
     for logger in loggers:
         log = logging.getLogger(logger)
-        handler = next(x for x in log.handlers
-                       if isinstance(x, logging.FileHandler))
+        handler = next(_file_handlers(log))
         handler.close()
         base, name = os.path.split(handler.baseFilename)
         add_prefix.prefix = f"({workername})"
@@ -0,0 +1,219 @@
+"""Index of an appliance log, kept on the appliance, to search the log without reading all of it.
+
+The index of a log such as ``evm.log`` or ``production.log`` maps every minute of the log to the
+byte offset of its first line, and counts the lines per log level and per ``MIQ(Class...)`` that
+logged them. It is a text file on the appliance, in :py:data:`INDEX_DIR`::
+
+    O <inode of the log> <offset indexed up to>
+    T 2020-03-10T10:00 0
+    T 2020-03-10T10:01 5310
+    L I 5120
+    W MiqServer 73
+
+Each :py:class:`LogIndex` call first indexes the lines logged since the last one, in the same
+round trip, then reads only the part of the log between the offsets of the asked minutes:
+
+.. code-block:: python
+
+    index = LogIndex(appliance.ssh_client, '/var/www/miq/vmdb/log/evm.log')
+    errors = index.search(r'ERROR', since=started, until=finished)
+    summary = index.update()
+    assert summary.levels.get('E', 0) == 0
+
+A log truncated or replaced by the rotation is indexed again from its start.
+"""
+import re
+from datetime import datetime
+
+import attr
+
+from cfme.utils.log import logger
+from cfme.utils.quote import quote
+
+INDEX_DIR = '/var/tmp/cfme_log_index'
+
+TIMESTAMP = re.compile(r'\[(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?)')
+
+# Reads the old index, then the new lines of the log from its ``base`` offset, from stdin. Byte
+# counts need the C locale. A last line without its newline is still being written, so it is left
+# for the next update.
+INDEXER = r'''
+BEGIN {
+    pos = base
+    while ((getline line < idx) > 0) {
+        split(line, f, " ")
+        if (f[1] == "T") { n++; minutes[n] = f[2]; offsets[n] = f[3]; last = f[2] }
+        else if (f[1] == "L") levels[f[2]] = f[3]
+        else if (f[1] == "W") classes[f[2]] = f[3]
+    }
+    close(idx)
+}
+{
+    start = pos
+    pos += length($0) + 1
+    if (pos > limit) { pos = start; exit }
+    if (match($0, /\[[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]T[0-9][0-9]:[0-9][0-9]/)) {
+        minute = substr($0, RSTART + 1, 16)
+        if (minute != last) { n++; minutes[n] = minute; offsets[n] = start; last = minute }
+        if ($0 ~ /^\[----\] [A-Z],/) levels[substr($0, 8, 1)]++
+        if (match($0, /MIQ\([A-Za-z0-9_:]+/)) classes[substr($0, RSTART + 4, RLENGTH - 4)]++
+    }
+}
+END {
+    out = idx ".tmp"
+    printf "O %s %d\n", inode, pos > out
+    for (i = 1; i <= n; i++) printf "T %s %d\n", minutes[i], offsets[i] > out
+    for (level in levels) printf "L %s %d\n", level, levels[level] > out
+    for (name in classes) printf "W %s %d\n", name, classes[name] > out
+    close(out)
+}
+'''
+
+UPDATE = (
+    'log={log}; idx={idx}; mkdir -p {dir} && [ -f "$log" ] || exit 2; '
+    'inode=$(stat -c %i "$log"); size=$(stat -c %s "$log"); '
+    'set -- $(awk \'$1 == "O" {{print $2, $3}}\' "$idx" 2> /dev/null); '
+    'if [ "$1" = "$inode" ] && [ "${{2:-0}}" -le "$size" ]; then offset=$2; '
+    'else offset=0; rm -f "$idx"; fi; '
+    'tail -c +$((offset + 1)) "$log" | head -c $((size - offset)) | '
+    'LC_ALL=C awk -v base=$offset -v limit=$size -v inode=$inode -v idx="$idx" {indexer} && '
+    'mv -f "$idx.tmp" "$idx" || exit 3')
+
+# The offsets of the first minute not before ``since`` and of the first one after ``until``
+RANGE = (
+    'start=$(awk -v t={since} \'$1 == "T" && $2 >= t {{print $3; exit}}\' "$idx"); '
+    'end=$(awk -v t={until} \'$1 == "T" && $2 > t {{print $3; exit}}\' "$idx"); '
+    'indexed=$(awk \'$1 == "O" {{print $3}}\' "$idx"); '
+    'start=${{start:-$indexed}}; end=${{end:-$indexed}}; ')
+
+SUMMARY = r'grep -v "^T " "$idx"; grep "^T " "$idx" | sed -n "1p;\$p"; true'
+
+
+def parse_timestamp(line):
+    """Time of the log line, ``None`` if it has none (e.g. a line of a backtrace)."""
+    match = TIMESTAMP.search(line)
+    if match is None:
+        return None
+    timestamp = match.group(1)
+    return datetime.strptime(
+        timestamp, '%Y-%m-%dT%H:%M:%S.%f' if '.' in timestamp else '%Y-%m-%dT%H:%M:%S')
+
+
+def _minute(when):
+    return when.strftime('%Y-%m-%dT%H:%M')
+
+
+@attr.s
+class LogIndexSummary:
+    """What the index knows about the log, see :py:meth:`LogIndex.update`
+
+    Attributes:
+        size: Bytes of the log indexed.
+        first: Minute of the first line of the log, ``None`` if there is none.
+        last: Minute of the last line indexed, ``None`` if there is none.
+        levels: Count of the lines per log level letter (``I``, ``W``, ``E``...).
+        classes: Count of the lines per the ``MIQ(...)`` class that logged them.
+    """
+    size = attr.ib(default=0)
+    first = attr.ib(default=None)
+    last = attr.ib(default=None)
+    levels = attr.ib(default=attr.Factory(dict))
+    classes = attr.ib(default=attr.Factory(dict))
+
+
+class LogIndex:
+    """Index of an appliance log, see the module docs.
+
+    Args:
+        ssh_client: :py:class:`cfme.utils.ssh.SSHClient` of the appliance.
+        log_path: Path of the log on the appliance.
+    """
+    def __init__(self, ssh_client, log_path):
+        self.ssh_client = ssh_client
+        self.log_path = log_path
+        self.index_path = '{}/{}.idx'.format(INDEX_DIR, log_path.strip('/').replace('/', '_'))
+
+    def __repr__(self):
+        return f'<LogIndex {self.log_path!r} on {self.ssh_client!r}>'
+
+    def _run(self, command):
+        script = UPDATE.format(
+            log=quote(self.log_path), idx=quote(self.index_path), dir=quote(INDEX_DIR),
+            indexer=quote(INDEXER)) + '; ' + command
+        result = self.ssh_client.run_command(script)
+        if result.rc == 2:
+            raise OSError(f'{self.log_path} not found')
+        elif result.failed:
+            raise OSError(f'Indexing {self.log_path} failed: {result.output}')
+        return result.output
+
+    def update(self):
+        """Index the lines logged since the last update.
+
+        Returns:
+            :py:class:`LogIndexSummary`
+        """
+        summary = LogIndexSummary()
+        minutes = []
+        for line in self._run(SUMMARY).splitlines():
+            kind, _, rest = line.partition(' ')
+            fields = rest.split()
+            if kind == 'O':
+                summary.size = int(fields[1])
+            elif kind == 'T':
+                minutes.append(datetime.strptime(fields[0], '%Y-%m-%dT%H:%M'))
+            elif kind == 'L':
+                summary.levels[fields[0]] = int(fields[1])
+            elif kind == 'W':
+                summary.classes[fields[0]] = int(fields[1])
+        if minutes:
+            summary.first, summary.last = minutes[0], minutes[-1]
+        logger.debug('%r: %s', self, summary)
+        return summary
+
+    def search(self, pattern=None, since=None, until=None, invert=False, last=None):
+        """Lines of the log logged between two times, matching a pattern.
+
+        Only the minutes between ``since`` and ``until`` are read, using the index.
+
+        Args:
+            pattern: Extended regular expression (``grep -E``) the lines have to match.
+            since: :py:class:`datetime.datetime`, in the time of the log, of the first line.
+            until: :py:class:`datetime.datetime`, in the time of the log, of the last line.
+            invert: Return the lines not matching the pattern instead.
+            last: Return only this many of the last lines found.
+
+        Returns:
+            :py:class:`list` of the lines, without their line endings.
+        """
+        command = RANGE.format(
+            since=quote(_minute(since)) if since else '0',
+            until=quote(_minute(until)) if until else '9')
+        command += 'tail -c +$((start + 1)) "$log" | head -c $((end - start))'
+        if pattern is not None:
+            command += ' | grep -a{} -E -e {}'.format('v' if invert else '', quote(pattern))
+        if last and until is None:
+            # All the lines past the start of the range are in it, but the first minute's
+            command += f' | tail -n {int(last)}'
+        lines = []
+        in_range = since is None and until is None
+        for line in self._run(command + '; true').splitlines():
+            when = parse_timestamp(line)
+            if when is not None:
+                # The first and the last minute may have lines outside the range
+                in_range = (since is None or when >= since) and (until is None or when <= until)
+            if in_range:
+                lines.append(line)
+        return lines[-last:] if last else lines
+
+    def last_timestamp(self, pattern=None, since=None, invert=False):
+        """Time of the last line since ``since`` matching the pattern, see :py:meth:`search`.
+
+        Returns:
+            :py:class:`datetime.datetime` or ``None`` if there is no such line.
+        """
+        for line in reversed(self.search(pattern, since=since, invert=invert, last=100)):
+            when = parse_timestamp(line)
+            if when is not None:
+                return when
+        return None
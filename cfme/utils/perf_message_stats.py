@@ -12,6 +12,10 @@ from time import time
 import dateutil.parser as du_parser
 import pygal
 
+from cfme.utils.charts import CACHE_FILE
+from cfme.utils.charts import Chart
+from cfme.utils.charts import downsample
+from cfme.utils.charts import render_charts
 from cfme.utils.log import logger
 from cfme.utils.path import log_path
 from cfme.utils.perf import convert_top_mem_to_mib
@@ -247,18 +251,25 @@ def split_appliance_charts(top_appliance, charts_dir):
 
     if size_data > minutes_in_a_day:
         # Greater than one day worth of data, split
-        file_names = [generate_appliance_charts(top_appliance, charts_dir, 0, bracket_end)]
+        brackets = [(0, bracket_end)]
         for start_bracket in range(bracket_end, len(top_appliance['datetimes']), minutes_in_a_day):
             if (start_bracket + minutes_in_a_day) > size_data:
                 end_index = size_data - 1
             else:
                 end_index = start_bracket + minutes_in_a_day
-            file_names.append(generate_appliance_charts(top_appliance, charts_dir, start_bracket,
-                end_index))
-        return file_names
+            brackets.append((start_bracket, end_index))
     else:
         # Less than one day worth of data, do not split
-        return [generate_appliance_charts(top_appliance, charts_dir, 0, size_data - 1)]
+        brackets = [(0, size_data - 1)]
+
+    file_names = []
+    charts = []
+    for start_index, end_index in brackets:
+        bracket_files, bracket_charts = generate_appliance_charts(top_appliance, charts_dir,
+            start_index, end_index)
+        file_names.append(bracket_files)
+        charts.extend(bracket_charts)
+    return file_names, charts
 
 
 def generate_appliance_charts(top_appliance, charts_dir, start_index, end_index):
@@ -274,9 +285,9 @@ def generate_appliance_charts(top_appliance, charts_dir, start_index, end_index)
     # lines['Hi'] = top_appliance['cpuhi'][start_index:end_index]  # IRQs %
     # lines['Si'] = top_appliance['cpusi'][start_index:end_index]  # Soft IRQs %
     # lines['St'] = top_appliance['cpust'][start_index:end_index]  # Steal CPU %
-    line_chart_render('CPU Usage', 'Date Time', 'Percent',
-        top_appliance['datetimes'][start_index:end_index], lines, charts_dir.join(cpu_chart_file),
-        True)
+    cpu_chart = Chart(line_chart_render, charts_dir.join(cpu_chart_file), title='CPU Usage',
+        xtitle='Date Time', ytitle='Percent',
+        x_labels=top_appliance['datetimes'][start_index:end_index], lines=lines, stacked=True)
 
     lines = {}
     lines['Memory Total'] = top_appliance['memtot'][start_index:end_index]
@@ -284,12 +295,14 @@ def generate_appliance_charts(top_appliance, charts_dir, start_index, end_index)
     lines['Memory Used'] = top_appliance['memuse'][start_index:end_index]
     lines['Swap Used'] = top_appliance['swause'][start_index:end_index]
     lines['cached'] = top_appliance['cached'][start_index:end_index]
-    line_chart_render('Memory Usage', 'Date Time', 'KiB',
-        top_appliance['datetimes'][start_index:end_index], lines, charts_dir.join(mem_chart_file))
-    return cpu_chart_file, mem_chart_file
+    mem_chart = Chart(line_chart_render, charts_dir.join(mem_chart_file), title='Memory Usage',
+        xtitle='Date Time', ytitle='KiB',
+        x_labels=top_appliance['datetimes'][start_index:end_index], lines=lines)
+    return (cpu_chart_file, mem_chart_file), [cpu_chart, mem_chart]
 
 
 def generate_hourly_charts_and_csvs(hourly_buckets, charts_dir):
+    charts = []
     for cmd in sorted(hourly_buckets):
         current_csv = 'hourly_' + cmd + '.csv'
         csv_rawdata_path = log_path.join('csv_output', current_csv)
@@ -330,24 +343,27 @@ def generate_hourly_charts_and_csvs(hourly_buckets, charts_dir):
             lines = {}
             lines['Put ' + cmd] = cmd_put
             lines['Get ' + cmd] = cmd_get
-            line_chart_render(cmd + ' Command Put/Get Count', 'Hour during ' + dt,
-                '# Count of Commands', linechartxaxis, lines,
-                charts_dir.join(f'/{cmd}-{dt}-cmdcnt.svg'))
+            charts.append(Chart(line_chart_render, charts_dir.join(f'/{cmd}-{dt}-cmdcnt.svg'),
+                title=cmd + ' Command Put/Get Count', xtitle='Hour during ' + dt,
+                ytitle='# Count of Commands', x_labels=linechartxaxis, lines=lines))
 
             lines = {}
             lines['Average Dequeue Timing'] = avgdeqtimings
             lines['Min Dequeue Timing'] = mindeqtimings
             lines['Max Dequeue Timing'] = maxdeqtimings
-            line_chart_render(cmd + ' Dequeue Timings', 'Hour during ' + dt, 'Time (s)',
-                linechartxaxis, lines, charts_dir.join(f'/{cmd}-{dt}-dequeue.svg'))
+            charts.append(Chart(line_chart_render, charts_dir.join(f'/{cmd}-{dt}-dequeue.svg'),
+                title=cmd + ' Dequeue Timings', xtitle='Hour during ' + dt, ytitle='Time (s)',
+                x_labels=linechartxaxis, lines=lines))
 
             lines = {}
             lines['Average Deliver Timing'] = avgdeltimings
             lines['Min Deliver Timing'] = mindeltimings
             lines['Max Deliver Timing'] = maxdeltimings
-            line_chart_render(cmd + ' Deliver Timings', 'Hour during ' + dt, 'Time (s)',
-                linechartxaxis, lines, charts_dir.join(f'/{cmd}-{dt}-deliver.svg'))
+            charts.append(Chart(line_chart_render, charts_dir.join(f'/{cmd}-{dt}-deliver.svg'),
+                title=cmd + ' Deliver Timings', xtitle='Hour during ' + dt, ytitle='Time (s)',
+                x_labels=linechartxaxis, lines=lines))
         output_file.close()
+    return charts
 
 
 def generate_raw_data_csv(rawdata_dict, csv_file_name):
@@ -367,17 +383,21 @@ def generate_raw_data_csv(rawdata_dict, csv_file_name):
 
 
 def generate_total_time_charts(msg_cmds, charts_dir):
+    charts = []
     for cmd in sorted(msg_cmds):
         logger.info('Generating Total Time Chart for %s', cmd)
         lines = {}
         lines['Total Time'] = msg_cmds[cmd]['total']
         lines['Queue'] = msg_cmds[cmd]['queue']
         lines['Execute'] = msg_cmds[cmd]['execute']
-        line_chart_render(cmd + ' Total Time', 'Message #', 'Time (s)', [], lines,
-            charts_dir.join(f'/{cmd}-total.svg'))
+        charts.append(Chart(line_chart_render, charts_dir.join(f'/{cmd}-total.svg'),
+            title=cmd + ' Total Time', xtitle='Message #', ytitle='Time (s)', x_labels=[],
+            lines=lines))
+    return charts
 
 
 def generate_worker_charts(workers, top_workers, charts_dir):
+    charts = []
     for worker in top_workers:
         logger.info('Generating Charts for Worker: %s Type: %s',
             worker, workers[worker].worker_type)
@@ -387,14 +407,16 @@ def generate_worker_charts(workers, top_workers, charts_dir):
         lines['Virt Mem'] = top_workers[worker]['virt']
         lines['Res Mem'] = top_workers[worker]['res']
         lines['Shared Mem'] = top_workers[worker]['share']
-        line_chart_render(worker_name, 'Date Time', 'Memory in MiB',
-            top_workers[worker]['datetimes'], lines,
-            charts_dir.join(f'/{worker_name}-Memory.svg'))
+        charts.append(Chart(line_chart_render, charts_dir.join(f'/{worker_name}-Memory.svg'),
+            title=worker_name, xtitle='Date Time', ytitle='Memory in MiB',
+            x_labels=top_workers[worker]['datetimes'], lines=lines))
 
         lines = {}
         lines['CPU %'] = top_workers[worker]['cpu_per']
-        line_chart_render(worker_name, 'Date Time', 'CPU Usage', top_workers[worker]['datetimes'],
-            lines, charts_dir.join(f'/{worker_name}-CPU.svg'))
+        charts.append(Chart(line_chart_render, charts_dir.join(f'/{worker_name}-CPU.svg'),
+            title=worker_name, xtitle='Date Time', ytitle='CPU Usage',
+            x_labels=top_workers[worker]['datetimes'], lines=lines))
+    return charts
 
 
 def get_first_miqtop(top_log_file):
@@ -458,6 +480,18 @@ def get_msg_timestamp_pid(log_line):
         return False, 0
 
 
+def group_rows(keys):
+    """Yields each distinct key of the array with the indices of its rows, sorted by the key."""
+    # Import here to allow perf to install numpy separately
+    import numpy
+
+    order = numpy.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    bounds = numpy.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+    for rows in numpy.split(order, bounds) if len(order) else []:
+        yield keys[rows[0]], rows
+
+
 def hour_bucket_init(init):
     if init:
         return MiqMsgBucket()
@@ -465,7 +499,9 @@ def hour_bucket_init(init):
         return {}
 
 
-def line_chart_render(title, xtitle, ytitle, x_labels, lines, fname, stacked=False):
+def line_chart_render(fname, title, xtitle, ytitle, x_labels, lines, stacked=False,
+                      max_points=None):
+    x_labels, lines = downsample(x_labels, lines, max_points)
     if stacked:
         line_chart = pygal.StackedLine()
     else:
@@ -484,74 +520,51 @@ def line_chart_render(title, xtitle, ytitle, x_labels, lines, fname, stacked=Fal
 
 
 def messages_to_hourly_buckets(messages, test_start, test_end):
-    hr_bkt = {}
+    # Import here to allow perf to install numpy separately
+    import numpy
+
+    table = MiqMsgTable(messages)
     # Hour buckets look like: hr_bkt[msg_cmd][msg_date][msg_hour] = MiqMsgBucket()
-    for msg in messages:
-        # put on queue, deals with queuing:
-        msg_cmd = messages[msg].msg_cmd
-        putdate = messages[msg].puttime[:10]
-        puthour = messages[msg].puttime[11:13]
-        if msg_cmd not in hr_bkt:
-            hr_bkt[msg_cmd] = provision_hour_buckets(test_start, test_end)
-
-        hr_bkt[msg_cmd][putdate][puthour].total_put += 1
-        hr_bkt[msg_cmd][putdate][puthour].sum_deq += messages[msg].deq_time
-        if (hr_bkt[msg_cmd][putdate][puthour].min_deq == 0 or
-                hr_bkt[msg_cmd][putdate][puthour].min_deq > messages[msg].deq_time):
-            hr_bkt[msg_cmd][putdate][puthour].min_deq = messages[msg].deq_time
-        if (hr_bkt[msg_cmd][putdate][puthour].max_deq == 0 or
-                hr_bkt[msg_cmd][putdate][puthour].max_deq < messages[msg].deq_time):
-            hr_bkt[msg_cmd][putdate][puthour].max_deq = messages[msg].deq_time
-        hr_bkt[msg_cmd][putdate][puthour].avg_deq = \
-            hr_bkt[msg_cmd][putdate][puthour].sum_deq / hr_bkt[msg_cmd][putdate][puthour].total_put
-
-        # Get time is when the message is delivered
-        getdate = messages[msg].gettime[:10]
-        gethour = messages[msg].gettime[11:13]
-
-        hr_bkt[msg_cmd][getdate][gethour].total_get += 1
-        hr_bkt[msg_cmd][getdate][gethour].sum_del += messages[msg].del_time
-        if (hr_bkt[msg_cmd][getdate][gethour].min_del == 0 or
-                hr_bkt[msg_cmd][getdate][gethour].min_del > messages[msg].del_time):
-            hr_bkt[msg_cmd][getdate][gethour].min_del = messages[msg].del_time
-        if (hr_bkt[msg_cmd][getdate][gethour].max_del == 0 or
-                hr_bkt[msg_cmd][getdate][gethour].max_del < messages[msg].del_time):
-            hr_bkt[msg_cmd][getdate][gethour].max_del = messages[msg].del_time
-
-        hr_bkt[msg_cmd][getdate][gethour].avg_del = \
-            hr_bkt[msg_cmd][getdate][gethour].sum_del / hr_bkt[msg_cmd][getdate][gethour].total_get
+    hr_bkt = {cmd: provision_hour_buckets(test_start, test_end) for cmd in table.cmds}
+
+    # put on queue, deals with queuing:
+    for cmd, date, hour, count, total, minimum, maximum in table.hourly(
+            table.put_time, table.deq_time):
+        bucket = hr_bkt[cmd].setdefault(date, {}).setdefault(hour, MiqMsgBucket())
+        bucket.total_put = count
+        bucket.sum_deq = total
+        bucket.min_deq = minimum
+        bucket.max_deq = maximum
+        bucket.avg_deq = total / count
+
+    # Get time is when the message is delivered
+    never_got = int(numpy.isnat(table.get_time).sum())
+    if never_got:
+        logger.info('%d messages were never got from the queue', never_got)
+    for cmd, date, hour, count, total, minimum, maximum in table.hourly(
+            table.get_time, table.del_time):
+        bucket = hr_bkt[cmd].setdefault(date, {}).setdefault(hour, MiqMsgBucket())
+        bucket.total_get = count
+        bucket.sum_del = total
+        bucket.min_del = minimum
+        bucket.max_del = maximum
+        bucket.avg_del = total / count
     return hr_bkt
 
 
 def messages_to_statistics_csv(messages, statistics_file_name):
+    table = MiqMsgTable(messages)
     all_statistics = []
-    for msg_id in messages:
-        msg = messages[msg_id]
-
-        added = False
-        if len(all_statistics) > 0:
-            for msg_statistics in all_statistics:
-                if msg_statistics.cmd == msg.msg_cmd:
-
-                    if msg.del_time > 0:
-                        msg_statistics.delivertimes.append(float(msg.del_time))
-                        msg_statistics.gets += 1
-                    msg_statistics.dequeuetimes.append(float(msg.deq_time))
-                    msg_statistics.totaltimes.append(float(msg.total_time))
-                    msg_statistics.puts += 1
-                    added = True
-                    break
-
-        if not added:
-            msg_statistics = MiqMsgLists()
-            msg_statistics.cmd = msg.msg_cmd
-            if msg.del_time > 0:
-                msg_statistics.delivertimes.append(float(msg.del_time))
-                msg_statistics.gets = 1
-            msg_statistics.dequeuetimes.append(float(msg.deq_time))
-            msg_statistics.totaltimes.append(float(msg.total_time))
-            msg_statistics.puts = 1
-            all_statistics.append(msg_statistics)
+    for cmd, rows in table.by_cmd():
+        msg_statistics = MiqMsgLists()
+        msg_statistics.cmd = cmd
+        delivertimes = table.del_time[rows]
+        msg_statistics.delivertimes = delivertimes[delivertimes > 0]
+        msg_statistics.dequeuetimes = table.deq_time[rows]
+        msg_statistics.totaltimes = table.total_time[rows]
+        msg_statistics.puts = len(rows)
+        msg_statistics.gets = len(msg_statistics.delivertimes)
+        all_statistics.append(msg_statistics)
 
     csvdata_path = log_path.join('csv_output', statistics_file_name)
     outputfile = csvdata_path.open('w', ensure=True)
@@ -570,8 +583,8 @@ def messages_to_statistics_csv(messages, statistics_file_name):
         # Import here to allow perf to install numpy separately
         import numpy
 
-        # Contents of CSV
-        for msg_statistics in sorted(all_statistics, key=lambda x: x.cmd):
+        # Contents of CSV, sorted by the command already
+        for msg_statistics in all_statistics:
             if msg_statistics.gets > 1:
                 logger.debug('Samples/Avg/90th/Std: %s: %s : %s : %s,Cmd: %s',
                     str(len(msg_statistics.totaltimes)).rjust(7),
@@ -615,9 +628,6 @@ def provision_hour_buckets(test_start, test_end, init=True):
         else:
             for hr in range(24):
                 buckets[date][str(hr).zfill(2)] = hour_bucket_init(init)
-    if init:
-        buckets[''] = {}
-        buckets[''][''] = MiqMsgBucket()
     return buckets
 
 
@@ -732,7 +742,13 @@ def top_to_workers(workers, top_file):
     # Also pids can be duplicated, so careful attention to detail on when a pid starts and ends
     top_lines = greppedtop.strip().split('\n')
     line_count = 0
-    top_workers = {}
+    workers_by_pid = {}
+    for worker in workers.values():
+        workers_by_pid.setdefault(worker.pid, []).append(worker)
+    # Samples of all the workers, as columns, grouped by the worker afterwards
+    sample_ids = []
+    sample_times = []
+    samples = {key: [] for key in ('virt', 'res', 'share', 'cpu_per', 'mem_per')}
     cur_time = None
     miqtop_ahead = True
     runningtime = time()
@@ -774,32 +790,35 @@ def top_to_workers(workers, top_file):
                 top_share = convert_top_mem_to_mib(top_results.group(4))
                 top_cpu_per = float(top_results.group(5))
                 top_mem_per = float(top_results.group(6))
-                for worker in workers:
-                    if workers[worker].pid == top_pid:
-                        if cur_time > workers[worker].start_ts and \
-                                (workers[worker].end_ts == '' or cur_time < workers[worker].end_ts):
-                            w_id = workers[worker].worker_id
-                            if w_id not in top_workers:
-                                top_workers[w_id] = {}
-                                top_workers[w_id]['datetimes'] = []
-                                top_workers[w_id]['virt'] = []
-                                top_workers[w_id]['res'] = []
-                                top_workers[w_id]['share'] = []
-                                top_workers[w_id]['cpu_per'] = []
-                                top_workers[w_id]['mem_per'] = []
-                            top_workers[w_id]['datetimes'].append(str(cur_time))
-                            top_workers[w_id]['virt'].append(top_virt)
-                            top_workers[w_id]['res'].append(top_res)
-                            top_workers[w_id]['share'].append(top_share)
-                            top_workers[w_id]['cpu_per'].append(top_cpu_per)
-                            top_workers[w_id]['mem_per'].append(top_mem_per)
-                            break
+                for worker in workers_by_pid.get(top_pid, []):
+                    if cur_time > worker.start_ts and \
+                            (worker.end_ts == '' or cur_time < worker.end_ts):
+                        sample_ids.append(worker.worker_id)
+                        sample_times.append(str(cur_time))
+                        samples['virt'].append(top_virt)
+                        samples['res'].append(top_res)
+                        samples['share'].append(top_share)
+                        samples['cpu_per'].append(top_cpu_per)
+                        samples['mem_per'].append(top_mem_per)
+                        break
             else:
                 logger.error('Issue with miq_top regex or grepping of top file:%s', top_line)
         if (line_count % 20000) == 0:
             timediff = time() - runningtime
             runningtime = time()
             logger.info('Count %s : Parsed 20000 lines in %s', line_count, timediff)
+
+    # Import here to allow perf to install numpy separately
+    import numpy
+
+    sample_ids = numpy.array(sample_ids, dtype=numpy.int64)
+    sample_times = numpy.array(sample_times, dtype=object)
+    samples = {key: numpy.array(values, dtype=float) for key, values in samples.items()}
+    top_workers = {}
+    for w_id, rows in group_rows(sample_ids):
+        top_workers[int(w_id)] = {'datetimes': sample_times[rows].tolist()}
+        for key, values in samples.items():
+            top_workers[int(w_id)][key] = values[rows].tolist()
     return top_workers, len(top_lines)
 
 
@@ -873,28 +892,35 @@ def perf_process_evm(evm_file, top_file):
 
     logger.info('----------- Generating Hourly Charts and csvs -----------')
     starttime = time()
-    generate_hourly_charts_and_csvs(hr_bkt, charts_dir)
+    charts = generate_hourly_charts_and_csvs(hr_bkt, charts_dir)
     timediff = time() - starttime
     logger.info('Generated Hourly Charts and csvs in: %s', timediff)
 
     logger.info('----------- Generating Total Time Charts -----------')
     starttime = time()
-    generate_total_time_charts(msg_cmds, charts_dir)
+    charts.extend(generate_total_time_charts(msg_cmds, charts_dir))
     timediff = time() - starttime
     logger.info('Generated Total Time Charts in: %s', timediff)
 
     logger.info('----------- Generating Appliance Charts -----------')
     starttime = time()
-    app_chart_files = split_appliance_charts(top_appliance, charts_dir)
+    app_chart_files, app_charts = split_appliance_charts(top_appliance, charts_dir)
+    charts.extend(app_charts)
     timediff = time() - starttime
     logger.info('Generated Appliance Charts in: %s', timediff)
 
     logger.info('----------- Generating Worker Charts -----------')
     starttime = time()
-    generate_worker_charts(workers, top_workers, charts_dir)
+    charts.extend(generate_worker_charts(workers, top_workers, charts_dir))
     timediff = time() - starttime
     logger.info('Generated Worker Charts in: %s', timediff)
 
+    logger.info('----------- Rendering Charts -----------')
+    starttime = time()
+    render_charts(charts, cache_file=charts_dir.join(CACHE_FILE))
+    timediff = time() - starttime
+    logger.info('Rendered Charts in: %s', timediff)
+
     logger.info('----------- Generating Message Statistics -----------')
     starttime = time()
     messages_to_statistics_csv(messages, 'queue-statistics.csv')
@@ -1073,6 +1099,74 @@ class MiqMsgLists:
         self.totaltimes = []
 
 
+class MiqMsgTable:
+    """The messages as typed columns, one numpy array per column, for aggregating them at once.
+
+    Attributes:
+        cmds: Names of the commands, sorted.
+        cmd: Index of the command of each message in ``cmds``.
+        put_time, get_time: ``datetime64[us]`` of the put and the get of the message, ``get_time``
+            is ``NaT`` if it was not got.
+        deq_time, del_time, total_time: Dequeue, deliver and total times in seconds.
+    """
+
+    def __init__(self, messages):
+        # Import here to allow perf to install numpy separately
+        import numpy
+
+        msgs = list(messages.values())
+        self.cmds, self.cmd = numpy.unique(
+            numpy.array([str(msg.msg_cmd) for msg in msgs], dtype=str), return_inverse=True)
+        self.cmds = [str(cmd) for cmd in self.cmds]
+        self.put_time = numpy.array(
+            [msg.puttime or 'NaT' for msg in msgs], dtype='datetime64[us]')
+        self.get_time = numpy.array(
+            [msg.gettime or 'NaT' for msg in msgs], dtype='datetime64[us]')
+        self.deq_time = numpy.array([msg.deq_time for msg in msgs], dtype=float)
+        self.del_time = numpy.array([msg.del_time for msg in msgs], dtype=float)
+        self.total_time = numpy.array([msg.total_time for msg in msgs], dtype=float)
+
+    def __len__(self):
+        return len(self.cmd)
+
+    def by_cmd(self):
+        """Yields each command with the indices of its messages, sorted by the command."""
+        for cmd, rows in group_rows(self.cmd):
+            yield self.cmds[cmd], rows
+
+    def hourly(self, times, values):
+        """Aggregates the values per command and hour of the times, all the groups at once.
+
+        Yields:
+            ``(cmd, date, hour, count, sum, min, max)`` of the non-empty groups, with ``min`` of
+            the non-zero values. The values of the ``NaT`` times are left out.
+        """
+        # Import here to allow perf to install numpy separately
+        import numpy
+
+        known = ~numpy.isnat(times)
+        times, values, cmd = times[known], values[known], self.cmd[known]
+        hour_keys, hours = numpy.unique(
+            times.astype('datetime64[h]').astype(numpy.int64), return_inverse=True)
+        groups = cmd * len(hour_keys) + hours
+        size = len(self.cmds) * len(hour_keys)
+        count = numpy.bincount(groups, minlength=size)
+        total = numpy.bincount(groups, weights=values, minlength=size)
+        minimum = numpy.full(size, numpy.inf)
+        numpy.minimum.at(minimum, groups, numpy.where(values > 0, values, numpy.inf))
+        minimum[numpy.isinf(minimum)] = 0.0
+        maximum = numpy.zeros(size)
+        numpy.maximum.at(maximum, groups, values)
+
+        labels = [(label[:10], label[11:13])
+                  for label in numpy.datetime_as_string(hour_keys.astype('datetime64[h]'))]
+        for group in numpy.flatnonzero(count):
+            cmd, hour = divmod(int(group), len(hour_keys))
+            date, hour = labels[hour]
+            yield (self.cmds[cmd], date, hour, int(count[group]), float(total[group]),
+                   float(minimum[group]), float(maximum[group]))
+
+
 class MiqMsgBucket:
     def __init__(self):
         self.headers = ['date', 'hour', 'total_put', 'total_get', 'sum_deq', 'min_deq', 'max_deq',
@@ -12,6 +12,7 @@ import operator
 from collections import OrderedDict
 from collections.abc import Mapping
 from copy import copy
+from functools import lru_cache
 
 from cfme.common.provider import all_types
 from cfme.exceptions import UnknownProviderType
@@ -336,10 +337,23 @@ def get_crud_by_name(provider_name):
 
     Returns: A Provider object that has methods that operate on CFME
     """
+    try:
+        provider_key = provider_keys_by_name()[provider_name]
+    except KeyError:
+        raise NameError(f"Could not find provider {provider_name}")
+    return get_crud(provider_key)
+
+
+@lru_cache(maxsize=None)
+def provider_keys_by_name():
+    """Returns a mapping of management_system names in cfme_data to their keys.
+
+    The first key wins if more providers share a name, as in a linear scan.
+    """
+    keys_by_name = {}
     for provider_key, provider_data in providers_data.items():
-        if provider_data.get("name") == provider_name:
-            return get_crud(provider_key)
-    raise NameError(f"Could not find provider {provider_name}")
+        keys_by_name.setdefault(provider_data.get("name"), provider_key)
+    return keys_by_name
 
 
 def get_mgmt(provider_key, providers=None, credentials=None):
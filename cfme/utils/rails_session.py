@@ -0,0 +1,339 @@
+"""Long-lived Rails session on the appliance.
+
+Every ``bin/rails runner`` or ``rails console`` boots the whole Rails application, which takes tens
+of seconds of appliance CPU and a lot of its memory. :py:class:`RailsSession` boots it once, in a
+``bin/rails runner`` process on a dedicated channel of the appliance's SSH connection, and then
+evaluates Ruby snippets sent to that process.
+
+The snippets and their results travel in frames, a header line with the size of the JSON document
+that follows it. Requests look like::
+
+    67
+    {"id": 1, "code": "Vm.count", "sandbox": false, "timeout": 60.0}
+
+and the responses carry the ``inspect`` of the value, whatever the snippet wrote to ``$stdout`` and
+the class, message and backtrace of the exception it raised, if any::
+
+    \x1eRAILS-SESSION 68
+    {"id": 1, "ok": true, "result": "42", "output": "", "error": null}
+
+The response header starts with :py:data:`MARKER`, so anything else the process prints (warnings,
+writes to ``STDOUT`` or ``STDERR``) can be told apart and is added to the output of the snippet.
+
+Each snippet gets its own binding, so local variables do not leak between the snippets. Sandboxed
+snippets run in a database transaction that is rolled back afterwards. If a snippet does not finish
+in its timeout, or the process dies, the session is torn down and started again for the next
+snippet.
+"""
+import base64
+import itertools
+import json
+import socket
+import threading
+import time
+
+import attr
+import paramiko
+
+from cfme.exceptions import RailsSessionError
+from cfme.exceptions import RailsSessionStartError
+from cfme.utils.log import logger
+from cfme.utils.log import perflog
+from cfme.utils.quote import quote
+
+MARKER = '\x1eRAILS-SESSION'
+""" Start of the header line of the response frames """
+
+START_TIMEOUT = 600
+""" How long to wait for the session process to boot Rails, in seconds """
+
+TIMEOUT_GRACE = 15
+""" How long past the snippet's own timeout to wait for its response before killing the session """
+
+BACKTRACE_LINES = 30
+""" How many lines of the backtrace of a failed snippet are sent back """
+
+SERVER = r'''
+require 'json'
+require 'stringio'
+require 'timeout'
+
+def __rails_session_binding
+  binding
+end
+
+session_out = STDOUT.dup
+session_out.binmode
+session_out.sync = true
+STDOUT.sync = true
+STDERR.sync = true
+$stdin.binmode
+
+reply = lambda do |response|
+  data = JSON.generate(response)
+  session_out.write("#{RAILS_SESSION_MARKER} #{data.bytesize}\n#{data}")
+end
+
+evaluate = lambda do |code|
+  eval(code, __rails_session_binding, '(rails session)').inspect.to_s.scrub
+end
+
+reply.call('id' => 0, 'ok' => true, 'pid' => Process.pid, 'rails' => Rails.version)
+
+while (header = $stdin.gets)
+  request = JSON.parse($stdin.read(header.to_i))
+  captured = StringIO.new
+  response = {'id' => request['id'], 'result' => nil, 'error' => nil}
+  begin
+    $stdout = captured
+    ActiveRecord::Base.connection.verify!
+    Timeout.timeout(request['timeout']) do
+      if request['sandbox']
+        ActiveRecord::Base.transaction do
+          response['result'] = evaluate.call(request['code'])
+          raise ActiveRecord::Rollback
+        end
+      else
+        response['result'] = evaluate.call(request['code'])
+      end
+    end
+    response['ok'] = true
+  rescue Exception => e
+    response['ok'] = false
+    response['error'] = {
+      'class' => e.class.name,
+      'message' => e.message.to_s.scrub,
+      'backtrace' => (e.backtrace || []).first(BACKTRACE_LINES)}
+  ensure
+    $stdout = STDOUT
+  end
+  response['output'] = captured.string.scrub
+  reply.call(response)
+end
+'''
+
+PROLOGUE = 'RAILS_SESSION_MARKER = {marker}.freeze\nBACKTRACE_LINES = {lines}\n'
+
+# The server is passed encoded, so no shell or sudo quoting can get in its way
+RUNNER = (
+    'cd /var/www/miq/vmdb; bin/rails runner "require \'base64\'; '
+    'eval(Base64.decode64(\'{server}\'), TOPLEVEL_BINDING, \'(rails session)\')"')
+
+
+@attr.s(frozen=True)
+class RailsResult:
+    """Result of a Ruby snippet evaluated by :py:meth:`RailsSession.evaluate`
+
+    Attributes:
+        code: The evaluated snippet.
+        ok: Whether the snippet finished without raising.
+        value: ``inspect`` of the value of the snippet, ``None`` if it raised.
+        output: Everything the snippet printed.
+        error: :py:class:`dict` with ``class``, ``message`` and ``backtrace`` of the exception the
+            snippet raised, ``None`` if it did not.
+    """
+    code = attr.ib()
+    ok = attr.ib()
+    value = attr.ib()
+    output = attr.ib(repr=False)
+    error = attr.ib(default=None)
+
+    def __bool__(self):
+        return self.ok
+
+    @property
+    def error_text(self):
+        """The exception formatted the way ruby prints it, empty if there is none."""
+        if self.error is None:
+            return ''
+        return '{}: {} ({})\n{}'.format(
+            self.error['backtrace'][0] if self.error['backtrace'] else '(rails session)',
+            self.error['message'], self.error['class'],
+            ''.join(f'\tfrom {line}\n' for line in self.error['backtrace'][1:]))
+
+    @property
+    def runner_output(self):
+        """The output ``bin/rails runner`` would have printed for the snippet."""
+        return self.output + self.error_text
+
+    @property
+    def console_output(self):
+        """The output ``rails console`` would have printed for the snippet, without the banner."""
+        if self.ok:
+            return f'{self.code}\n{self.output}{self.value}\n'
+        return f'{self.code}\n{self.output}{self.error_text}'
+
+
+class RailsSession:
+    """Rails process on the appliance evaluating Ruby snippets, see the module docs.
+
+    The process is started with the first snippet and restarted whenever it is found dead. It runs
+    on the appliance host, as root.
+
+    Usage:
+
+        session = RailsSession(appliance.ssh_client)
+        result = session.evaluate('Vm.count')
+        assert result.ok
+        vm_count = int(result.value)
+
+    Args:
+        ssh_client: :py:class:`cfme.utils.ssh.SSHClient` of the appliance.
+    """
+    def __init__(self, ssh_client):
+        self.ssh_client = ssh_client
+        self.pid = None
+        self._channel = None
+        self._buffer = b''
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f'<RailsSession {self.ssh_client!r} pid={self.pid}>'
+
+    @property
+    def alive(self):
+        channel = self._channel
+        return channel is not None and not channel.closed and not channel.exit_status_ready()
+
+    def _command(self):
+        server = PROLOGUE.format(marker=json.dumps(MARKER), lines=BACKTRACE_LINES) + SERVER
+        command = RUNNER.format(server=base64.b64encode(server.encode('utf-8')).decode('ascii'))
+        if self.ssh_client.username != 'root':
+            # sudo needs a pseudo-tty, which must not echo the requests nor mangle the responses
+            return 'sudo -i bash -c {}'.format(quote('stty raw -echo; ' + command)), True
+        return command, False
+
+    def start(self):
+        """Start the session process and wait for it to boot Rails.
+
+        Raises:
+            :py:class:`cfme.exceptions.RailsSessionStartError` if it does not come up.
+        """
+        with self._lock:
+            self.stop()
+            command, uses_pty = self._command()
+            logger.info('Starting rails session on %r', self.ssh_client)
+            try:
+                with perflog.span('rails_session_start', host=self.ssh_client.hostname):
+                    channel = self.ssh_client.get_transport().open_session()
+                    if uses_pty:
+                        channel.get_pty()
+                    channel.set_combine_stderr(True)
+                    channel.exec_command(command)
+                    self._channel = channel
+                    ready, output = self._read_frame(time.time() + START_TIMEOUT)
+            except (RailsSessionError, socket.error, EOFError, paramiko.SSHException) as e:
+                self.stop()
+                raise RailsSessionStartError(
+                    f'Rails session on {self.ssh_client!r} did not start: {e}')
+            self.pid = ready['pid']
+            logger.info(
+                'Rails session on %r started, pid %s, rails %s', self.ssh_client, self.pid,
+                ready.get('rails'))
+            if output:
+                logger.debug('Rails session startup output:\n%s', output)
+
+    def stop(self, kill=False):
+        """Stop the session process.
+
+        The process exits when it reads the end of its input, after the snippet it may be
+        evaluating. With ``kill``, it is killed right away instead.
+        """
+        with self._lock:
+            channel, self._channel = self._channel, None
+            pid, self.pid = self.pid, None
+            self._buffer = b''
+            if channel is None:
+                return
+            try:
+                channel.shutdown_write()
+                channel.close()
+            except (socket.error, EOFError, paramiko.SSHException):
+                pass
+            if kill and pid and self.ssh_client.connected:
+                self.ssh_client.run_command(f'kill -9 {pid}', ensure_host=True, timeout=60)
+
+    def restart(self):
+        """Start a new session process, e.g. to load Ruby code patched on the appliance."""
+        self.stop()
+        self.start()
+
+    def _recv(self, deadline):
+        remaining = None if deadline is None else deadline - time.time()
+        if remaining is not None and remaining <= 0:
+            raise socket.timeout()
+        self._channel.settimeout(remaining)
+        data = self._channel.recv(65536)
+        if not data:
+            raise RailsSessionError(
+                'Rails session on {!r} exited with {}, output:\n{}'.format(
+                    self.ssh_client,
+                    self._channel.recv_exit_status(),
+                    self._buffer.decode('utf-8', 'replace')))
+        self._buffer += data
+
+    def _read_frame(self, deadline):
+        """Read the next response, returns it with the stray output before it."""
+        marker = MARKER.encode('utf-8')
+        while True:
+            start = self._buffer.find(marker)
+            if start >= 0:
+                header_end = self._buffer.find(b'\n', start)
+                if header_end >= 0:
+                    size = int(self._buffer[start + len(marker):header_end])
+                    end = header_end + 1 + size
+                    if len(self._buffer) >= end:
+                        output = self._buffer[:start].decode('utf-8', 'replace')
+                        response = json.loads(self._buffer[header_end + 1:end].decode('utf-8'))
+                        self._buffer = self._buffer[end:]
+                        return response, output
+            self._recv(deadline)
+
+    def evaluate(self, code, sandbox=False, timeout=None):
+        """Evaluate a Ruby snippet.
+
+        Args:
+            code: The Ruby code.
+            sandbox: Roll back the database changes the snippet makes.
+            timeout: Seconds the snippet may run, ``None`` for no limit.
+        Returns:
+            A :py:class:`RailsResult`.
+        Raises:
+            ``socket.timeout`` if the snippet does not finish in time, the session is then killed.
+            :py:class:`cfme.exceptions.RailsSessionError` if the session process dies.
+        """
+        with self._lock, perflog.span(
+                'rails', host=self.ssh_client.hostname, code=code[:200], sandbox=sandbox):
+            if not self.alive:
+                self.start()
+            request_id = next(self._ids)
+            data = json.dumps({
+                'id': request_id, 'code': code, 'sandbox': sandbox,
+                'timeout': float(timeout) if timeout else None}).encode('utf-8')
+            logger.info('Evaluating in rails session %r', code)
+            try:
+                self._channel.sendall(b'%d\n%s' % (len(data), data))
+                response, output = self._read_frame(
+                    time.time() + timeout + TIMEOUT_GRACE if timeout else None)
+            except socket.timeout:
+                logger.error(
+                    'Rails snippet %r did not finish in %s seconds, killing the session',
+                    code, timeout)
+                self.stop(kill=True)
+                raise
+            except (RailsSessionError, socket.error, EOFError, paramiko.SSHException) as e:
+                self.stop()
+                raise RailsSessionError(f'Rails session died while evaluating {code!r}: {e}')
+            if response['id'] != request_id:
+                self.stop(kill=True)
+                raise RailsSessionError(
+                    'Rails session answered request {} instead of {}'.format(
+                        response['id'], request_id))
+            result = RailsResult(
+                code=code, ok=response['ok'], value=response['result'],
+                output=output + response['output'], error=response['error'])
+            if not result.ok:
+                logger.warning(
+                    'Rails snippet raised %s: %s', result.error['class'], result.error['message'])
+            return result
@@ -1,12 +1,138 @@
 """Helper functions for tests using REST API."""
+import time
 from collections import namedtuple
 
 import pytest
+from manageiq_client.filters import Q
 
 from cfme.exceptions import OptionNotAvailable
+from cfme.utils.log import logger
+from cfme.utils.wait import TimedOutError
 from cfme.utils.wait import wait_for
 
 
+class TaskWaiter:
+    """Waits for a set of tasks to finish, checking all of them with one query per cycle.
+
+    ``/api/tasks`` is filtered by the ids of the tasks that are not finished yet. The delay
+    between the queries starts at ``delay`` and grows by ``backoff`` up to ``max_delay`` while
+    no task finishes, it drops back to ``delay`` whenever one does.
+
+    .. code-block:: python
+
+        waiter = TaskWaiter(appliance.rest_api, task_ids)
+        tasks = waiter.wait()
+        # seconds it took for each task to finish
+        waiter.latencies
+
+    Args:
+        rest_api: :py:class:`cfme.utils.appliance.MiqApi` instance
+        task_ids: Ids of the tasks to wait for
+        num_sec: How long to wait for all the tasks to finish
+    """
+    #: Task ids filtered by a single query
+    QUERY_CHUNK = 50
+
+    def __init__(self, rest_api, task_ids=(), num_sec=600, delay=1, max_delay=30, backoff=1.5):
+        self.rest_api = rest_api
+        self.num_sec = num_sec
+        self.delay = delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.pending = {}
+        self.tasks = {}
+        self.latencies = {}
+        for task_id in task_ids:
+            self.add(task_id)
+
+    def add(self, task_id):
+        task_id = str(task_id)
+        if task_id not in self.tasks:
+            self.pending[task_id] = time.time()
+
+    def _query(self, task_ids):
+        collection = self.rest_api.collections.tasks
+        # the ids come as strings in the responses, but they must not be quoted in the filter
+        task_ids = [int(task_id) if task_id.isdigit() else task_id for task_id in task_ids]
+        q = Q('id', '=', task_ids[0])
+        for task_id in task_ids[1:]:
+            q = q | Q('id', '=', task_id)
+        response = self.rest_api.get(
+            collection._href, **{
+                'filter[]': q.as_filters,
+                'expand': 'resources',
+                'attributes': 'id,name,state,status,message'})
+        return response.get('resources', [])
+
+    def poll(self):
+        """Query the pending tasks once.
+
+        Returns:
+            :py:class:`list` of ids of the tasks that finished since the last poll
+        """
+        finished = []
+        task_ids = sorted(self.pending)
+        for start in range(0, len(task_ids), self.QUERY_CHUNK):
+            for task in self._query(task_ids[start:start + self.QUERY_CHUNK]):
+                task_id = str(task['id'])
+                if task_id not in self.pending or task.get('state', '').lower() != 'finished':
+                    continue
+                self.latencies[task_id] = time.time() - self.pending.pop(task_id)
+                self.tasks[task_id] = task
+                finished.append(task_id)
+                logger.info('Task %s %r finished with status %s after %.1fs',
+                            task_id, task.get('name'), task.get('status'),
+                            self.latencies[task_id])
+        return finished
+
+    def wait(self):
+        """Wait until all the tasks are finished.
+
+        Returns:
+            :py:class:`dict` of task id to the task data, with ``state``, ``status`` and
+            ``message`` of the task
+
+        Raises:
+            :py:class:`cfme.utils.wait.TimedOutError` if some task does not finish in time
+        """
+        deadline = time.time() + self.num_sec
+        delay = self.delay
+        while self.pending:
+            if self.poll():
+                delay = self.delay
+            else:
+                delay = min(delay * self.backoff, self.max_delay)
+            if not self.pending:
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimedOutError(
+                    'Tasks {} did not finish in {} seconds'.format(
+                        ', '.join(sorted(self.pending)), self.num_sec))
+            # the last sleep is cut short to poll once more right at the deadline
+            time.sleep(min(delay, remaining))
+        return self.tasks
+
+
+def response_task_ids(response):
+    """Returns ids of the tasks started by the successful actions in the response."""
+    try:
+        content = response.json()
+    except Exception:
+        return []
+    results = content.get('results', [content])
+    return [r['task_id'] for r in results if r and 'task_id' in r and r.get('success')]
+
+
+def wait_for_response_tasks(rest_api, num_sec=600):
+    """Waits for all the tasks started by the last request, see :py:class:`TaskWaiter`."""
+    last_response = rest_api.response
+    tasks = TaskWaiter(rest_api, response_task_ids(last_response), num_sec=num_sec).wait()
+    # preserve the original response
+    rest_api.response = last_response
+    return tasks
+
+
 def assert_response(
         rest_obj, success=None, http_status=None, results_num=None, task_wait=600):
     """
@@ -85,21 +211,6 @@ def assert_response(
             # expect True if 'success' is present and HTTP status is success
             assert result['success'], 'The response "success" is {}'.format(result['success'])
 
-        # if the request succeeded and there is a 'task_id' present in the response,
-        # check the corresponding resource in /api/task/:task_id
-        if task_wait and 'task_id' in result and result.get('success') and last_response:
-            task = rest_api.get_entity('tasks', result['task_id'])
-            task.wait_exists(num_sec=5)
-            wait_for(
-                lambda: task.state.lower() == 'finished',
-                fail_func=task.reload,
-                num_sec=task_wait,
-                message='task state finished',
-            )
-            task_message = getattr(task, 'message', '')
-            assert task.status.lower() == 'ok', (
-                f'Task failed with status "{task.status}", message "{task_message}"')
-
     if 'results' in content:
         results = content['results']
         results_len = len(results)
@@ -112,6 +223,15 @@ def assert_response(
     else:
         _check_result(content)
 
+    # if the request succeeded and there are 'task_id's present in the response,
+    # wait for all the corresponding resources in /api/tasks/:task_id at once
+    if task_wait and last_response:
+        tasks = TaskWaiter(rest_api, response_task_ids(last_response), num_sec=task_wait).wait()
+        for task in tasks.values():
+            task_message = task.get('message', '')
+            assert task['status'].lower() == 'ok', (
+                f'Task failed with status "{task["status"]}", message "{task_message}"')
+
     # preserve the original response
     rest_api.response = last_response
 
@@ -125,8 +245,60 @@ def get_vms_in_service(service):
     return [rest_api.get_entity('vms', vm['id']) for vm in service.vms.all]
 
 
+def filter_resources(collection, field, values, chunk=50, **params):
+    """Searches the collection for resources whose ``field`` equals any of the ``values``.
+
+    The values are OR-ed in a single filter, so one query covers up to ``chunk`` values.
+    Values may contain ``%`` wildcards. Extra ``params`` are passed to the query, e.g.
+    ``expand='resources'`` and ``attributes``; without them the returned entities are not loaded
+    until their attributes are accessed.
+
+    Returns:
+        :py:class:`list` of :py:class:`manageiq_client.api.Entity`
+    """
+    values = list(values)
+    resources = []
+    for start in range(0, len(values), chunk):
+        values_chunk = values[start:start + chunk]
+        q = Q(field, '=', values_chunk[0])
+        for value in values_chunk[1:]:
+            q = q | Q(field, '=', value)
+        resources.extend(
+            collection.query_string(**dict(params, **{'filter[]': q.as_filters})).resources)
+    return resources
+
+
+def wait_for_resources(collection, field, values, substr_search=False, num_sec=180, delay=10):
+    """Waits until there is a resource in the collection for each of the ``field`` values.
+
+    Each cycle queries only for the values that were not found yet, all of them at once.
+    With ``substr_search`` a resource whose ``field`` contains the value is enough.
+    """
+    pending = set(values)
+    search_str = '%{}%' if substr_search else '{}'
+
+    def _all_found():
+        found = filter_resources(
+            collection, field, [search_str.format(value) for value in sorted(pending)],
+            expand='resources', attributes=field)
+        for resource in found:
+            found_value = resource._data.get(field) or ''
+            pending.difference_update(
+                [value for value in pending
+                 if (value in found_value if substr_search else value == found_value)])
+        return not pending
+
+    if pending:
+        wait_for(_all_found, num_sec=num_sec, delay=delay,
+                 message=f'{collection.name} with {field} {", ".join(sorted(pending))}')
+
+
 def create_resource(rest_api, col_name, col_data, col_action='create', substr_search=False):
-    """Creates new resource in collection."""
+    """Creates new resources in collection with a single action.
+
+    Waits until all the new resources can be found by name, or description when they have no
+    name, see :py:func:`wait_for_resources`.
+    """
     collection = getattr(rest_api.collections, col_name)
     try:
         action = getattr(collection.action, col_action)
@@ -134,20 +306,20 @@ def create_resource(rest_api, col_name, col_data, col_action='create', substr_se
         raise OptionNotAvailable(
             f"Action `{col_action}` for {col_name} is not implemented in this version")
 
-    entities = action(*col_data)
-    action_response = rest_api.response
-    search_str = '%{}%' if substr_search else '{}'
+    search = {'name': [], 'description': []}
     for entity in col_data:
         if entity.get('name'):
-            wait_for(lambda: collection.find_by(
-                name=search_str.format(entity.get('name'))) or False, num_sec=180, delay=10)
+            search['name'].append(entity['name'])
         elif entity.get('description'):
-            wait_for(lambda: collection.find_by(
-                description=search_str.format(entity.get('description'))) or False,
-                num_sec=180, delay=10)
+            search['description'].append(entity['description'])
         else:
             raise NotImplementedError
 
+    entities = action(*col_data)
+    action_response = rest_api.response
+    for field, values in search.items():
+        wait_for_resources(collection, field, values, substr_search=substr_search)
+
     # make sure action response is preserved
     rest_api.response = action_response
     return entities
@@ -0,0 +1,106 @@
+"""Local store of the test results reported to ostriz
+
+Keeps the last overall status of every test of a build in an SQLite database, so the composite
+uncollection (:py:mod:`cfme.markers.composite`) doesn't have to download and load the whole result
+set of the build on every run and in every slave.
+
+.. code-block:: python
+
+    history = ResultHistory(path)
+    history.sync(build)  # only fetches the results reported since the last sync
+    history.statuses(build, 'jenkins', ['cfme/tests/test_foo.py/test_foo'])
+"""
+import sqlite3
+import time
+
+from cfme.utils.log import logger
+from cfme.utils.trackerbot import composite_results
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    build TEXT NOT NULL,
+    source TEXT NOT NULL,
+    test_ident TEXT NOT NULL,
+    status TEXT,
+    PRIMARY KEY (build, source, test_ident)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS syncs (
+    build TEXT NOT NULL,
+    source TEXT NOT NULL,
+    synced_ts REAL NOT NULL,
+    PRIMARY KEY (build, source)
+);
+"""
+
+#: Maximum number of test idents looked up by a single query
+QUERY_CHUNK = 500
+
+
+class ResultHistory:
+    """Test results of builds, stored in an SQLite database at ``path``
+
+    The database is safe to share between the master and the slaves, the writes are done in
+    transactions and the readers don't block the writer.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path, timeout=60)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def last_sync(self, build, source):
+        """Returns the timestamp of the last successful sync of the build or ``None``"""
+        row = self.connection.execute(
+            'SELECT synced_ts FROM syncs WHERE build = ? AND source = ?', (build, source)
+        ).fetchone()
+        return row[0] if row else None
+
+    def update(self, build, source, tests, synced_ts=None):
+        """Store the ``tests`` part of an ostriz composite result set"""
+        rows = (
+            (build, source, test_ident, test.get('statuses', {}).get('overall'))
+            for test_ident, test in tests.items())
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO results (build, source, test_ident, status) '
+                'VALUES (?, ?, ?, ?)', rows)
+            if synced_ts is not None:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO syncs (build, source, synced_ts) VALUES (?, ?, ?)',
+                    (build, source, synced_ts))
+
+    def sync(self, build, source='jenkins'):
+        """Fetch the results reported since the last sync of the build from ostriz
+
+        Returns:
+            Number of the results fetched, or ``None`` if ostriz could not be reached, in which
+            case the results from the previous syncs are still available.
+        """
+        last_sync = self.last_sync(build, source)
+        # taken before the request so no result reported meanwhile is skipped next time
+        synced_ts = time.time()
+        try:
+            tests = composite_results(build, source, limit_ts=last_sync).get('tests') or {}
+        except Exception:
+            logger.exception('Could not sync results of build %s from ostriz', build)
+            return None
+        self.update(build, source, tests, synced_ts=synced_ts)
+        logger.info('Synced %d results of build %s (%s), last sync: %s',
+                    len(tests), build, source, last_sync)
+        return len(tests)
+
+    def statuses(self, build, source, test_idents):
+        """Returns mapping of the test idents with a known result to their last overall status"""
+        test_idents = list(test_idents)
+        statuses = {}
+        for start in range(0, len(test_idents), QUERY_CHUNK):
+            chunk = test_idents[start:start + QUERY_CHUNK]
+            statuses.update(self.connection.execute(
+                'SELECT test_ident, status FROM results '
+                'WHERE build = ? AND source = ? AND test_ident IN ({})'.format(
+                    ', '.join('?' * len(chunk))),
+                [build, source] + chunk))
+        return statuses
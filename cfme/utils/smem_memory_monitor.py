@@ -10,6 +10,10 @@ from threading import Thread
 import yaml
 from yaycl import AttrDict
 
+from cfme.utils.charts import CACHE_FILE
+from cfme.utils.charts import Chart
+from cfme.utils.charts import downsample
+from cfme.utils.charts import render_charts
 from cfme.utils.conf import cfme_performance
 from cfme.utils.log import logger
 from cfme.utils.path import results_path
@@ -127,6 +131,10 @@ ruby_processes.extend(['evm:dbsync:replicate', 'MIQ Server (evm_server.rb)', 'ev
 process_order = list(ruby_processes)
 process_order.extend(['memcached', 'postgres', 'httpd', 'collectd'])
 
+# Measurements plotted per process, with their labels
+PLOTTED_MEASUREMENTS = (('rss', 'RSS'), ('pss', 'PSS'), ('uss', 'USS'), ('vss', 'VSS'),
+    ('swap', 'Swap'))
+
 # Timestamp created at first import, thus grouping all reports of like workload
 test_ts = time.strftime('%Y%m%d%H%M%S')
 
@@ -234,15 +242,14 @@ class SmemMemoryMonitor(Thread):
     #     return memory_by_pid
 
     def get_miq_server_id(self):
-        # Obtain the Miq Server GUID:
-        result = self.ssh_client.run_command('cat /var/www/miq/vmdb/GUID')
-        logger.info(f'Obtained appliance GUID: {result.output.strip()}')
-        # Get server id:
-        result = self.ssh_client.run_command(
-            'psql -t -q -d vmdb_production -c "select id from miq_servers where guid = \'{}\'"'
-            ''.format(result.output.strip()))
-        logger.info(f'Obtained miq_server_id: {result.output.strip()}')
-        self.miq_server_id = result.output.strip()
+        # Obtain the Miq Server GUID and the server id in one round trip:
+        guid, server_id = self.ssh_client.run_commands([
+            'cat /var/www/miq/vmdb/GUID',
+            'psql -t -q -d vmdb_production -c '
+            '"select id from miq_servers where guid = \'$(cat /var/www/miq/vmdb/GUID)\'"'])
+        logger.info(f'Obtained appliance GUID: {guid.output.strip()}')
+        logger.info(f'Obtained miq_server_id: {server_id.output.strip()}')
+        self.miq_server_id = server_id.output.strip()
 
     def get_pids_memory(self):
         result = self.ssh_client.run_command(
@@ -400,10 +407,16 @@ def create_report(scenario_data, appliance_results, process_results, use_slab, g
     if not os.path.exists(str(mem_rawdata_path)):
         os.mkdir(str(mem_rawdata_path))
 
-    graph_appliance_measurements(mem_graphs_path, ver, appliance_results, use_slab, provider_names)
-    graph_individual_process_measurements(mem_graphs_path, process_results, provider_names)
-    graph_same_miq_workers(mem_graphs_path, process_results, provider_names)
-    graph_all_miq_workers(mem_graphs_path, process_results, provider_names)
+    starttime = time.time()
+    charts = graph_appliance_measurements(mem_graphs_path, ver, appliance_results, use_slab,
+        provider_names)
+    charts.extend(graph_individual_process_measurements(mem_graphs_path, process_results,
+        provider_names))
+    charts.extend(graph_same_miq_workers(mem_graphs_path, process_results, provider_names))
+    charts.extend(graph_all_miq_workers(mem_graphs_path, process_results, provider_names))
+    render_charts(charts, cache_file=mem_graphs_path.join(CACHE_FILE))
+    timediff = time.time() - starttime
+    logger.info(f'Plotted Memory Graphs in: {timediff}')
 
     # Dump scenario Yaml:
     with open(str(scenario_path.join('scenario.yml')), 'w') as scenario_file:
@@ -988,14 +1001,6 @@ def create_dict(attr_dict):
 
 
 def graph_appliance_measurements(graphs_path, ver, appliance_results, use_slab, provider_names):
-    import matplotlib as mpl
-    mpl.use('Agg')
-    import matplotlib.dates as mdates
-    import matplotlib.pyplot as plt
-    from cycler import cycler
-
-    starttime = time.time()
-
     dates = list(appliance_results.keys())
     total_memory_list = list(appliance_results[ts]['total']
                              for ts in appliance_results.keys())
@@ -1015,129 +1020,113 @@ def graph_appliance_measurements(graphs_path, ver, appliance_results, use_slab,
                           for ts in appliance_results.keys())
 
     # Stack Plot Memory Usage
-    file_name = graphs_path.join(f'{ver}-appliance_memory.png')
-    mpl.rcParams['axes.prop_cycle'] = cycler('color', ['firebrick', 'coral', 'steelblue',
-        'forestgreen'])
-    fig, ax = plt.subplots()
-    plt.title(f'Provider(s): {provider_names}\nAppliance Memory')
-    plt.xlabel('Date / Time')
-    plt.ylabel('Memory (MiB)')
-    if use_slab:
-        y = [used_memory_list, slab_memory_list, cache_memory_list, free_memory_list]
-    else:
-        y = [used_memory_list, buffers_memory_list, cache_memory_list, free_memory_list]
-    plt.stackplot(dates, *y, baseline='zero')
-    ax.annotate(str(round(total_memory_list[0], 2)), xy=(dates[0], total_memory_list[0]),
-                xytext=(4, 4), textcoords='offset points')
-    ax.annotate(str(round(total_memory_list[-1], 2)), xy=(dates[-1], total_memory_list[-1]),
-                xytext=(4, -4), textcoords='offset points')
-    if use_slab:
-        ax.annotate(str(round(slab_memory_list[0], 2)), xy=(dates[0], used_memory_list[0] +
-                    slab_memory_list[0]), xytext=(4, 4), textcoords='offset points')
-        ax.annotate(str(round(slab_memory_list[-1], 2)), xy=(dates[-1], used_memory_list[-1] +
-                    slab_memory_list[-1]), xytext=(4, -4), textcoords='offset points')
-        ax.annotate(str(round(cache_memory_list[0], 2)), xy=(dates[0], used_memory_list[0] +
-                    slab_memory_list[0] + cache_memory_list[0]), xytext=(4, 4),
-                    textcoords='offset points')
-        ax.annotate(str(round(cache_memory_list[-1], 2)), xy=(
-            dates[-1], used_memory_list[-1] + slab_memory_list[-1] + cache_memory_list[-1]),
-            xytext=(4, -4), textcoords='offset points')
-    else:
-        ax.annotate(str(round(buffers_memory_list[0], 2)), xy=(
-            dates[0], used_memory_list[0] + buffers_memory_list[0]), xytext=(4, 4),
-            textcoords='offset points')
-        ax.annotate(str(round(buffers_memory_list[-1], 2)), xy=(dates[-1],
-                    used_memory_list[-1] + buffers_memory_list[-1]), xytext=(4, -4),
-                    textcoords='offset points')
-        ax.annotate(str(round(cache_memory_list[0], 2)), xy=(dates[0], used_memory_list[0] +
-                    buffers_memory_list[0] + cache_memory_list[0]), xytext=(4, 4),
-                    textcoords='offset points')
-        ax.annotate(str(round(cache_memory_list[-1], 2)), xy=(
-            dates[-1], used_memory_list[-1] + buffers_memory_list[-1] + cache_memory_list[-1]),
-            xytext=(4, -4), textcoords='offset points')
-    ax.annotate(str(round(used_memory_list[0], 2)), xy=(dates[0], used_memory_list[0]),
-        xytext=(4, 4), textcoords='offset points')
-    ax.annotate(str(round(used_memory_list[-1], 2)), xy=(dates[-1], used_memory_list[-1]),
-        xytext=(4, -4), textcoords='offset points')
-    datefmt = mdates.DateFormatter('%m-%d %H-%M')
-    ax.xaxis.set_major_formatter(datefmt)
-    ax.grid(True)
-    p1 = plt.Rectangle((0, 0), 1, 1, fc='firebrick')
-    p2 = plt.Rectangle((0, 0), 1, 1, fc='coral')
-    p3 = plt.Rectangle((0, 0), 1, 1, fc='steelblue')
-    p4 = plt.Rectangle((0, 0), 1, 1, fc='forestgreen')
+    stacked = OrderedDict()
+    stacked['Used'] = used_memory_list
     if use_slab:
-        ax.legend([p1, p2, p3, p4], ['Used', 'Slab', 'Cached', 'Free'],
-            bbox_to_anchor=(1.45, 0.22), fancybox=True)
+        stacked['Slab'] = slab_memory_list
     else:
-        ax.legend([p1, p2, p3, p4], ['Used', 'Buffers', 'Cached', 'Free'],
-            bbox_to_anchor=(1.45, 0.22), fancybox=True)
-    fig.autofmt_xdate()
-    plt.savefig(str(file_name), bbox_inches='tight')
-    plt.close()
+        stacked['Buffers'] = buffers_memory_list
+    stacked['Cached'] = cache_memory_list
+    stacked['Free'] = free_memory_list
+    memory_chart = Chart(plot_memory_stack, graphs_path.join(f'{ver}-appliance_memory.png'),
+        title=f'Provider(s): {provider_names}\nAppliance Memory', ylabel='Memory (MiB)',
+        dates=dates, stacked=stacked, totals={'Total': total_memory_list},
+        colors=['firebrick', 'coral', 'steelblue', 'forestgreen'])
 
     # Stack Plot Swap usage
-    mpl.rcParams['axes.prop_cycle'] = cycler('color', ['firebrick', 'forestgreen'])
-    file_name = graphs_path.join(f'{ver}-appliance_swap.png')
-    fig, ax = plt.subplots()
-    plt.title(f'Provider(s): {provider_names}\nAppliance Swap')
-    plt.xlabel('Date / Time')
-    plt.ylabel('Swap (MiB)')
-
-    swap_used_list = [t - f for f, t in zip(swap_free_list, swap_total_list)]
-    y = [swap_used_list, swap_free_list]
-    plt.stackplot(dates, *y, baseline='zero')
-    ax.annotate(str(round(swap_total_list[0], 2)), xy=(dates[0], swap_total_list[0]),
-        xytext=(4, 4), textcoords='offset points')
-    ax.annotate(str(round(swap_total_list[-1], 2)), xy=(dates[-1], swap_total_list[-1]),
-        xytext=(4, -4), textcoords='offset points')
-    ax.annotate(str(round(swap_used_list[0], 2)), xy=(dates[0], swap_used_list[0]),
-        xytext=(4, 4), textcoords='offset points')
-    ax.annotate(str(round(swap_used_list[-1], 2)), xy=(dates[-1], swap_used_list[-1]),
-        xytext=(4, -4), textcoords='offset points')
-    datefmt = mdates.DateFormatter('%m-%d %H-%M')
-    ax.xaxis.set_major_formatter(datefmt)
-    ax.grid(True)
-    p1 = plt.Rectangle((0, 0), 1, 1, fc='firebrick')
-    p2 = plt.Rectangle((0, 0), 1, 1, fc='forestgreen')
-    ax.legend([p1, p2], ['Used Swap', 'Free Swap'], bbox_to_anchor=(1.45, 0.22), fancybox=True)
-    fig.autofmt_xdate()
-    plt.savefig(str(file_name), bbox_inches='tight')
-    plt.close()
+    stacked = OrderedDict()
+    stacked['Used Swap'] = [t - f for f, t in zip(swap_free_list, swap_total_list)]
+    stacked['Free Swap'] = swap_free_list
+    swap_chart = Chart(plot_memory_stack, graphs_path.join(f'{ver}-appliance_swap.png'),
+        title=f'Provider(s): {provider_names}\nAppliance Swap', ylabel='Swap (MiB)',
+        dates=dates, stacked=stacked, totals={'Total Swap': swap_total_list},
+        colors=['firebrick', 'forestgreen'])
+    return [memory_chart, swap_chart]
 
-    # Reset Colors
-    mpl.rcdefaults()
 
-    timediff = time.time() - starttime
-    logger.info(f'Plotted Appliance Memory in: {timediff}')
+def graph_all_miq_workers(graph_file_path, process_results, provider_names):
+    lines = []
+    for process_name in process_results:
+        if 'Worker' in process_name or 'Handler' in process_name or 'Catcher' in process_name:
+            for process_pid in process_results[process_name]:
+                samples = process_results[process_name][process_pid]
+                dates = list(samples.keys())
+                for measurement in ('rss', 'vss'):
+                    lines.append(('{} {} {}'.format(process_pid, process_name,
+                        measurement.upper()), dates, [samples[ts][measurement] for ts in dates]))
+    return [Chart(plot_memory_lines, graph_file_path.join('all-processes.png'),
+        title=f'Provider(s): {provider_names}\nAll Workers/Monitored Processes', lines=lines,
+        annotate=False)]
 
 
-def graph_all_miq_workers(graph_file_path, process_results, provider_names):
+def graph_individual_process_measurements(graph_file_path, process_results, provider_names):
+    charts = []
+    for process_name in process_results:
+        for process_pid in process_results[process_name]:
+            samples = process_results[process_name][process_pid]
+            dates = list(samples.keys())
+            lines = [(label, dates, [samples[ts][measurement] for ts in dates])
+                     for measurement, label in PLOTTED_MEASUREMENTS]
+            charts.append(Chart(plot_memory_lines,
+                graph_file_path.join(f'{process_name}-{process_pid}.png'),
+                title='Provider(s)/Size: {}\nProcess/Worker: {}\nPID: {}'.format(provider_names,
+                    process_name, process_pid), lines=lines))
+    return charts
+
+
+def graph_same_miq_workers(graph_file_path, process_results, provider_names):
+    charts = []
+    for process_name in process_results:
+        if len(process_results[process_name]) > 1:
+            logger.debug('Plotting {} {} processes on single graph.'.format(
+                len(process_results[process_name]), process_name))
+            pids = 'PIDs: '
+            for i, pid in enumerate(process_results[process_name], 1):
+                pids = '{}{}'.format(pids, '{},{}'.format(pid, [' ', '\n'][i % 6 == 0]))
+            pids = pids[0:-2]
+
+            lines = []
+            for process_pid in process_results[process_name]:
+                samples = process_results[process_name][process_pid]
+                dates = list(samples.keys())
+                lines.extend((f'{process_pid} {label.upper()}', dates,
+                              [samples[ts][measurement] for ts in dates])
+                             for measurement, label in PLOTTED_MEASUREMENTS)
+            charts.append(Chart(plot_memory_lines,
+                graph_file_path.join(f'{process_name}-all.png'),
+                title='Provider: {}\nProcess/Worker: {}\n{}'.format(provider_names,
+                    process_name, pids), lines=lines))
+    return charts
+
+
+def plot_memory_lines(file_name, title, lines, annotate=True, max_points=None):
+    """Plot memory measurements as lines, each with its own dates.
+
+    Args:
+        file_name: Path of the png file.
+        title: Title of the graph.
+        lines: :py:class:`list` of ``(label, dates, values)`` of the lines.
+        annotate: Annotate the first and the last value of each line.
+        max_points: Points of each line plotted at most, see :py:func:`cfme.utils.charts.downsample`
+    """
     import matplotlib as mpl
     mpl.use('Agg')
     import matplotlib.dates as mdates
     import matplotlib.pyplot as plt
 
-    starttime = time.time()
-    file_name = graph_file_path.join('all-processes.png')
-
     fig, ax = plt.subplots()
-    plt.title(f'Provider(s): {provider_names}\nAll Workers/Monitored Processes')
+    plt.title(title)
     plt.xlabel('Date / Time')
     plt.ylabel('Memory (MiB)')
-    for process_name in process_results:
-        if 'Worker' in process_name or 'Handler' in process_name or 'Catcher' in process_name:
-            for process_pid in process_results[process_name]:
-                dates = list(process_results[process_name][process_pid].keys())
-
-                rss_samples = list(process_results[process_name][process_pid][ts]['rss']
-                        for ts in process_results[process_name][process_pid].keys())
-                vss_samples = list(process_results[process_name][process_pid][ts]['vss']
-                        for ts in process_results[process_name][process_pid].keys())
-                plt.plot(dates, rss_samples, linewidth=1, label='{} {} RSS'.format(process_pid,
-                    process_name))
-                plt.plot(dates, vss_samples, linewidth=1, label='{} {} VSS'.format(
-                    process_pid, process_name))
+    for label, dates, values in lines:
+        dates, line = downsample(dates, {label: values}, max_points)
+        values = line[label]
+        plt.plot(dates, values, linewidth=1, label=label)
+        if annotate and values:
+            ax.annotate(str(round(values[0], 2)), xy=(dates[0], values[0]),
+                xytext=(4, 4), textcoords='offset points')
+            ax.annotate(str(round(values[-1], 2)), xy=(dates[-1], values[-1]),
+                xytext=(4, -4), textcoords='offset points')
 
     datefmt = mdates.DateFormatter('%m-%d %H-%M')
     ax.xaxis.set_major_formatter(datefmt)
@@ -1147,160 +1136,57 @@ def graph_all_miq_workers(graph_file_path, process_results, provider_names):
     plt.savefig(str(file_name), bbox_inches='tight')
     plt.close()
 
-    timediff = time.time() - starttime
-    logger.info(f'Plotted All Type/Process Memory in: {timediff}')
-
-
-def graph_individual_process_measurements(graph_file_path, process_results, provider_names):
-    import matplotlib as mpl
-    mpl.use('Agg')
-    import matplotlib.dates as mdates
-    import matplotlib.pyplot as plt
-
-    starttime = time.time()
-    for process_name in process_results:
-        for process_pid in process_results[process_name]:
-
-            file_name = graph_file_path.join(f'{process_name}-{process_pid}.png')
-
-            dates = list(process_results[process_name][process_pid].keys())
-            rss_samples = list(process_results[process_name][process_pid][ts]['rss']
-                    for ts in process_results[process_name][process_pid].keys())
-            pss_samples = list(process_results[process_name][process_pid][ts]['pss']
-                    for ts in process_results[process_name][process_pid].keys())
-            uss_samples = list(process_results[process_name][process_pid][ts]['uss']
-                    for ts in process_results[process_name][process_pid].keys())
-            vss_samples = list(process_results[process_name][process_pid][ts]['vss']
-                    for ts in process_results[process_name][process_pid].keys())
-            swap_samples = list(process_results[process_name][process_pid][ts]['swap']
-                    for ts in process_results[process_name][process_pid].keys())
-
-            fig, ax = plt.subplots()
-            plt.title('Provider(s)/Size: {}\nProcess/Worker: {}\nPID: {}'.format(provider_names,
-                process_name, process_pid))
-            plt.xlabel('Date / Time')
-            plt.ylabel('Memory (MiB)')
-            plt.plot(dates, rss_samples, linewidth=1, label='RSS')
-            plt.plot(dates, pss_samples, linewidth=1, label='PSS')
-            plt.plot(dates, uss_samples, linewidth=1, label='USS')
-            plt.plot(dates, vss_samples, linewidth=1, label='VSS')
-            plt.plot(dates, swap_samples, linewidth=1, label='Swap')
-
-            if rss_samples:
-                ax.annotate(str(round(rss_samples[0], 2)), xy=(dates[0], rss_samples[0]),
-                    xytext=(4, 4), textcoords='offset points')
-                ax.annotate(str(round(rss_samples[-1], 2)), xy=(dates[-1], rss_samples[-1]),
-                    xytext=(4, -4), textcoords='offset points')
-            if pss_samples:
-                ax.annotate(str(round(pss_samples[0], 2)), xy=(dates[0], pss_samples[0]),
-                    xytext=(4, 4), textcoords='offset points')
-                ax.annotate(str(round(pss_samples[-1], 2)), xy=(dates[-1], pss_samples[-1]),
-                    xytext=(4, -4), textcoords='offset points')
-            if uss_samples:
-                ax.annotate(str(round(uss_samples[0], 2)), xy=(dates[0], uss_samples[0]),
-                    xytext=(4, 4), textcoords='offset points')
-                ax.annotate(str(round(uss_samples[-1], 2)), xy=(dates[-1], uss_samples[-1]),
-                    xytext=(4, -4), textcoords='offset points')
-            if vss_samples:
-                ax.annotate(str(round(vss_samples[0], 2)), xy=(dates[0], vss_samples[0]),
-                    xytext=(4, 4), textcoords='offset points')
-                ax.annotate(str(round(vss_samples[-1], 2)), xy=(dates[-1], vss_samples[-1]),
-                    xytext=(4, -4), textcoords='offset points')
-            if swap_samples:
-                ax.annotate(str(round(swap_samples[0], 2)), xy=(dates[0], swap_samples[0]),
-                    xytext=(4, 4), textcoords='offset points')
-                ax.annotate(str(round(swap_samples[-1], 2)), xy=(dates[-1], swap_samples[-1]),
-                    xytext=(4, -4), textcoords='offset points')
-
-            datefmt = mdates.DateFormatter('%m-%d %H-%M')
-            ax.xaxis.set_major_formatter(datefmt)
-            ax.grid(True)
-            plt.legend(loc='upper center', bbox_to_anchor=(1.2, 0.1), fancybox=True)
-            fig.autofmt_xdate()
-            plt.savefig(str(file_name), bbox_inches='tight')
-            plt.close()
 
-    timediff = time.time() - starttime
-    logger.info(f'Plotted Individual Process Memory in: {timediff}')
+def plot_memory_stack(file_name, title, ylabel, dates, stacked, totals, colors, max_points=None):
+    """Plot memory measurements stacked on each other, under their totals.
 
+    The first and the last value of each total and each stacked measurement but the top one are
+    annotated, at the top of the measurement in the stack.
 
-def graph_same_miq_workers(graph_file_path, process_results, provider_names):
+    Args:
+        file_name: Path of the png file.
+        title: Title of the graph.
+        ylabel: Label of the y axis.
+        dates: Dates of the measurements.
+        stacked: :py:class:`OrderedDict` of the measurements to stack, from the bottom.
+        totals: :py:class:`dict` of the measurements to only annotate.
+        colors: Colors of the stacked measurements.
+        max_points: Points plotted at most, see :py:func:`cfme.utils.charts.downsample`
+    """
     import matplotlib as mpl
     mpl.use('Agg')
     import matplotlib.dates as mdates
     import matplotlib.pyplot as plt
 
-    starttime = time.time()
-    for process_name in process_results:
-        if len(process_results[process_name]) > 1:
-            logger.debug('Plotting {} {} processes on single graph.'.format(
-                len(process_results[process_name]), process_name))
-            file_name = graph_file_path.join(f'{process_name}-all.png')
-
-            fig, ax = plt.subplots()
-            pids = 'PIDs: '
-            for i, pid in enumerate(process_results[process_name], 1):
-                pids = '{}{}'.format(pids, '{},{}'.format(pid, [' ', '\n'][i % 6 == 0]))
-            pids = pids[0:-2]
-            plt.title('Provider: {}\nProcess/Worker: {}\n{}'.format(provider_names,
-                process_name, pids))
-            plt.xlabel('Date / Time')
-            plt.ylabel('Memory (MiB)')
-
-            for process_pid in process_results[process_name]:
-                dates = list(process_results[process_name][process_pid].keys())
-
-                rss_samples = list(process_results[process_name][process_pid][ts]['rss']
-                        for ts in process_results[process_name][process_pid].keys())
-                pss_samples = list(process_results[process_name][process_pid][ts]['pss']
-                        for ts in process_results[process_name][process_pid].keys())
-                uss_samples = list(process_results[process_name][process_pid][ts]['uss']
-                        for ts in process_results[process_name][process_pid].keys())
-                vss_samples = list(process_results[process_name][process_pid][ts]['vss']
-                        for ts in process_results[process_name][process_pid].keys())
-                swap_samples = list(process_results[process_name][process_pid][ts]['swap']
-                        for ts in process_results[process_name][process_pid].keys())
-                plt.plot(dates, rss_samples, linewidth=1, label=f'{process_pid} RSS')
-                plt.plot(dates, pss_samples, linewidth=1, label=f'{process_pid} PSS')
-                plt.plot(dates, uss_samples, linewidth=1, label=f'{process_pid} USS')
-                plt.plot(dates, vss_samples, linewidth=1, label=f'{process_pid} VSS')
-                plt.plot(dates, swap_samples, linewidth=1, label=f'{process_pid} SWAP')
-                if rss_samples:
-                    ax.annotate(str(round(rss_samples[0], 2)), xy=(dates[0], rss_samples[0]),
-                        xytext=(4, 4), textcoords='offset points')
-                    ax.annotate(str(round(rss_samples[-1], 2)), xy=(dates[-1],
-                        rss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if pss_samples:
-                    ax.annotate(str(round(pss_samples[0], 2)), xy=(dates[0],
-                        pss_samples[0]), xytext=(4, 4), textcoords='offset points')
-                    ax.annotate(str(round(pss_samples[-1], 2)), xy=(dates[-1],
-                        pss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if uss_samples:
-                    ax.annotate(str(round(uss_samples[0], 2)), xy=(dates[0],
-                        uss_samples[0]), xytext=(4, 4), textcoords='offset points')
-                    ax.annotate(str(round(uss_samples[-1], 2)), xy=(dates[-1],
-                        uss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if vss_samples:
-                    ax.annotate(str(round(vss_samples[0], 2)), xy=(dates[0],
-                        vss_samples[0]), xytext=(4, 4), textcoords='offset points')
-                    ax.annotate(str(round(vss_samples[-1], 2)), xy=(dates[-1],
-                        vss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if swap_samples:
-                    ax.annotate(str(round(swap_samples[0], 2)), xy=(dates[0],
-                        swap_samples[0]), xytext=(4, 4), textcoords='offset points')
-                    ax.annotate(str(round(swap_samples[-1], 2)), xy=(dates[-1],
-                        swap_samples[-1]), xytext=(4, -4), textcoords='offset points')
-
-            datefmt = mdates.DateFormatter('%m-%d %H-%M')
-            ax.xaxis.set_major_formatter(datefmt)
-            ax.grid(True)
-            plt.legend(loc='upper center', bbox_to_anchor=(1.2, 0.1), fancybox=True)
-            fig.autofmt_xdate()
-            plt.savefig(str(file_name), bbox_inches='tight')
-            plt.close()
+    lines = OrderedDict(stacked)
+    lines.update(totals)
+    dates, lines = downsample(dates, lines, max_points)
+    fig, ax = plt.subplots()
+    ax.set_prop_cycle(color=colors)
+    plt.title(title)
+    plt.xlabel('Date / Time')
+    plt.ylabel(ylabel)
+    ax.stackplot(dates, *[lines[name] for name in stacked], baseline='zero')
+
+    annotated = [(lines[name], lines[name]) for name in totals]
+    top = [0] * len(dates)
+    for name in list(stacked)[:-1]:
+        top = [bottom + value for bottom, value in zip(top, lines[name])]
+        annotated.append((lines[name], top))
+    for values, heights in annotated:
+        ax.annotate(str(round(values[0], 2)), xy=(dates[0], heights[0]),
+            xytext=(4, 4), textcoords='offset points')
+        ax.annotate(str(round(values[-1], 2)), xy=(dates[-1], heights[-1]),
+            xytext=(4, -4), textcoords='offset points')
 
-    timediff = time.time() - starttime
-    logger.info(f'Plotted Same Type/Process Memory in: {timediff}')
+    datefmt = mdates.DateFormatter('%m-%d %H-%M')
+    ax.xaxis.set_major_formatter(datefmt)
+    ax.grid(True)
+    ax.legend([plt.Rectangle((0, 0), 1, 1, fc=color) for color in colors], list(stacked),
+        bbox_to_anchor=(1.45, 0.22), fancybox=True)
+    fig.autofmt_xdate()
+    plt.savefig(str(file_name), bbox_inches='tight')
+    plt.close()
 
 
 def summary_csv_measurement_dump(csv_file, process_results, measurement):
@@ -1,6 +1,10 @@
+import codecs
+import io
 import re
+import shlex
 import socket
 import sys
+import tempfile
 import typing
 from functools import total_ordering
 from os import path as os_path
@@ -8,21 +12,24 @@ from subprocess import check_call
 
 import attr
 import fauxfactory
-import gevent
+import gevent.select
 import iso8601
 import paramiko
 from cached_property import cached_property
 from scp import SCPClient
 from wrapanapi.entities import Vm
 
+from cfme.exceptions import RailsSessionStartError
 from cfme.fixtures.pytest_store import store
 from cfme.utils import conf
 from cfme.utils import ports
 from cfme.utils.log import logger
+from cfme.utils.log import perflog
 from cfme.utils.net import net_check
 from cfme.utils.net import retry_connect
 from cfme.utils.path import project_path
 from cfme.utils.quote import quote
+from cfme.utils.rails_session import RailsSession
 from cfme.utils.timeutil import parsetime
 from cfme.utils.version import Version
 from cfme.utils.version import VersionPicker
@@ -46,6 +53,12 @@ CONNECT_TIMEOUT = 10
 CONNECT_SSH_DELAY = 1
 """ The delay between trials to connect the obtained addresses. """
 
+READ_CHUNK_SIZE = 32768
+""" The most output of a command read from the channel at once, in bytes. """
+
+SPOOL_TAIL_SIZE = 65536
+""" How much of the end of a spooled output is kept in :py:attr:`SSHResult.output`. """
+
 
 @attr.s(frozen=True, eq=False)
 @total_ordering
@@ -74,6 +87,7 @@ class SSHResult:
     command = attr.ib()
     rc = attr.ib()
     output = attr.ib(repr=False)
+    output_file = attr.ib(default=None, repr=False)
 
     def __str__(self):
         return str(self.output)
@@ -116,6 +130,54 @@ class SSHResult:
     def failed(self):
         return self.rc != 0
 
+    def iter_lines(self):
+        """Iterate over the lines of the whole output, also of a spooled one."""
+        if self.output_file is None:
+            yield from self.output.splitlines(keepends=True)
+        else:
+            self.output_file.seek(0)
+            yield from self.output_file
+
+
+class SSHCommandStream:
+    """Output of a command while it runs, see :py:meth:`SSHClient.stream_command`
+
+    Iterating yields the lines of the output, with their line endings, as they arrive. Once the
+    iteration ends, ``rc`` holds the exit status of the command. Use it as a context manager to
+    close the channel when the iteration is left early.
+    """
+    def __init__(self, command, session, chunks, stderr=True):
+        self.command = command
+        self.rc = None
+        self._session = session
+        self._chunks = chunks
+        self._stderr = stderr
+
+    def __iter__(self):
+        pending = {False: '', True: ''}
+        for stderr, text in self._chunks:
+            if stderr and not self._stderr:
+                continue
+            *lines, pending[stderr] = (pending[stderr] + text).split('\n')
+            for line in lines:
+                yield line + '\n'
+        for rest in pending.values():
+            if rest:
+                yield rest
+        self.rc = self._session.recv_exit_status()
+        if self.rc != 0:
+            logger.warning('Exit code %d!', self.rc)
+        self.close()
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
 
 _ssh_key_file = project_path.join('.generated_ssh_key')
 _ssh_pubkey_file = project_path.join('.generated_ssh_key.pub')
@@ -123,6 +185,36 @@ _ssh_pubkey_file = project_path.join('.generated_ssh_key.pub')
 _client_session = list()
 
 
+def rails_runner_code(command):
+    """Ruby code the shell passes to ``bin/rails runner`` for ``command``.
+
+    Returns ``None`` if the shell would do more than unquote it (expand variables, redirect, pass
+    several arguments) or if it is a script file, so it can not be evaluated in a rails session.
+    """
+    if not isinstance(command, str):
+        return None
+    single_quoted = (
+        command.startswith("'") and command.endswith("'") and command.count("'") == 2)
+    if not single_quoted and ('$' in command or '`' in command):
+        return None
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        words = list(lexer)
+    except ValueError:
+        return None
+    if len(words) != 1 or words[0].endswith('.rb'):
+        return None
+    return words[0]
+
+
+def rails_console_code(command):
+    """Ruby code ``run_rails_console`` echoes to the console, ``None`` if the shell alters it."""
+    if not isinstance(command, str) or any(c in command for c in '$`\\"'):
+        return None
+    return command
+
+
 class SSHClient(paramiko.SSHClient):
     """paramiko.SSHClient wrapper
 
@@ -137,6 +229,9 @@ class SSHClient(paramiko.SSHClient):
             app and ``container`` then specifies the name of the pod to interact with.
         stdout: If specified, overrides the system stdout file for streaming output.
         stderr: If specified, overrides the system stderr file for streaming output.
+        rails_session: Whether :py:meth:`run_rails_command` and :py:meth:`run_rails_console`
+            evaluate the code in a :py:class:`cfme.utils.rails_session.RailsSession` instead of
+            booting rails for every call. Defaults to ``rails_session`` in ``env.yaml``.
     """
     def __init__(self, *, stream_output=False, **connect_kwargs):
         super().__init__()
@@ -154,6 +249,9 @@ class SSHClient(paramiko.SSHClient):
         self.f_stderr = connect_kwargs.pop('stderr', sys.stderr)
         self._use_check_port = connect_kwargs.pop('use_check_port', True)
         self.strict_host_key_checking = connect_kwargs.pop('strict_host_key_checking', True)
+        self.use_rails_session = connect_kwargs.pop(
+            'rails_session', conf.env.get('rails_session', False))
+        self._rails_session = None
 
         # load the defaults for ssh, including current_appliance and default credentials keys
         compiled_kwargs = dict(
@@ -210,6 +308,10 @@ class SSHClient(paramiko.SSHClient):
     def username(self):
         return self._connect_kwargs.get('username')
 
+    @property
+    def hostname(self):
+        return self._connect_kwargs.get('hostname')
+
     def __repr__(self):
         return "<SSHClient hostname={} port={}>".format(
             repr(self._connect_kwargs.get("hostname")),
@@ -248,6 +350,9 @@ class SSHClient(paramiko.SSHClient):
             logger.debug('scp progress for %r: %s of %s ', filename, sent, size)
 
     def close(self):
+        rails_session = getattr(self, '_rails_session', None)
+        if rails_session is not None:
+            rails_session.stop()
         super().close()
         try:
             _client_session.remove(self)
@@ -321,7 +426,7 @@ class SSHClient(paramiko.SSHClient):
         return super().get_transport(*args, **kwargs)
 
     def run_command(self, command, timeout=RUNCMD_TIMEOUT, ensure_host=False,
-                    ensure_user=False, container=None):
+                    ensure_user=False, container=None, spool=None):
         """Run a command over SSH.
 
         Args:
@@ -332,19 +437,72 @@ class SSHClient(paramiko.SSHClient):
             ensure_user: Ensure that the command is run as the user we logged in, so in case we are
                 not root, setting this to True will prevent from running sudo.
             container: allows to temporarily override default container
+            spool: If set, the output is written to a temporary file, kept in memory only until
+                it grows past this many characters. ``output`` of the result then holds only the
+                last :py:data:`SPOOL_TAIL_SIZE` characters, the whole output is in ``output_file``.
         Returns:
             A :py:class:`SSHResult` instance.
         """
         # paramiko hangs on *_ready calls if destination has become unavailable
         # this is some kind of watchdog to handle this issue
         try:
-            with gevent.Timeout(timeout):
+            with gevent.Timeout(timeout), perflog.span(
+                    'ssh', host=self._connect_kwargs.get('hostname'), command=str(command)[:200]):
                 return self._run_command(command, timeout, ensure_host, ensure_user,
-                                         container)
+                                         container, spool)
         except gevent.Timeout:
             logger.error("command %s couldn't finish in given timeout %s", command, timeout)
             raise
 
+    def run_commands(self, commands, timeout=RUNCMD_TIMEOUT, ensure_host=False,
+                     ensure_user=False, container=None, stop_on_failure=False):
+        """Run several commands over SSH, in one script on one channel.
+
+        Each command runs in its own subshell, as if run by :py:meth:`run_command`, and its output
+        and exit code are told apart by a random delimiter the script prints after it.
+
+        Args:
+            commands: List of the commands. Supports taking dicts as version picking.
+            timeout, ensure_host, ensure_user, container: See :py:meth:`run_command`, the timeout
+                is for all the commands.
+            stop_on_failure: Don't run the commands after the first one that fails.
+        Returns:
+            A list of :py:class:`SSHResult`, one per command run. With ``stop_on_failure``, the
+            last one failed if it is shorter than ``commands``.
+        """
+        commands = [
+            VersionPicker(command).pick(self.vmdb_version) if isinstance(command, dict)
+            else command
+            for command in commands]
+        if not commands:
+            return []
+        delimiter = f'--{fauxfactory.gen_alphanumeric(16)}--'
+        script = []
+        for command in commands:
+            # The newline before the closing parenthesis ends a possible trailing comment
+            script.append(f'(\n{command}\n) 2>&1')
+            script.append(f"__rc=$?; printf '%s %d\\n' {delimiter} $__rc")
+            if stop_on_failure:
+                script.append('[ $__rc -eq 0 ] || exit $__rc')
+        result = self.run_command(
+            '\n'.join(script), timeout=timeout, ensure_host=ensure_host, ensure_user=ensure_user,
+            container=container)
+
+        results = []
+        output = result.output
+        for command in commands:
+            match = re.search(rf'{delimiter} (\d+)\r?\n', output)
+            if match is None:
+                # The script was cut off, e.g. killed, while running this command
+                results.append(SSHResult(command=command, rc=result.rc or 1, output=output))
+                break
+            rc = int(match.group(1))
+            results.append(SSHResult(command=command, rc=rc, output=output[:match.start()]))
+            output = output[match.end():]
+            if stop_on_failure and rc != 0:
+                break
+        return results
+
     def load_host_keys(self, filename):
         """
         Load host keys from a local host-key file.  Host keys read with this
@@ -395,8 +553,8 @@ class SSHClient(paramiko.SSHClient):
                 return
             self._system_host_keys.load(filename)
 
-    def _run_command(self, command, timeout=RUNCMD_TIMEOUT, ensure_host=False,
-                     ensure_user=False, container=None):
+    def _open_command(self, command, ensure_host=False, ensure_user=False, container=None):
+        """Start the command on a new channel, returns the channel and the command actually run."""
         if isinstance(command, dict):
             command = VersionPicker(command).pick(self.vmdb_version)
         original_command = command
@@ -423,80 +581,150 @@ class SSHClient(paramiko.SSHClient):
             logger.info("> Actually running command %r", command)
         command += '\n'
 
-        output = []
-        try:
-            session = self.get_transport().open_session()
-            if uses_sudo:
-                # We need a pseudo-tty for sudo
-                session.get_pty()
-            if timeout:
-                session.settimeout(float(timeout))
-
-            session.exec_command(command)
-            stdout = session.makefile()
-            stderr = session.makefile_stderr()
-
-            def write_output(line, file):
-                output.append(line)
-                if self._streaming:
-                    file.write(line)
-
-            while True:
-                if session.exit_status_ready():
-                    break
-                no_data = 0
-                # While the program is running loop through collecting line by line so that we don't
-                # fill the buffers up without a newline.
-                # Also, note that for long running programs if we try to read output when there
-                # is none (and in the case of stderr may never be any)
-                # we risk blocking so long that the write buffer on the remote side will fill
-                # and the remote program will block on a write.
-                # The blocking on our side occurs in paramiko's buffered_pipe.py's read() call,
-                # which will block if its internal buffer is empty.
-                if session.recv_ready():
-                    try:
-                        line = next(stdout)
-                        write_output(line, self.f_stdout)
-                    except StopIteration:
-                        pass
-                else:
-                    no_data += 1
-
-                if session.recv_stderr_ready():
-                    try:
-                        line = next(stderr)
-                        write_output(line, self.f_stderr)
-                    except StopIteration:
-                        pass
-                else:
-                    no_data += 1
+        session = self.get_transport().open_session()
+        if uses_sudo:
+            # We need a pseudo-tty for sudo
+            session.get_pty()
+        session.exec_command(command)
+        return session, command
 
-                if no_data == 2:
-                    gevent.sleep(0.01)
+    def _read_chunks(self, session, timeout=None):
+        """Yield ``(is_stderr, data)`` chunks of the output of the command running on the channel.
 
-            # When the program finishes, we need to grab the rest of the output that is left.
-            # Also, we don't have the issue of blocking reads because since the command is
-            # finished, any pending reads of SSH encrypted data will finish shortly and put in
-            # the buffer or for an empty file EOF will be reached as it will be closed.
-            for line in stdout:
-                write_output(line, self.f_stdout)
-            for line in stderr:
-                write_output(line, self.f_stderr)
+        Instead of polling the channel, this waits until it has data, then reads all that is
+        buffered, up to :py:data:`READ_CHUNK_SIZE` bytes, at once. Raises ``socket.timeout`` if
+        nothing comes for ``timeout`` seconds.
+        """
+        readers = {False: session.recv, True: session.recv_stderr}
+        ready = {False: session.recv_ready, True: session.recv_stderr_ready}
+        while True:
+            # Everything sent before the EOF is buffered by the time it is received, so once it
+            # is, the buffers only need to be drained
+            eof = session.eof_received or session.closed
+            received = False
+            for stderr in (False, True):
+                if ready[stderr]():
+                    data = readers[stderr](READ_CHUNK_SIZE)
+                    received = True
+                    if data:
+                        yield stderr, data
+            if received:
+                continue
+            if eof:
+                break
+            readable, _, _ = gevent.select.select([session], [], [], timeout)
+            if not readable:
+                raise socket.timeout(f'No output for {timeout} seconds')
+
+    def _read_output(self, session, timeout=None):
+        """Like :py:meth:`_read_chunks`, with the chunks decoded to text."""
+        decoders = {
+            stderr: codecs.getincrementaldecoder('utf-8')('replace') for stderr in (False, True)}
+        for stderr, data in self._read_chunks(session, timeout):
+            text = decoders[stderr].decode(data)
+            if text:
+                yield stderr, text
+        for stderr, decoder in decoders.items():
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield stderr, text
+
+    def _run_command(self, command, timeout=RUNCMD_TIMEOUT, ensure_host=False,
+                     ensure_user=False, container=None, spool=None):
+        if spool:
+            output = tempfile.SpooledTemporaryFile(
+                max_size=spool, mode='w+', encoding='utf-8', newline='')
+        else:
+            output = io.StringIO()
+        tail = ''
+        session = None
+        try:
+            session, command = self._open_command(command, ensure_host, ensure_user, container)
+            for stderr, text in self._read_output(session, timeout):
+                output.write(text)
+                if spool:
+                    tail = (tail + text)[-SPOOL_TAIL_SIZE:]
+                if self._streaming:
+                    (self.f_stderr if stderr else self.f_stdout).write(text)
 
             exit_status = session.recv_exit_status()
             if exit_status != 0:
                 logger.warning('Exit code %d!', exit_status)
-            return SSHResult(rc=exit_status, output=''.join(output), command=command)
+            if spool:
+                output.seek(0)
+                return SSHResult(rc=exit_status, output=tail, command=command, output_file=output)
+            return SSHResult(rc=exit_status, output=output.getvalue(), command=command)
         except socket.timeout:
             logger.exception(
                 "Command %r timed out. Output before it failed was:\n%r",
                 command,
-                ''.join(output))
+                tail if spool else output.getvalue())
             raise
+        finally:
+            if session is not None:
+                session.close()
+
+    def run_command_to_file(self, command, local_path, timeout=RUNCMD_TIMEOUT,
+                            ensure_host=False, ensure_user=False, container=None):
+        """Run a command over SSH and write its stdout to a local file as it comes.
+
+        The stdout is written as it is, so this suits binary output like archives. Commands run
+        through sudo get a pseudo-tty, which mangles such output, so this needs a root login, or
+        ``ensure_user``.
 
-        # Returning two things so tuple unpacking the return works even if the ssh client fails
-        # Return whatever we have in the output
-        return SSHResult(rc=1, output=''.join(output), command=command)
+        Args:
+            command, ensure_host, ensure_user, container: See :py:meth:`run_command`.
+            local_path: The file to write.
+            timeout: How long the command may go without any output, in seconds.
+        Returns:
+            A :py:class:`SSHResult` instance with the stderr of the command as its output.
+        """
+        if self.username != 'root' and not ensure_user:
+            raise ValueError(
+                f'Output of commands run through sudo is not written to files, log in as root to '
+                f'{self.hostname} instead of {self.username}')
+        errors = []
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        session, command = self._open_command(command, ensure_host, ensure_user, container)
+        try:
+            with open(local_path, 'wb') as local_file:
+                for stderr, data in self._read_chunks(session, timeout):
+                    if stderr:
+                        errors.append(decoder.decode(data))
+                    else:
+                        local_file.write(data)
+            exit_status = session.recv_exit_status()
+        finally:
+            session.close()
+        errors.append(decoder.decode(b'', final=True))
+        if exit_status != 0:
+            logger.warning('Exit code %d!', exit_status)
+        return SSHResult(rc=exit_status, output=''.join(errors), command=command)
+
+    def stream_command(self, command, timeout=RUNCMD_TIMEOUT, ensure_host=False,
+                       ensure_user=False, container=None, stderr=True):
+        """Run a command over SSH and iterate over the lines of its output as they come.
+
+        Nothing more than the line being read is kept in memory, so this suits commands with
+        large output which can be processed line by line.
+
+        Args:
+            command, ensure_host, ensure_user, container: See :py:meth:`run_command`.
+            timeout: How long the command may go without any output, in seconds.
+            stderr: Whether to include the lines of stderr.
+        Returns:
+            A :py:class:`SSHCommandStream` instance.
+
+        Usage:
+
+            with appliance.ssh_client.stream_command('rpm -qa') as stream:
+                packages = sum(1 for line in stream if line.startswith('rubygem-'))
+            assert stream.rc == 0
+        """
+        session, command = self._open_command(command, ensure_host, ensure_user, container)
+        return SSHCommandStream(
+            command=command, session=session, chunks=self._read_output(session, timeout),
+            stderr=stderr)
 
     def cpu_spike(self, seconds=60, cpus=2, **kwargs):
         """Creates a CPU spike of specific length and processes.
@@ -513,8 +741,36 @@ class SSHClient(paramiko.SSHClient):
             "for ((i=0; i<instances; i++)) do while (($(date +%s) < $endtime)); "
             "do :; done & done".format(seconds, cpus), **kwargs)
 
+    @property
+    def rails_session(self):
+        """The :py:class:`cfme.utils.rails_session.RailsSession` of this client."""
+        if self._rails_session is None:
+            self._rails_session = RailsSession(self)
+        return self._rails_session
+
+    def _run_in_rails_session(self, code, sandbox, timeout):
+        """Evaluate the code in the rails session if it is in use, returns ``None`` otherwise."""
+        if code is None or not self.use_rails_session or self.is_pod or self.is_container:
+            return None
+        try:
+            return self.rails_session.evaluate(code, sandbox=sandbox, timeout=timeout)
+        except RailsSessionStartError as e:
+            logger.warning('Not using the rails session any more: %s', e)
+            self.use_rails_session = False
+            return None
+
     def run_rails_command(self, command, timeout=RUNCMD_TIMEOUT, **kwargs):
+        """Runs Ruby with ``bin/rails runner``. The command is passed to it as a shell argument.
+
+        If the rails session is in use and the command is a plain quoted snippet, it is evaluated
+        in the session instead, with the output and rc ``bin/rails runner`` would give.
+        """
         logger.info("Running rails command %r", command)
+        result = None if kwargs else self._run_in_rails_session(
+            rails_runner_code(command), sandbox=False, timeout=timeout)
+        if result is not None:
+            return SSHResult(command=result.code, rc=0 if result.ok else 1,
+                             output=result.runner_output)
         return self.run_command('cd /var/www/miq/vmdb; bin/rails runner {command}'.format(
             command=command), timeout=timeout, **kwargs)
 
@@ -522,7 +778,15 @@ class SSHClient(paramiko.SSHClient):
         """Runs Ruby inside of rails console. stderr is thrown away right now but could prove useful
         for future performance analysis of the queries rails runs.  The command is encapsulated by
         double quotes. Sandbox rolls back all changes made to the database if used.
+
+        If the rails session is in use, the command is evaluated in the session instead, with the
+        output the console would give. A command that raises fails then.
         """
+        result = self._run_in_rails_session(
+            rails_console_code(command), sandbox=sandbox, timeout=timeout)
+        if result is not None:
+            return SSHResult(command=result.code, rc=0 if result.ok else 1,
+                             output=result.console_output)
         if sandbox:
             return self.run_command('cd /var/www/miq/vmdb; echo \"{}\" '
                 '| bundle exec bin/rails c -s 2> /dev/null'.format(command), timeout=timeout)
@@ -647,39 +911,40 @@ class SSHClient(paramiko.SSHClient):
         diff_remote_path = os_path.join('/tmp/', os_path.basename(remote_path))
         self.put_file(local_path, diff_remote_path)
 
-        # If already patched with current file, exit
+        # One round trip: a successful reverse dry run means it is already patched with the
+        # current file. Otherwise, if we have a .bak file available, it means the file is already
+        # patched by some older patch; in that case, replace the file-to-be-patched by the .bak
+        # first. If there's MD5 checksum available, check it. Then create the backup and patch.
+        commands = [
+            f'! patch {remote_path} {diff_remote_path} -f --dry-run -R',
+            f'if [ -e {remote_path}.bak ]; then mv {remote_path}.bak {remote_path} && '
+            f'echo restored; fi']
+        if md5:
+            commands.append(f'md5sum -c - <<< "{md5} {remote_path}" || true')
+        commands.append(f'patch {remote_path} {diff_remote_path} -f -b -z .bak')
         logger.info('Checking if already patched')
-        result = self.run_command(
-            f'patch {remote_path} {diff_remote_path} -f --dry-run -R')
-        if result.success:
+        results = self.run_commands(commands, stop_on_failure=True)
+        if results[0].failed:
             return False
 
-        # If we have a .bak file available, it means the file is already patched
-        # by some older patch; in that case, replace the file-to-be-patched by the .bak first
-        logger.info("Checking if %s.bak is available", remote_path)
-        result = self.run_command(f'test -e {remote_path}.bak')
-        if result.success:
-            logger.info("%s.bak found; using it to replace %s", remote_path, remote_path)
-            result = self.run_command(f'mv {remote_path}.bak {remote_path}')
-            if result.failed:
+        if len(results) > 1:
+            restore = results[1]
+            if restore.failed:
                 raise Exception(
                     f"Unable to replace {remote_path} with {remote_path}.bak")
-        else:
-            logger.info("%s.bak not found", remote_path)
+            elif 'restored' in restore.output:
+                logger.info("%s.bak found; used it to replace %s", remote_path, remote_path)
+            else:
+                logger.info("%s.bak not found", remote_path)
 
-        # If not patched and there's MD5 checksum available, check it
-        if md5:
-            logger.info("MD5 sum check in progress for %s", remote_path)
-            result = self.run_command(f'md5sum -c - <<< "{md5} {remote_path}"')
-            if result.success:
+        if md5 and len(results) > 2:
+            if results[2].output.rstrip().endswith(': OK'):
                 logger.info('MD5 sum check result: file not changed')
             else:
                 logger.warning('MD5 sum check result: file has been changed!')
 
-        # Create the backup and patch
-        result = self.run_command(
-            f'patch {remote_path} {diff_remote_path} -f -b -z .bak')
-        if result.failed:
+        result = results[-1]
+        if result.command != commands[-1] or result.failed:
             raise Exception(f"Unable to patch file {remote_path}: {result.output}")
         return True
 
@@ -703,14 +968,14 @@ class SSHClient(paramiko.SSHClient):
             force: add -f to rm args
             recursive: add -r to rm args
         """
-        if self.is_file_available(remote_path):
-            opts = []
-            if force:
-                opts.append('-f')
-            if recursive:
-                opts.append('-r')
-            args = ' '.join(opts)
-            self.run_command(f"rm {args} {remote_path}")
+        opts = []
+        if force:
+            opts.append('-f')
+        if recursive:
+            opts.append('-r')
+        args = ' '.join(opts)
+        self.run_commands([f"test -e {remote_path}", f"rm {args} {remote_path}"],
+                          stop_on_failure=True)
 
     def get_build_datetime(self):
         command = "stat --printf=%Y /var/www/miq/vmdb/VERSION"
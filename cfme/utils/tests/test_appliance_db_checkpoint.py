@@ -0,0 +1,84 @@
+from unittest.mock import call
+from unittest.mock import Mock
+
+import pytest
+
+from cfme.utils.appliance.db import ApplianceDB
+from cfme.utils.appliance.db import ApplianceDBException
+
+
+def psql_client(checkpoints):
+    """SSH client mock running psql, the SQL failing if it contains ``client.fail_on``"""
+    client = Mock(checkpoints=list(checkpoints), fail_on=None)
+
+    def run_command(command, timeout=None):
+        sql = command.split(' -c ', 1)[1].strip('"')
+        if client.fail_on and client.fail_on in sql:
+            return Mock(output='ERROR: failed', failed=True)
+        if 'FROM pg_database' in sql:
+            return Mock(output=''.join(f'vmdb_checkpoint_{name}\n' for name in client.checkpoints),
+                        failed=False)
+        return Mock(output='', failed=False)
+
+    client.run_command.side_effect = run_command
+    return client
+
+
+def sql_run(client):
+    return [args[0].split(' -c ', 1)[1].strip('"')
+            for args, _ in client.run_command.call_args_list]
+
+
+@pytest.fixture
+def appliance():
+    return Mock()
+
+
+@pytest.fixture
+def db(appliance, monkeypatch):
+    db = ApplianceDB(appliance)
+    db.ssh = psql_client(checkpoints=['before'])
+    monkeypatch.setattr(ApplianceDB, 'ssh_client', property(lambda self: self.ssh))
+    return db
+
+
+def test_checkpoints(db):
+    assert db.checkpoints == ['before']
+    assert sql_run(db.ssh) == [
+        r"SELECT datname FROM pg_database WHERE datname LIKE 'vmdb\_checkpoint\_%'"]
+
+
+def test_checkpoint(appliance, db):
+    assert db.checkpoint('after') == 'after'
+    assert sql_run(db.ssh)[-1] == 'CREATE DATABASE vmdb_checkpoint_after TEMPLATE vmdb_production'
+    assert "WHERE datname = 'vmdb_production'" in sql_run(db.ssh)[0]
+    assert appliance.mock_calls == [
+        call.evmserverd.stop(), call.evmserverd.start(), call.wait_for_miq_ready()]
+
+
+def test_rollback(appliance, db):
+    db.rollback('before', wait_ready=False)
+    assert sql_run(db.ssh)[-2:] == [
+        'DROP DATABASE vmdb_production',
+        'CREATE DATABASE vmdb_production TEMPLATE vmdb_checkpoint_before']
+    assert appliance.mock_calls == [call.evmserverd.stop(), call.evmserverd.start()]
+
+    with pytest.raises(ApplianceDBException):
+        db.rollback('missing')
+
+
+def test_failed_copy_waits_for_appliance(appliance, db):
+    db.ssh.fail_on = 'CREATE DATABASE'
+    with pytest.raises(ApplianceDBException):
+        db.checkpoint('after')
+    assert appliance.mock_calls == [
+        call.evmserverd.stop(), call.evmserverd.start(), call.wait_for_miq_ready()]
+
+
+def test_checkpointed(db):
+    with db.checkpointed('during'):
+        db.ssh.checkpoints.append('during')
+    assert sql_run(db.ssh)[-3:] == [
+        'DROP DATABASE vmdb_production',
+        'CREATE DATABASE vmdb_production TEMPLATE vmdb_checkpoint_during',
+        'DROP DATABASE IF EXISTS vmdb_checkpoint_during']
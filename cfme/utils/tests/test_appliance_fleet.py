@@ -0,0 +1,50 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from cfme.utils.appliance.fleet import ApplianceFleet
+from cfme.utils.appliance.fleet import FleetException
+from cfme.utils.appliance.fleet import FleetStageFailed
+
+
+def appliance_mock(number, barrier=None):
+    """Appliance whose wait_for_miq_ready returns its number, the one numbered 2 is never ready"""
+    def wait_for_miq_ready(num_sec=900):
+        if barrier is not None:
+            # Only passes when all the appliances are waited for at once
+            barrier.wait(timeout=10)
+        if number == 2:
+            raise ValueError('not ready')
+        return number
+
+    return Mock(number=number, wait_for_miq_ready=Mock(side_effect=wait_for_miq_ready))
+
+
+def test_fleet_runs_concurrently():
+    barrier = threading.Barrier(4)
+    fleet = ApplianceFleet([appliance_mock(n, barrier) for n in (0, 1, 3, 4)], workers=4)
+    assert fleet.wait_for_miq_ready() == [0, 1, 3, 4]
+
+
+def test_fleet_aggregates_failures():
+    fleet = ApplianceFleet([appliance_mock(n) for n in range(4)])
+    results = fleet.map('wait_for_miq_ready', raise_on_error=False)
+    assert results.values == [0, 1, None, 3]
+    assert [result.appliance.number for result in results.failed] == [2]
+
+    with pytest.raises(FleetException) as excinfo:
+        fleet.wait_for_miq_ready()
+    assert len(excinfo.value.results) == 4
+
+
+def test_fleet_stages():
+    order = []
+    fleet = ApplianceFleet([appliance_mock(n) for n in range(5)])
+    fleet.run(lambda app: order.append(app.number), stages=lambda app: app.number != 3)
+    assert order[0] == 3
+
+    results = fleet.map(
+        'wait_for_miq_ready', stages=lambda app: app.number > 2, raise_on_error=False)
+    assert results.values == [0, 1, None, None, None]
+    assert isinstance(results[4].exception, FleetStageFailed)
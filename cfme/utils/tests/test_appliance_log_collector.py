@@ -0,0 +1,64 @@
+import io
+import shutil
+import subprocess
+import tarfile
+from unittest.mock import Mock
+
+import scp
+
+from cfme.test_framework.appliance_log_collector import archive_command
+from cfme.test_framework.appliance_log_collector import copy_logs
+from cfme.test_framework.appliance_log_collector import log_sizes
+
+
+def archived(command):
+    archive = subprocess.run(['bash', '-c', command], stdout=subprocess.PIPE).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as tar:
+        return {member.name: tar.extractfile(member).read().decode()
+                for member in tar.getmembers() if member.isfile()}
+
+
+def test_log_sizes():
+    log_files = ['/var/log/evm.log', '/var/log/production.log', '/var/log/gone.log']
+    app = Mock()
+    app.ssh_client.run_command.return_value = Mock(
+        output='1024 /var/log/evm.log\n0 /var/log/production.log\n12 /var/log/other.log')
+    assert log_sizes(app, log_files) == {'/var/log/evm.log': 1024, '/var/log/production.log': 0}
+    command, = app.ssh_client.run_command.call_args[0]
+    assert command.startswith('stat -c "%s %n" /var/log/evm.log ')
+
+
+def test_archive_command(tmpdir):
+    evm = tmpdir.join('evm.log')
+    evm.write('first\nsecond\n')
+    missing = tmpdir.join('missing.log')
+    assert archived(archive_command('logs', [evm.strpath, missing.strpath])) == {
+        'logs/evm.log': 'first\nsecond\n'}
+
+
+def test_archive_command_offsets(tmpdir):
+    evm = tmpdir.join('evm.log')
+    evm.write('first\nsecond\n')
+    rotated = tmpdir.join('rotated.log')
+    rotated.write('new\n')
+    missing = tmpdir.join('missing.log')
+    offsets = {evm.strpath: len('first\n'), rotated.strpath: 100}
+    assert archived(archive_command(
+        'logs', [evm.strpath, rotated.strpath, missing.strpath], offsets)) == {
+        'logs/evm.log': 'second\n', 'logs/rotated.log': 'new\n'}
+
+
+def test_copy_logs(tmpdir):
+    evm = tmpdir.join('evm.log')
+    evm.write('first\n')
+
+    def get_file(remote_file, local_path):
+        if remote_file != evm.strpath:
+            raise scp.SCPException('No such file or directory')
+        shutil.copy(remote_file, local_path)
+
+    archive = tmpdir.join('logs.tar.gz')
+    copy_logs(Mock(get_file=get_file), 'logs', [evm.strpath, '/missing.log'], archive.strpath)
+    with tarfile.open(archive.strpath) as tar:
+        assert tar.getnames() == ['logs', 'logs/evm.log']
+        assert tar.extractfile('logs/evm.log').read() == b'first\n'
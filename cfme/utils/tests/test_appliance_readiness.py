@@ -0,0 +1,45 @@
+import time
+from unittest.mock import Mock
+from unittest.mock import PropertyMock
+
+import pytest
+
+from cfme.utils.appliance.readiness import ReadinessDetector
+from cfme.utils.wait import TimedOutError
+
+
+def appliance_mock(ui_after, api_after):
+    """Appliance whose UI and API come up ``ui_after`` and ``api_after`` seconds from now"""
+    started = time.time()
+    appliance = Mock()
+    appliance._check_appliance_ui_wait_fn.side_effect = lambda: time.time() - started > ui_after
+
+    def rest_api():
+        if time.time() - started <= api_after:
+            raise ConnectionError('API not up yet')
+        return Mock(server_info={'server_href': 'href'})
+
+    type(appliance).rest_api = PropertyMock(side_effect=rest_api)
+    return appliance
+
+
+def test_readiness_detector_timeline():
+    appliance = appliance_mock(ui_after=1, api_after=2)
+    timeline = ReadinessDetector(appliance, signals=('ui', 'api'), min_delay=0.1).wait(num_sec=30)
+    assert timeline
+    assert 1 <= timeline.signals['ui'] <= timeline.signals['api'] == timeline.ready
+    # backed off instead of probing every 0.1 seconds
+    assert appliance._check_appliance_ui_wait_fn.call_count < 10
+
+
+def test_readiness_detector_times_out():
+    appliance = appliance_mock(ui_after=60, api_after=60)
+    with pytest.raises(TimedOutError):
+        ReadinessDetector(appliance, signals=('ui', 'api'), min_delay=0.1).wait(num_sec=1)
+
+
+def test_readiness_detector_age():
+    detector = ReadinessDetector(Mock())
+    assert detector.age is None
+    detector.started = time.time() - 100
+    assert 100 <= detector.age < 110
@@ -0,0 +1,48 @@
+import pytest
+
+from cfme.utils.charts import Chart
+from cfme.utils.charts import downsample
+from cfme.utils.charts import lttb
+from cfme.utils.charts import render_charts
+
+numpy = pytest.importorskip('numpy')
+
+
+def write_values(path, values, max_points=None):
+    with open(path, 'w') as f:
+        f.write(repr(values))
+
+
+def test_lttb_keeps_peaks():
+    y = numpy.sin(numpy.linspace(0, 20, 10000))
+    y[4321] = 10
+    indices = lttb(numpy.arange(len(y)), y, 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert 4321 in indices
+    assert (numpy.diff(indices) > 0).all()
+    assert len(lttb(range(10), range(10), 100)) == 10
+
+
+def test_downsample_shares_x():
+    x = [f'label {i}' for i in range(1000)]
+    lines = {'up': list(range(1000)), 'peak': [0] * 1000}
+    lines['peak'][500] = 1
+    new_x, new_lines = downsample(x, lines, 50)
+    assert 50 <= len(new_x) <= 100
+    assert len(new_lines['up']) == len(new_lines['peak']) == len(new_x)
+    assert 'label 500' in new_x
+    assert downsample(x, lines, None) == (x, lines)
+
+
+def test_render_charts_skips_unchanged(tmpdir):
+    cache_file = tmpdir.join('cache.json')
+    charts = [Chart(write_values, tmpdir.join(f'{i}.txt'), values=[i]) for i in range(3)]
+    assert len(render_charts(charts, cache_file=cache_file, workers=2)) == 3
+    assert tmpdir.join('1.txt').read() == '[1]'
+
+    charts[1] = Chart(write_values, tmpdir.join('1.txt'), values=[1, 2])
+    tmpdir.join('2.txt').remove()
+    assert render_charts(charts, cache_file=cache_file, workers=2) == [
+        str(tmpdir.join('1.txt')), str(tmpdir.join('2.txt'))]
+    assert render_charts(charts, cache_file=cache_file) == []
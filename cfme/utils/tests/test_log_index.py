@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from cfme.utils.appliance import DummyAppliance
+from cfme.utils.log_index import LogIndex
+from cfme.utils.log_index import parse_timestamp
+pytestmark = [
+    pytest.mark.non_destructive,
+]
+
+LOG = '/tmp/test_log_index.log'
+
+LINES = [
+    '[----] I, [2020-03-10T10:00:01.000001 #1:a]  INFO -- : MIQ(MiqServer#start) Starting',
+    '[----] E, [2020-03-10T10:00:31.000001 #1:a] ERROR -- : MIQ(MiqQueue.put) Failed',
+    '  backtrace line',
+    '[----] I, [2020-03-10T10:01:05.000001 #1:a]  INFO -- : MIQ(MiqQueue.put) Put',
+    '[----] W, [2020-03-10T10:02:10.000001 #1:a]  WARN -- : MIQ(MiqServer#stop) Stopping',
+]
+
+
+def test_parse_timestamp():
+    assert parse_timestamp(LINES[0]) == datetime(2020, 3, 10, 10, 0, 1, 1)
+    assert parse_timestamp(LINES[2]) is None
+
+
+@pytest.fixture
+def log_index(appliance):
+    if isinstance(appliance, DummyAppliance):
+        pytest.skip('Dummy appliance not supported')
+    appliance.ssh_client.run_command('printf "%s\\n" {} > {}'.format(
+        ' '.join(f"'{line}'" for line in LINES[:3]), LOG))
+    index = LogIndex(appliance.ssh_client, LOG)
+    yield index
+    appliance.ssh_client.run_command(f'rm -f {LOG} {index.index_path}')
+
+
+def test_log_index_incremental(appliance, log_index):
+    summary = log_index.update()
+    assert summary.levels == {'I': 1, 'E': 1}
+    assert summary.first == summary.last == datetime(2020, 3, 10, 10, 0)
+
+    appliance.ssh_client.run_command('printf "%s\\n" {} >> {}'.format(
+        ' '.join(f"'{line}'" for line in LINES[3:]), LOG))
+    summary = log_index.update()
+    assert summary.levels == {'I': 2, 'E': 1, 'W': 1}
+    assert summary.classes == {'MiqServer': 2, 'MiqQueue': 2}
+    assert summary.last == datetime(2020, 3, 10, 10, 2)
+
+
+def test_log_index_search(log_index):
+    assert log_index.search(
+        since=datetime(2020, 3, 10, 10, 0, 30), until=datetime(2020, 3, 10, 10, 1)) == LINES[1:3]
+    assert log_index.search('Failed|Put') == [LINES[1]]
+    assert log_index.last_timestamp('MiqServer', invert=True) == datetime(
+        2020, 3, 10, 10, 0, 31, 1)
@@ -0,0 +1,27 @@
+from cfme.utils.result_history import ResultHistory
+
+
+def test_result_history_statuses(tmpdir):
+    history = ResultHistory(tmpdir.join('results.db'))
+    history.update('5.11.0.1', 'jenkins', {
+        'cfme/tests/test_a.py/test_a': {'statuses': {'overall': 'passed'}},
+        'cfme/tests/test_a.py/test_b': {'statuses': {'overall': 'failed'}},
+    }, synced_ts=100)
+    # newer results replace the older ones
+    history.update('5.11.0.1', 'jenkins', {
+        'cfme/tests/test_a.py/test_b': {'statuses': {'overall': 'passed'}},
+    }, synced_ts=200)
+    history.update('5.11.0.2', 'jenkins', {
+        'cfme/tests/test_a.py/test_c': {'statuses': {'overall': 'passed'}},
+    })
+
+    assert history.last_sync('5.11.0.1', 'jenkins') == 200
+    assert history.last_sync('5.11.0.2', 'jenkins') is None
+    assert history.statuses('5.11.0.1', 'jenkins', [
+        'cfme/tests/test_a.py/test_a',
+        'cfme/tests/test_a.py/test_b',
+        'cfme/tests/test_a.py/test_c',
+    ]) == {
+        'cfme/tests/test_a.py/test_a': 'passed',
+        'cfme/tests/test_a.py/test_b': 'passed',
+    }
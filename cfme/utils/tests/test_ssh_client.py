@@ -1,6 +1,7 @@
 import pytest
 
 from cfme.utils.appliance import DummyAppliance
+
 pytestmark = [
     pytest.mark.non_destructive,
 ]
@@ -31,3 +32,52 @@ def test_scp_client_can_put_a_file(appliance, tmpdir):
     assert "content" in tmpfile.read()
     # Clean up the server
     appliance.ssh_client.run_command(f"rm -f /tmp/{tmpfile.basename}")
+
+
+def test_ssh_client_stream_command(appliance):
+    with appliance.ssh_client.stream_command('seq 3; echo Testing! >&2', stderr=False) as stream:
+        lines = list(stream)
+    assert lines == ['1\n', '2\n', '3\n']
+    assert stream.rc == 0
+
+
+def test_ssh_client_spools_output(appliance):
+    result = appliance.ssh_client.run_command('seq 100000', spool=1024)
+    assert result.success
+    assert result.output.endswith('99999\n100000\n')
+    assert sum(1 for line in result.iter_lines()) == 100000
+
+
+def test_ssh_client_run_commands(appliance):
+    results = appliance.ssh_client.run_commands(['echo one', 'echo two; false', 'echo three'])
+    assert [result.output for result in results] == ['one\n', 'two\n', 'three\n']
+    assert [result.rc for result in results] == [0, 1, 0]
+
+    results = appliance.ssh_client.run_commands(
+        ['echo one', 'exit 3', 'echo three'], stop_on_failure=True)
+    assert [result.rc for result in results] == [0, 3]
+
+
+def test_rails_session_evaluates_snippets(appliance):
+    session = appliance.ssh_client.rails_session
+    result = session.evaluate('puts "Testing!"; 40 + 2')
+    assert result.ok
+    assert result.value == '42'
+    assert result.output == 'Testing!\n'
+
+    result = session.evaluate('raise ArgumentError, "Testing!"')
+    assert not result.ok
+    assert result.error['class'] == 'ArgumentError'
+    assert result.error['message'] == 'Testing!'
+
+
+def test_rails_session_sandbox_rolls_back(appliance):
+    session = appliance.ssh_client.rails_session
+    count = session.evaluate('Tenant.count').value
+    result = session.evaluate(
+        'Tenant.create!(:name => "rails session", :parent => Tenant.root_tenant); Tenant.count',
+        sandbox=True)
+    assert result.ok
+    assert int(result.value) == int(count) + 1
+    assert session.evaluate('Tenant.count').value == count
+
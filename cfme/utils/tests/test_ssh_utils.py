@@ -0,0 +1,16 @@
+import pytest
+
+from cfme.utils.ssh import rails_runner_code
+
+
+@pytest.mark.parametrize('command, code', [
+    ('"puts 1"', 'puts 1'),
+    ("'puts $stdout.class'", 'puts $stdout.class'),
+    ('"puts \\"a\\""', 'puts "a"'),
+    ('"puts $HOME"', None),
+    ('"puts 1" 2>&1', None),
+    ('puts 1', None),
+    ('coverage_merger.rb', None),
+])
+def test_rails_runner_code(command, code):
+    assert rails_runner_code(command) == code
@@ -0,0 +1,56 @@
+from unittest.mock import Mock
+
+from cfme.utils import trackerbot
+from cfme.utils.trackerbot import TrackerbotMirror
+
+
+def resource_mock(objects):
+    """Trackerbot API resource, getting copies of the objects in one page"""
+    return Mock(
+        get=Mock(side_effect=lambda **kwargs: {
+            'meta': {'next': None}, 'objects': [dict(obj) for obj in objects]}),
+        post=Mock(side_effect=lambda data: data))
+
+
+def api_mock():
+    provider = {'key': 'rhv', 'type': 'rhevm', 'active': True}
+    template = {'name': 'cfme-1', 'providers': ['rhv'], 'group': {'name': 'upstream'}}
+    return Mock(
+        group=resource_mock([{'name': 'upstream'}]),
+        provider=resource_mock([provider]),
+        template=resource_mock([template]),
+        providertemplate=resource_mock([
+            {'id': 'cfme-1_rhv', 'provider': provider, 'template': template, 'tested': False}]))
+
+
+def test_mirror_refresh():
+    api = api_mock()
+    mirror = TrackerbotMirror(api)
+    assert list(mirror.objects('template')) == ['cfme-1']
+    mirror.objects('template')
+    assert api.template.get.call_count == 1
+
+    mirror.ttl = 0
+    mirror.objects('template')
+    assert api.template.get.call_count == 2
+
+    mirror.refresh()
+    assert api.template.get.call_count == 3
+    for resource in (api.provider, api.group, api.providertemplate):
+        assert resource.get.call_count == 1
+
+
+def test_mirror_write_through():
+    api = api_mock()
+    mirror = TrackerbotMirror(api)
+
+    trackerbot.mark_provider_template(mirror, 'rhv', 'cfme-1', tested=True)
+    assert mirror.objects('providertemplate')['cfme-1_rhv']['tested'] is True
+    assert trackerbot.templates_to_test(mirror) == []
+
+    assert trackerbot.add_provider_template('upstream', 'rhv', 'cfme-2', tb_api=mirror) is True
+    assert 'cfme-2_rhv' in mirror.objects('providertemplate')
+    # already in the mirror, not posted again
+    assert trackerbot.add_provider_template('upstream', 'rhv', 'cfme-2', tb_api=mirror) is None
+    assert api.providertemplate.post.call_count == 2
+    assert api.providertemplate.get.call_count == 1
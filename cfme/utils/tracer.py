@@ -7,11 +7,24 @@ from utils.tracer import trace::
   def func():
       print("something")
 
+The tracer slows the traced code down considerably. To find out where time goes in a whole
+test, use the :py:class:`SamplingProfiler` instead, usually through the
+:py:mod:`cfme.fixtures.sampling_profiler` plugin::
+
+  profiler = SamplingProfiler()
+  profiler.start()
+  # do something
+  profiler.stop()
+  print(profiler.collapsed())
+
 """
 import sys
+import threading
+from collections import Counter
 from functools import wraps
 
 from cfme.utils.log import logger
+from cfme.utils.path import get_rel_path
 
 
 class FileStore:
@@ -106,3 +119,72 @@ def trace(scope=1, file_name_limit=None):
             return result
         return _f
     return wrap
+
+
+class SamplingProfiler:
+    """Low-overhead statistical profiler for a single thread
+
+    A background thread wakes up every ``interval`` seconds, captures the current stack of the
+    profiled thread and counts identical stacks. Since the profiled code is never instrumented,
+    the overhead is governed by the interval alone, around 1% at the default 10ms.
+
+    Args:
+        thread_id: ident of the thread to profile, defaults to the calling thread
+        interval: seconds between samples
+    """
+    def __init__(self, thread_id=None, interval=0.01):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._labels = {}
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _sample(self):
+        current_frames = sys._current_frames
+        while not self._stopped.wait(self.interval):
+            frame = current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                # code objects are cheap to hash, labels are only built once per code object
+                self.samples[tuple(stack)] += 1
+
+    def _label(self, code):
+        try:
+            return self._labels[code]
+        except KeyError:
+            label = self._labels[code] = '{}:{}'.format(
+                get_rel_path(code.co_filename), code.co_name)
+            return label
+
+    def collapsed(self):
+        """Return the samples as collapsed stacks, one ``frame;frame;frame count`` per line
+
+        This is the input format of ``flamegraph.pl`` and speedscope, outermost frame first.
+        """
+        lines = []
+        for stack, count in self.samples.most_common():
+            frames = ';'.join(self._label(code).replace(';', ':') for code in reversed(stack))
+            lines.append(f'{frames} {count}')
+        return '\n'.join(lines)
@@ -2,6 +2,7 @@ import argparse
 import json
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import parse_qs
 from urllib.parse import urlparse
 
@@ -16,6 +17,9 @@ session = requests.Session()
 conf = env.get('trackerbot', {})
 _active_streams = None
 
+#: Number of pages of a paginated result fetched at the same time
+DEPAGINATE_WORKERS = 8
+
 
 def cmdline_parser():
     """Get a parser with basic trackerbot configuration params already set up
@@ -46,6 +50,87 @@ def api(trackerbot_url=None):
     return slumber.API(trackerbot_url, session=session)
 
 
+class TrackerbotMirror:
+    """Local copy of the trackerbot group, provider, template and providertemplate tables
+
+    Can be passed to the helpers in this module instead of the API object, they then answer from
+    the copy. Everything else is passed through to the API. Each table is fetched on first use
+    and again when it gets older than ``ttl`` seconds, providertemplates changed through
+    :py:func:`mark_provider_template`, :py:func:`add_provider_template` and
+    :py:func:`delete_provider_template` are written through to the copy.
+
+    .. code-block:: python
+
+        tb_api = TrackerbotMirror(api())
+        for provider_key in provider_keys:
+            latest_template(tb_api, stream, provider_key)
+
+    Args:
+        api: The trackerbot API to mirror
+        ttl: Seconds after which a table is fetched again
+    """
+    #: table name -> field with the primary key of the table
+    TABLES = {
+        'group': 'name',
+        'provider': 'key',
+        'template': 'name',
+        'providertemplate': 'id',
+    }
+
+    def __init__(self, api, ttl=300):
+        self.api = api
+        self.ttl = ttl
+        self._tables = {}
+        self._fetched = {}
+
+    def __getattr__(self, attr):
+        return getattr(self.api, attr)
+
+    def refresh(self, *tables):
+        """Fetch the tables (all by default) again, all at the same time"""
+        tables = tables or tuple(self.TABLES)
+
+        def _fetch(table):
+            return depaginate(self.api, getattr(self.api, table).get())['objects']
+
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            for table, objects in zip(tables, executor.map(_fetch, tables)):
+                pk = self.TABLES[table]
+                self._tables[table] = {obj[pk]: obj for obj in objects}
+                self._fetched[table] = time.time()
+                logger.info('Mirrored %d trackerbot %s records', len(objects), table)
+
+    def objects(self, table):
+        """Returns mapping of the primary keys of the table to its records"""
+        if time.time() - self._fetched.get(table, 0) > self.ttl:
+            self.refresh(table)
+        return self._tables[table]
+
+    def record_providertemplate(self, provider_template):
+        """Write a providertemplate posted to the API through to the mirror"""
+        provider_key = provider_template['provider']['key']
+        template_name = provider_template['template']['name']
+        providertemplates = self.objects('providertemplate')
+        record = providertemplates.setdefault(provider_template.concat_id, {
+            'id': provider_template.concat_id,
+            'provider': self.objects('provider').get(provider_key, provider_template['provider']),
+            'template': self.objects('template').get(template_name, provider_template['template']),
+        })
+        record.update(
+            (k, v) for k, v in provider_template.items() if k not in ('provider', 'template'))
+        template = self.objects('template').get(template_name)
+        if template is not None and provider_key not in template.get('providers', []):
+            template.setdefault('providers', []).append(provider_key)
+
+    def forget_providertemplate(self, provider_template):
+        """Write a providertemplate deleted in the API through to the mirror"""
+        self.objects('providertemplate').pop(provider_template.concat_id, None)
+        template = self.objects('template').get(provider_template['template']['name'])
+        if template is not None and provider_template['provider']['key'] in template.get(
+                'providers', []):
+            template['providers'].remove(provider_template['provider']['key'])
+
+
 def active_streams(api, force=False):
     global _active_streams
     if _active_streams is None or force:
@@ -55,7 +140,11 @@ def active_streams(api, force=False):
 
 def provider_templates(api):
     provider_templates = defaultdict(list)
-    for template in depaginate(api, api.template.get())['objects']:
+    if isinstance(api, TrackerbotMirror):
+        templates = api.objects('template').values()
+    else:
+        templates = depaginate(api, api.template.get())['objects']
+    for template in templates:
         for provider in template['providers']:
             provider_templates[provider].append(template['name'])
     return provider_templates
@@ -91,7 +180,10 @@ def mark_provider_template(api, provider, template, tested=None, usable=None,
     if build_number:
         provider_template['build_number'] = int(build_number)
 
-    return api.providertemplate.post(provider_template)
+    result = api.providertemplate.post(provider_template)
+    if isinstance(api, TrackerbotMirror):
+        api.record_providertemplate(provider_template)
+    return result
 
 
 def delete_provider_template(api, provider, template):
@@ -104,6 +196,8 @@ def delete_provider_template(api, provider, template):
         result = False
     if result:
         logger.info('Deleted providertemplate %s::%s', provider, template)
+        if isinstance(api, TrackerbotMirror):
+            api.forget_providertemplate(provider_template)
     else:
         logger.error('Delete call returned false for providertemplate %s::%s', provider, template)
     return result
@@ -124,6 +218,20 @@ def latest_template(api, group, provider_key=None):
     if not isinstance(group, Group):
         group = Group(str(group))
 
+    if isinstance(api, TrackerbotMirror):
+        # The list records carry the same computed fields as the details
+        if provider_key is None:
+            response = api.objects('group').get(group['name'], {})
+            if 'latest_template' in response:
+                return {
+                    'latest_template': response['latest_template'],
+                    'latest_template_providers': response['latest_template_providers'],
+                }
+        else:
+            response = api.objects('provider').get(provider_key, {})
+            if 'latest_templates' in response:
+                return response['latest_templates'][group['name']]
+
     if provider_key is None:
         # Just get the latest template for a given group, as well as its providers
         response = api.group(group['name']).get()
@@ -149,9 +257,15 @@ def templates_to_test(api, limit=1, request_type=None):
 
     """
     templates = []
-    for pt in api.untestedtemplate.get(
-            limit=limit, tested=False, provider__type=request_type).get(
-            'objects', []):
+    if isinstance(api, TrackerbotMirror):
+        untested = [
+            pt for pt in api.objects('providertemplate').values()
+            if not pt.get('tested') and pt['provider'].get('active', True) and
+            (request_type is None or pt['provider']['type'] == request_type)][:limit]
+    else:
+        untested = api.untestedtemplate.get(
+            limit=limit, tested=False, provider__type=request_type).get('objects', [])
+    for pt in untested:
         name = pt['template']['name']
         group = pt['template']['group']['name']
         provider = pt['provider']['key']
@@ -164,8 +278,14 @@ def get_tested_providers(api, template_name):
     """
     Return all tested provider templates for given template_name
     """
-    response = api.providertemplate.get(tested=True, template=template_name, limit=200)
-    providers = [pt['provider'] for pt in response.get('objects', []) if pt['provider']['active']]
+    if isinstance(api, TrackerbotMirror):
+        tested = [
+            pt for pt in api.objects('providertemplate').values()
+            if pt.get('tested') and pt['template']['name'] == template_name]
+    else:
+        tested = api.providertemplate.get(
+            tested=True, template=template_name, limit=200).get('objects', [])
+    providers = [pt['provider'] for pt in tested if pt['provider']['active']]
     return providers
 
 
@@ -244,7 +364,8 @@ def post_jenkins_result(job_name, number, stream, date, template, build_status,
         print(exc.content)
 
 
-def add_provider_template(stream, provider, template_name, custom_data=None, mark_kwargs=None):
+def add_provider_template(stream, provider, template_name, custom_data=None, mark_kwargs=None,
+                          tb_api=None):
     """Checking existing providertemplates first, call mark_provider_template to add records
 
     Args:
@@ -253,18 +374,23 @@ def add_provider_template(stream, provider, template_name, custom_data=None, mar
         template_name (str): name of the template to track on provider
         custom_data (dict): JSON serializable custom data dict
         mark_kwargs (dict): Passed to mark_provider_template to allow for additional kwargs
+        tb_api: The trackerbot API or :py:class:`TrackerbotMirror` to use, new API by default
     Returns:
         None on no action (already tracked)
         True on adding
         False on error
     """
-    tb_api = api()
+    tb_api = tb_api or api()
     try:
-        existing_provider_templates = [
-            pt['id']
-            for pt in depaginate(
-                tb_api,
-                tb_api.providertemplate.get(provider=provider, template=template_name))['objects']]
+        if isinstance(tb_api, TrackerbotMirror):
+            existing_provider_templates = tb_api.objects('providertemplate')
+        else:
+            existing_provider_templates = [
+                pt['id']
+                for pt in depaginate(
+                    tb_api,
+                    tb_api.providertemplate.get(
+                        provider=provider, template=template_name))['objects']]
         if f'{template_name}_{provider}' in existing_provider_templates:
             return None
         else:
@@ -289,16 +415,32 @@ def depaginate(api, result):
     # while we pull more records
     ret_meta = meta.copy()
     ret_objects = result['objects']
-    while meta['next']:
-        # parse out url bits for constructing the new api req
-        next_url = urlparse(meta['next'])
-        # ugh...need to find the word after 'api/' in the next URL to
-        # get the resource endpoint name; not sure how to make this better
-        next_endpoint = next_url.path.strip('/').split('/')[-1]
-        next_params = {k: v[0] for k, v in parse_qs(next_url.query).items()}
-        result = getattr(api, next_endpoint).get(**next_params)
-        ret_objects.extend(result['objects'])
-        meta = result['meta']
+    # parse out url bits for constructing the new api reqs
+    next_url = urlparse(meta['next'])
+    # ugh...need to find the word after 'api/' in the next URL to
+    # get the resource endpoint name; not sure how to make this better
+    next_endpoint = getattr(api, next_url.path.strip('/').split('/')[-1])
+    next_params = {k: v[0] for k, v in parse_qs(next_url.query).items()}
+
+    if meta.get('limit') and meta.get('total_count') is not None:
+        # All the page offsets are known up front, fetch the pages at the same time
+        def _fetch_page(offset):
+            return next_endpoint.get(**dict(next_params, offset=offset))['objects']
+
+        offsets = range(
+            int(meta.get('offset') or 0) + int(meta['limit']),
+            int(meta['total_count']),
+            int(meta['limit']))
+        with ThreadPoolExecutor(max_workers=DEPAGINATE_WORKERS) as executor:
+            for objects in executor.map(_fetch_page, offsets):
+                ret_objects.extend(objects)
+    else:
+        while meta['next']:
+            next_url = urlparse(meta['next'])
+            next_params = {k: v[0] for k, v in parse_qs(next_url.query).items()}
+            result = next_endpoint.get(**next_params)
+            ret_objects.extend(result['objects'])
+            meta = result['meta']
 
     # fix meta up to not tell lies
     ret_meta['total_count'] = len(ret_objects)
@@ -310,19 +452,28 @@ def depaginate(api, result):
     }
 
 
-def composite_uncollect(build, source='jenkins', limit_ts=None):
-    """Composite build function"""
+def composite_results(build, source='jenkins', limit_ts=None):
+    """Fetch the composite results of the build from ostriz, raising on any failure
+
+    Only results newer than ``limit_ts`` are returned when it is set.
+    """
     since = env.get('ts', time.time())
     params = {"build": build, "source": source, "since": since}
     if limit_ts:
         params['limit_ts'] = limit_ts
+    resp = session.get(
+        conf['ostriz'],
+        params=params,
+        timeout=(6, 60)  # 6s connect, 60s read
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def composite_uncollect(build, source='jenkins', limit_ts=None):
+    """Composite build function"""
     try:
-        resp = session.get(
-            conf['ostriz'],
-            params=params,
-            timeout=(6, 60)  # 6s connect, 60s read
-        )
-        return resp.json()
+        return composite_results(build, source, limit_ts)
     except Exception:
         logger.exception('Composite Uncollect hit an exception making request')
         return {'tests': []}
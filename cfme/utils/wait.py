@@ -6,6 +6,14 @@ from wait_for import wait_for as wait_for_mod
 from wait_for import wait_for_decorator as wait_for_decorator_mod
 
 from cfme.utils.log import logger
+from cfme.utils.log import perflog
+
+
+def wait_for(*args, **kwargs):
+    """:py:func:`wait_for.wait_for` logging to the cfme logger, timed as a ``wait_for`` span"""
+    kwargs.setdefault('logger', logger)
+    with perflog.span('wait_for', message=kwargs.get('message')):
+        return wait_for_mod(*args, **kwargs)
+
 
-wait_for = partial(wait_for_mod, logger=logger)
 wait_for_decorator = partial(wait_for_decorator_mod, logger=logger)
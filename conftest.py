@@ -47,6 +47,7 @@ pytest_plugins = [
     "cfme.fixtures.cfme_data",
     "cfme.fixtures.cli",
     "cfme.fixtures.datafile",
+    "cfme.fixtures.db_checkpoint",
     "cfme.fixtures.depot",
     "cfme.fixtures.dev_branch",
     "cfme.fixtures.disable_forgery_protection",
@@ -75,6 +76,7 @@ pytest_plugins = [
     "cfme.fixtures.randomness",
     "cfme.fixtures.rbac",
     "cfme.fixtures.rdb",
+    "cfme.fixtures.sampling_profiler",
     "cfme.fixtures.sauce",
     "cfme.fixtures.screenshots",
     "cfme.fixtures.service_fixtures",
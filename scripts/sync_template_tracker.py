@@ -61,6 +61,8 @@ def parse_cmdline():
 
 def main(trackerbot_url, mark_usable=None, selected_provider=None, **kwargs):
     tb_api = trackerbot.api(trackerbot_url)
+    # the add and delete calls check and update this copy instead of querying trackerbot each
+    tb_mirror = trackerbot.TrackerbotMirror(tb_api)
 
     all_providers = set(
         selected_provider
@@ -114,6 +116,9 @@ def main(trackerbot_url, mark_usable=None, selected_provider=None, **kwargs):
     tb_pts_to_delete = list()
     tb_templates_to_delete = list()
 
+    # fetched once here, rather than by each of the threads below on first use
+    tb_mirror.refresh()
+
     # ADD PROVIDERTEMPLATES
     # add all parseable providertemplates from what is actually on providers
     for template_name, provider_keys in mgmt_providertemplates.items():
@@ -134,7 +139,8 @@ def main(trackerbot_url, mark_usable=None, selected_provider=None, **kwargs):
              provider_key,
              template_name,
              None,  # custom_data
-             usable)
+             usable,
+             tb_mirror)
             for provider_key in provider_keys
         ]
 
@@ -174,7 +180,7 @@ def main(trackerbot_url, mark_usable=None, selected_provider=None, **kwargs):
         # thread for each delete_provider_template call
         pool.starmap(
             trackerbot.delete_provider_template,
-            ((tb_api, pt.provider_key, pt.template_name) for pt in tb_pts_to_delete))
+            ((tb_mirror, pt.provider_key, pt.template_name) for pt in tb_pts_to_delete))
 
     # REMOVE TEMPLATES
     # Remove templates that aren't on any providers anymore
@@ -1,6 +1,8 @@
+import hashlib
 import inspect
 import json
 import re
+import time
 from celery import chain
 from celery.result import AsyncResult
 from datetime import datetime
@@ -16,8 +18,14 @@ from appliances.tasks.provisioning import (appliance_rename, mark_appliance_read
                                            wait_appliance_ready)
 from appliances.tasks.service_ops import (appliance_power_on, disconnect_direct_lun,
                                         appliance_power_off, appliance_suspend, connect_direct_lun)
+from sprout import redis
 from sprout.log import create_logger
 
+#: Longest time a ``wait_pool_change`` call is allowed to block
+POOL_WAIT_MAX = 60
+#: The pool is checked at least this often while waiting, in case a notification was missed
+POOL_WAIT_RECHECK = 10
+
 
 def json_response(data):
     return HttpResponse(json.dumps(data), content_type="application/json")
@@ -242,9 +250,7 @@ def request_appliances(
         ram, cpu, provider_type, template_type).id
 
 
-@jsonapi.authenticated_method
-def request_check(user, request_id):
-    """Return status of the appliance pool"""
+def pool_status(user, request_id):
     request = AppliancePool.objects.get(id=request_id)
     if user != request.owner and not user.is_staff:
         raise Exception("This pool belongs to a different user!")
@@ -262,6 +268,34 @@ def request_check(user, request_id):
     }
 
 
+@jsonapi.authenticated_method
+def request_check(user, request_id):
+    """Return status of the appliance pool"""
+    return pool_status(user, request_id)
+
+
+@jsonapi.authenticated_method
+def wait_pool_change(user, request_id, state=None, timeout=30):
+    """Wait until status of the appliance pool changes, then return it.
+
+    Returns the same status as ``request_check``, plus ``state`` identifying it. The call blocks
+    while the status is the one identified by ``state`` and the pool is not finished, for at most
+    ``timeout`` seconds (capped at 60). Pass ``state`` of the previous result to wait for the next
+    change, without ``state`` the call returns immediately.
+    """
+    deadline = time.time() + min(float(timeout), POOL_WAIT_MAX)
+    # Subscribe before checking, so a change between the check and the wait is not missed
+    with redis.subscription(AppliancePool.change_channel(request_id)) as subscription:
+        while True:
+            status = pool_status(user, request_id)
+            status["state"] = hashlib.sha1(
+                json.dumps(status, sort_keys=True).encode("utf-8")).hexdigest()
+            remaining = deadline - time.time()
+            if status["state"] != state or status["finished"] or remaining <= 0:
+                return status
+            subscription.get_message(timeout=min(remaining, POOL_WAIT_RECHECK))
+
+
 @jsonapi.authenticated_method
 def prolong_appliance_lease(user, id, minutes=60):
     """Prolongs the appliance's lease time by specified amount of minutes from current time."""
@@ -15,7 +15,7 @@ from django.contrib.auth.models import User, Group as DjangoGroup
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
 from django.db.models import Q
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.postgres.fields import JSONField
@@ -1595,6 +1595,29 @@ class AppliancePool(MetadataMixin):
         return "AppliancePool id: {}, group: {}, total_count: {}".format(
             self.id, self.group.id, self.total_count)
 
+    @staticmethod
+    def change_channel(pool_id):
+        """Redis channel notified whenever the pool or one of its appliances is saved."""
+        return "appliance-pool-changed-{}".format(pool_id)
+
+
+def notify_pool_change(pool_id):
+    # Only once the transaction commits, the waiters would not see the change before
+    transaction.on_commit(lambda: redis.notify(AppliancePool.change_channel(pool_id)))
+
+
+@receiver(post_save, sender=AppliancePool)
+@receiver(post_delete, sender=AppliancePool)
+def pool_changed(sender, instance, **kwargs):
+    notify_pool_change(instance.id)
+
+
+@receiver(post_save, sender=Appliance)
+@receiver(post_delete, sender=Appliance)
+def pool_appliance_changed(sender, instance, **kwargs):
+    if instance.appliance_pool_id is not None:
+        notify_pool_change(instance.appliance_pool_id)
+
 
 class MismatchVersionMailer(models.Model):
     provider = models.ForeignKey(Provider, on_delete=models.CASCADE)
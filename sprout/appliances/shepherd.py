@@ -0,0 +1,177 @@
+"""Planning for the appliance shepherd.
+
+For each :py:class:`appliances.models.GroupShepherd`, the shepherd keeps the requested number of
+appliances of the latest template spun up and kills the appliances of the older templates.
+:py:class:`ShepherdPlan` loads the state of all the group shepherds in a few aggregated queries
+and works out what to provision and what to kill for all of them at once.
+
+Whether a template exists in its provider is not asked from the provider here, the ``exists``
+flag of the template kept up to date by the template checking task is used.
+"""
+from collections import defaultdict
+
+from django.db.models import Count
+from django.utils import timezone
+
+from appliances.models import Appliance, GroupShepherd, Provider, Template
+from cfme.utils.version import Version
+
+
+class ShepherdPlan(object):
+    """Actions the shepherd needs to take for the preconfigured or the unconfigured appliances.
+
+    Attributes:
+        provision: List of ``(group shepherd, template id)`` to provision a new appliance from.
+            At most one appliance per group shepherd, so the providers stay balanced.
+        kill: Dictionary of appliance id to ``(appliance name, reason)``.
+    """
+    def __init__(self, preconfigured):
+        self.preconfigured = preconfigured
+        self.provision = []
+        self.kill = {}
+        self.load()
+        for gs in sorted(self.shepherds, key=self.fulfillment_percentage):
+            self.plan(gs)
+
+    def load(self):
+        self.shepherds = list(GroupShepherd.objects.select_related('template_group', 'user_group'))
+        template_groups = {gs.template_group_id for gs in self.shepherds}
+        self.providers = {provider.id: provider for provider in Provider.objects.all()}
+        self.provider_user_groups = defaultdict(set)
+        for provider_id, group_id in Provider.user_groups.through.objects.values_list(
+                'provider_id', 'group_id'):
+            self.provider_user_groups[provider_id].add(group_id)
+        self.provisioning = defaultdict(int, Appliance.objects
+            .filter(ready=False, marked_for_deletion=False, ip_address=None)
+            .values_list('template__provider').annotate(Count('id')).order_by())
+        self.managing = defaultdict(int, Appliance.objects
+            .values_list('template__provider').annotate(Count('id')).order_by())
+
+        self.templates = defaultdict(list)
+        for template in Template.objects.filter(
+                template_group__in=template_groups, preconfigured=self.preconfigured).values(
+                    'id', 'template_group_id', 'provider_id', 'version', 'date', 'ready',
+                    'usable', 'exists'):
+            self.templates[template['template_group_id']].append(template)
+        self.appliances = defaultdict(list)
+        for appliance in Appliance.objects.filter(
+                appliance_pool=None, marked_for_deletion=False,
+                template__template_group__in=template_groups,
+                template__preconfigured=self.preconfigured).values(
+                    'id', 'name', 'template_id', 'status_changed'):
+            self.appliances[appliance['template_id']].append(appliance)
+
+    def pool_size(self, gs):
+        return gs.template_pool_size if self.preconfigured else gs.unconfigured_template_pool_size
+
+    def group_templates(self, gs):
+        """Templates of the group shepherd's template group on the providers of its user group."""
+        return [
+            template for template in self.templates[gs.template_group_id]
+            if gs.user_group_id in self.provider_user_groups[template['provider_id']]]
+
+    def fulfillment_percentage(self, gs):
+        """Same as :py:meth:`appliances.models.GroupShepherd.get_fulfillment_percentage`"""
+        pool_size = self.pool_size(gs)
+        if pool_size == 0:
+            return 100
+        appliances = sum(
+            len(self.appliances[template['id']]) for template in self.group_templates(gs))
+        return int(round((float(appliances) / float(pool_size)) * 100.0))
+
+    def remaining_provisioning_slots(self, provider):
+        """Same as :py:attr:`appliances.models.Provider.remaining_provisioning_slots`"""
+        result = max(
+            provider.num_simultaneous_provisioning - self.provisioning[provider.id], 0)
+        if provider.appliance_limit is None:
+            return result
+        return min(max(provider.appliance_limit - self.managing[provider.id], 0), result)
+
+    def appliance_load(self, provider):
+        """Same as :py:attr:`appliances.models.Provider.appliance_load`"""
+        if not provider.appliance_limit:
+            return 0.0
+        return float(self.managing[provider.id]) / float(provider.appliance_limit)
+
+    def plan_kill(self, appliance, reason):
+        self.kill[appliance['id']] = (appliance['name'], reason)
+        self.appliances[appliance['template_id']].remove(appliance)
+
+    def plan(self, gs):
+        templates = [
+            template for template in self.group_templates(gs)
+            if template['ready'] and template['usable']]
+        versions = sorted(
+            {template['version'] for template in templates if template['version'] is not None},
+            key=Version, reverse=True)
+        if versions:
+            # Downstream - by version (downstream releases), latest date of the version
+            version = versions[0]
+            dates = sorted(
+                {template['date'] for template in templates if template['version'] == version},
+                reverse=True)
+
+            def keep(template):
+                return template['version'] == version and template['date'] == dates[0]
+
+            def obsolete(template):
+                return (
+                    template['version'] in versions[1:] or
+                    (template['version'] == version and template['date'] in dates[1:]))
+        else:
+            # Upstream - by date (upstream nightlies)
+            dates = sorted(
+                {template['date'] for template in templates if template['date'] is not None},
+                reverse=True)
+            if not dates:
+                return  # Ignore this group, no templates detected yet
+
+            def keep(template):
+                return template['date'] == dates[0]
+
+            def obsolete(template):
+                return template['date'] in dates[1:]
+
+        keep_templates = [template for template in templates if keep(template)]
+        # If we then want to delete some appliances, better kill the eldest. status_changed
+        # says which one was provisioned when, because nothing else then touches that field.
+        appliances = sorted(
+            (appliance
+             for template in keep_templates
+             for appliance in self.appliances[template['id']]),
+            key=lambda appliance: appliance['status_changed'])
+        pool_size = self.pool_size(gs)
+        if len(appliances) < pool_size:
+            # If it can be deployed, it must exist, and go to a non-busy provider
+            free_templates = [
+                template for template in keep_templates
+                if template['exists'] and
+                not self.providers[template['provider_id']].disabled and
+                self.remaining_provisioning_slots(self.providers[template['provider_id']]) > 0]
+            if free_templates:
+                chosen = min(
+                    free_templates,
+                    key=lambda template: self.appliance_load(
+                        self.providers[template['provider_id']]))
+                self.provision.append((gs, chosen['id']))
+                # Account for the new appliance in the rest of the plan
+                self.provisioning[chosen['provider_id']] += 1
+                self.managing[chosen['provider_id']] += 1
+                self.appliances[chosen['id']].append({
+                    'id': None, 'name': None, 'template_id': chosen['id'],
+                    'status_changed': timezone.now()})
+        elif len(appliances) > pool_size:
+            # Only kill those that are visible only for one group. This is necessary so the groups
+            # don't "fight"
+            for appliance in appliances[:len(appliances) - pool_size]:
+                provider_id = next(
+                    template['provider_id'] for template in keep_templates
+                    if template['id'] == appliance['template_id'])
+                if appliance['id'] and self.provider_user_groups[provider_id] == {gs.user_group_id}:
+                    self.plan_kill(appliance, 'extra appliance')
+
+        for template in templates:
+            if obsolete(template):
+                for appliance in list(self.appliances[template['id']]):
+                    if appliance['id']:
+                        self.plan_kill(appliance, 'obsolete now')
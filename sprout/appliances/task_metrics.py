@@ -0,0 +1,153 @@
+"""Metrics of the sprout celery tasks.
+
+Every run of a :py:func:`appliances.tasks.singleton_task` or :py:func:`appliances.tasks.logged_task`
+task is recorded in redis with:
+
+* how long the task waited in the queue (from being sent, or from its ETA, until it started)
+* how long it ran and how it ended (``ok``, ``error``, ``skipped`` when another instance with the
+  same arguments held the lock, ``retried`` when it is going to wait for that instance)
+* how long it took to try taking the singleton lock
+* digest of the arguments
+
+The runs are kept for :py:data:`MAX_WINDOW` seconds, at most :py:data:`MAX_RUNS` per task.
+:py:func:`summarize` turns them into counts and percentiles over a sliding window.
+"""
+import json
+import math
+import time
+import uuid
+from datetime import datetime
+
+import iso8601
+from celery.signals import before_task_publish
+
+from sprout import redis_client
+from sprout.log import create_logger
+
+#: Longest window the metrics can be summarized over, in seconds
+MAX_WINDOW = 60 * 60 * 24
+#: Most runs kept per task
+MAX_RUNS = 5000
+#: Windows shown in the metrics view
+WINDOWS = ((5 * 60, '5 minutes'), (60 * 60, '1 hour'), (MAX_WINDOW, '24 hours'))
+#: Percentiles of the durations in the summary
+PERCENTILES = (50, 90, 99)
+
+SENT_HEADER = 'sprout_sent'
+TASKS_KEY = 'task-metrics-tasks'
+
+logger = create_logger('task_metrics')
+
+
+def runs_key(task_name):
+    return 'task-metrics-{}'.format(task_name)
+
+
+@before_task_publish.connect
+def stamp_sent_time(headers=None, **kwargs):
+    if headers is not None:
+        headers[SENT_HEADER] = time.time()
+
+
+def queue_wait(request, started):
+    """Seconds the task spent in the queue, ``None`` if the task was not stamped when sent."""
+    sent = getattr(request, SENT_HEADER, None) or (request.headers or {}).get(SENT_HEADER)
+    if sent is None:
+        return None
+    if request.eta:
+        # Tasks with ETA or countdown are not waiting for a worker before that time
+        eta = request.eta
+        if not isinstance(eta, datetime):
+            eta = iso8601.parse_date(eta)
+        sent = max(sent, eta.timestamp())
+    return max(started - sent, 0.0)
+
+
+def record(task_name, digest, outcome, queue_wait=None, runtime=None, lock_time=None):
+    """Records one run of the task. Never raises, the metrics must not break the tasks."""
+    now = time.time()
+    run = json.dumps({
+        'ts': now, 'digest': digest[:12], 'outcome': outcome, 'queue_wait': queue_wait,
+        'runtime': runtime, 'lock_time': lock_time,
+        # keeps the members of the sorted set unique
+        'id': uuid.uuid4().hex[:8]})
+    key = runs_key(task_name)
+    try:
+        pipe = redis_client.pipeline()
+        pipe.sadd(TASKS_KEY, task_name)
+        pipe.zadd(key, {run: now})
+        pipe.zremrangebyscore(key, 0, now - MAX_WINDOW)
+        pipe.zremrangebyrank(key, 0, -MAX_RUNS - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning('Could not record a run of %s: %s', task_name, e)
+
+
+class TaskRun(object):
+    """Measures one run of a task, see :py:func:`appliances.tasks.singleton_task`."""
+    def __init__(self, task, digest):
+        self.task_name = task.name
+        self.digest = digest
+        self.started = time.time()
+        self.queue_wait = queue_wait(task.request, self.started)
+        self.lock_time = None
+
+    def locked(self, lock_started):
+        self.lock_time = time.time() - lock_started
+
+    def finish(self, outcome):
+        runtime = time.time() - self.started if outcome in {'ok', 'error'} else None
+        record(
+            self.task_name, self.digest, outcome, queue_wait=self.queue_wait, runtime=runtime,
+            lock_time=self.lock_time)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    rank = int(math.ceil(pct / 100.0 * len(values)))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def runs(task_name, window):
+    return [
+        json.loads(run)
+        for run in redis_client.zrangebyscore(runs_key(task_name), time.time() - window, '+inf')]
+
+
+def summarize(window=WINDOWS[0][0]):
+    """Summary of the task runs in the last ``window`` seconds.
+
+    Returns:
+        :py:class:`list` of :py:class:`dict` per task name, sorted by the name, with the count of
+        runs per outcome, percentiles of ``queue_wait``, ``runtime`` and ``lock_time``, share of
+        the runs that hit a held lock as ``contention`` and the argument digests that hit it most
+        as ``contended``.
+    """
+    window = min(float(window), MAX_WINDOW)
+    summary = []
+    for task_name in sorted(name.decode('utf-8') for name in redis_client.smembers(TASKS_KEY)):
+        task_runs = runs(task_name, window)
+        if not task_runs:
+            continue
+        outcomes = {}
+        contended = {}
+        for run in task_runs:
+            outcomes[run['outcome']] = outcomes.get(run['outcome'], 0) + 1
+            if run['outcome'] in {'skipped', 'retried'}:
+                contended[run['digest']] = contended.get(run['digest'], 0) + 1
+        task_summary = {
+            'task': task_name,
+            'runs': len(task_runs),
+            'outcomes': outcomes,
+            'contention': float(sum(contended.values())) / len(task_runs),
+            'contended': sorted(contended.items(), key=lambda item: -item[1])[:5],
+        }
+        for metric in ('queue_wait', 'runtime', 'lock_time'):
+            values = sorted(run[metric] for run in task_runs if run[metric] is not None)
+            task_summary[metric] = {
+                'p{}'.format(pct): percentile(values, pct) for pct in PERCENTILES}
+            task_summary[metric]['max'] = values[-1] if values else None
+        summary.append(task_summary)
+    return summary
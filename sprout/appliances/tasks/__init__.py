@@ -1,13 +1,16 @@
 import hashlib
 import re
+import time
 from functools import wraps
 
 import fauxfactory
 import iso8601
 from celery import shared_task
+from celery.exceptions import Retry
 from django.core.cache import cache
 
 from appliances.models import Template
+from appliances.task_metrics import TaskRun
 from sprout import settings
 from sprout.log import create_logger
 
@@ -28,6 +31,14 @@ def parsedate(d):
         return iso8601.parse_date(d)
 
 
+def args_digest(args, kwargs):
+    """Hash of all args"""
+    digest_base = "/".join(str(arg) for arg in args)
+    keys = sorted(kwargs.keys())
+    digest_base += "//" + "/".join("{}={}".format(key, kwargs[key]) for key in keys)
+    return hashlib.sha256(digest_base.encode('utf-8')).hexdigest()
+
+
 def singleton_task(*args, **kwargs):
     kwargs["bind"] = True
     wait = kwargs.pop('wait', False)
@@ -38,27 +49,34 @@ def singleton_task(*args, **kwargs):
         @wraps(task)
         def wrapped_task(self, *args, **kwargs):
             self.logger = create_logger(task)
-            # Create hash of all args
-            digest_base = "/".join(str(arg) for arg in args)
-            keys = sorted(kwargs.keys())
-            digest_base += "//" + "/".join("{}={}".format(key, kwargs[key]) for key in keys)
-            digest = hashlib.sha256(digest_base.encode('utf-8')).hexdigest()
+            digest = args_digest(args, kwargs)
+            run = TaskRun(self, digest)
             lock_id = '{0}-lock-{1}'.format(self.name, digest)
 
-            if cache.add(lock_id, 'true', LOCK_EXPIRE):
+            lock_started = time.time()
+            locked = cache.add(lock_id, 'true', LOCK_EXPIRE)
+            run.locked(lock_started)
+            if locked:
                 try:
-                    return task(self, *args, **kwargs)
+                    result = task(self, *args, **kwargs)
                 except Exception as e:
+                    run.finish('retried' if isinstance(e, Retry) else 'error')
                     self.logger.error(
                         "An exception occured when executing with args: %r kwargs: %r",
                         args, kwargs)
                     self.logger.exception(e)
                     raise
+                else:
+                    run.finish('ok')
+                    return result
                 finally:
                     cache.delete(lock_id)
             elif wait:
+                run.finish('retried')
                 self.logger.info("Waiting for another instance of the task to end.")
                 self.retry(args=args, countdown=wait_countdown, max_retries=wait_retries)
+            else:
+                run.finish('skipped')
 
         return shared_task(*args, **kwargs)(wrapped_task)
 
@@ -73,14 +91,19 @@ def logged_task(*args, **kwargs):
         @wraps(task)
         def wrapped_task(self, *args, **kwargs):
             self.logger = create_logger(task)
+            run = TaskRun(self, args_digest(args, kwargs))
             try:
-                return task(self, *args, **kwargs)
+                result = task(self, *args, **kwargs)
             except Exception as e:
+                run.finish('retried' if isinstance(e, Retry) else 'error')
                 self.logger.error(
                     "An exception occured when executing with args: %r kwargs: %r",
                     args, kwargs)
                 self.logger.exception(e)
                 raise
+            else:
+                run.finish('ok')
+                return result
 
         return shared_task(*args, **new_kwargs)(wrapped_task)
 
@@ -84,4 +84,7 @@ urlpatterns = [
     url(r'^bq/(\d+)/delete$', views.delete_bug_query, name='delete_bug_query'),
     # Swap
     url(r'^swap$', views.swap_offenders, name='swap_offenders'),
+    # Task metrics
+    url(r'^task_metrics$', views.task_metrics, name='task_metrics'),
+    url(r'^metrics/tasks$', views.task_metrics_json, name='task_metrics_json'),
 ]
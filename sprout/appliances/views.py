@@ -15,6 +15,7 @@ from django.http import HttpResponse, Http404, HttpResponseForbidden
 from django.shortcuts import render, redirect
 
 from appliances.api import json_response
+from appliances.task_metrics import WINDOWS, summarize
 from appliances.models import (
     Provider, AppliancePool, Appliance, Group, Template, MismatchVersionMailer, User, BugQuery,
     GroupShepherd)
@@ -1051,6 +1052,28 @@ def swap_offenders(request):
     return render(request, 'appliances/swap_offenders.html', locals())
 
 
+def _metrics_window(request):
+    try:
+        return float(request.GET.get('window', WINDOWS[0][0]))
+    except ValueError:
+        return WINDOWS[0][0]
+
+
+def task_metrics(request):
+    if not request.user.is_superuser or not request.user.is_staff:
+        messages.info(request, 'You do not have the right to see the task metrics')
+        return go_back_or_home(request)
+    window = _metrics_window(request)
+    windows = WINDOWS
+    metrics = summarize(window)
+    return render(request, 'appliances/task_metrics.html', locals())
+
+
+def task_metrics_json(request):
+    """Task metrics for the monitoring, over ``window`` seconds given as a GET parameter."""
+    return json_response(summarize(_metrics_window(request)))
+
+
 def template_configurations(request):
     if not request.user.is_superuser or not request.user.is_staff:
         messages.info(request, 'You do not have the right to see the template configuration view')
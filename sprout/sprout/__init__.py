@@ -68,6 +68,20 @@ class RedisWrapper(object):
         with self.atomic():
             return self.client.delete(key, *args, **kwargs)
 
+    def notify(self, channel):
+        """Wakes up everyone waiting for a message in a :py:meth:`subscription` of the channel."""
+        return self.client.publish(str(channel), 'changed')
+
+    @contextmanager
+    def subscription(self, channel):
+        """Subscribes to the channel, yields the ``PubSub`` to wait for messages with."""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(str(channel))
+        try:
+            yield pubsub
+        finally:
+            pubsub.close()
+
     @contextmanager
     def appliances_ignored_when_renaming(self, *appliances):
         with self.atomic() as client: